@@ -1,5 +1,6 @@
 import numba
 
+BITSET_MEMORY = 2**28  # max size (in bytes) of bitset adjacency used by samplers
 CLIP = 5.0
 CORES = numba.config.NUMBA_NUM_THREADS
 EPSILON = 1e-7
@@ -1,9 +1,19 @@
+from . import bipartite
+from . import bitset
+from . import cache
+from . import compressed
 from . import core
+from . import directed
+from . import dynamic
+from . import ingest
 from . import model
 from . import neighbours
+from . import node2vec
+from . import noise
 from . import random
 from . import sample
 from . import utils
+from . import weighted
 
 from .model import Model, ModelAdam
 from .plot import plot
@@ -0,0 +1,221 @@
+""" Bipartite graphs.
+
+A bipartite graph (e.g. users and items) is a 4-tuple of arrays:
+    - `nodes` and `edges`: neighbour lists of the left nodes, i.e. indices
+      of the right nodes they are connected to,
+    - `rnodes` and `redges`: neighbour lists of the right nodes, i.e. indices
+      of the left nodes they are connected to.
+Both halves are laid out as in ``grl.graph.core`` (see `left` and `right`),
+with sorted neighbour lists, and nodes of each side are indexed from 1
+independently of the other side.
+Edges are stored once per side, so the graph is not symmetrized over the union
+of the nodes, and nodes and edges can be accessed from either side in O(1).
+
+Functions taking `side` argument refer to the left nodes if it is 0 (default),
+or to the right nodes if it is 1. Edges are always (left, right) pairs, and 
+negative examples pair a random left node with a right node drawn from the noise 
+distribution (see ``grl.graph.noise``).
+"""
+import numba
+import numpy as np
+
+from . import core
+from . import noise as _noise
+from . import sample
+from . import utils
+
+
+@numba.njit(cache=True)
+def degree(bgraph, side=0):
+    """ Get degrees of nodes of the given side.
+    """
+    return core.degree(half(bgraph, side))
+
+
+@numba.njit(cache=True)
+def ecount(bgraph):
+    """ Get edge count of a bipartite graph.
+    """
+    return bgraph[1].size
+
+
+def from_edgelist(el, vcount=None):
+    """ Convert edge list to bipartite graph.
+
+        Parameters
+        ----------
+        el : 2darray[int]
+            Edge list of shape (m, 2) with (left, right) pairs,
+            with nodes of each side indexed from 1.
+        vcount : tuple, optional
+            Numbers of the left and right nodes. Defaults to the largest
+            node indices in `el`.
+
+        Returns
+        -------
+        tuple
+            Bipartite graph.
+
+        Notes
+        -----
+        Duplicated edges are dropped.
+    """
+    el = np.asarray(el, dtype=np.int64).reshape(-1, 2)
+    if el.size and el.min() < 1:
+        raise ValueError("nodes in the edge list should be 1-indexed")
+    top = tuple(int(x) for x in el.max(axis=0)) if el.size else (0, 0)
+    if vcount is None:
+        vcount = top
+    elif top[0] > vcount[0] or top[1] > vcount[1]:
+        raise ValueError("edge list refers to nodes outside of the graph")
+    nodes, edges = utils.from_arrays(el[:, 0], el[:, 1], vcount[0], symmetric=False, loops=True)
+    rnodes, redges = utils.from_arrays(el[:, 1], el[:, 0], vcount[1], symmetric=False, loops=True)
+    return nodes, edges, rnodes, redges
+
+
+def from_graph(graph, vcount2=None):
+    """ Convert a bimodal graph, i.e. grl graph with neighbour lists of the left
+        nodes only (indices of the right nodes), to bipartite graph.
+
+        Parameters
+        ----------
+        graph : tuple
+        vcount2 : int, optional
+            Number of the right nodes. Defaults to the largest index in the edges.
+
+        Returns
+        -------
+        tuple
+            Bipartite graph.
+    """
+    graph = utils.as_sorted(graph)
+    return (*graph, *utils.transpose(graph, vcount2))
+
+
+@numba.njit()
+def get_random_anti_edge(bgraph, vcount2=0, noise=None):
+    """ Sample a random nonexistent edge: a uniformly random left node, and a right 
+        node drawn from the noise distribution (see ``grl.graph.noise``), uniform 
+        if not given. `vcount2` is there for the signature of the contrastive 
+        samplers (see ``grl.graph.sample``); the number of the right nodes 
+        is taken from the graph. 
+    """
+    n1, n2 = vcount(bgraph, 0), vcount(bgraph, 1)
+    while True:
+        src = np.random.randint(n1) + 1  # @indexing
+        dst = _noise.draw(n2, noise)
+        if not is_edge(src, dst, bgraph):
+            return np.array([src, dst], dtype=bgraph[1].dtype)
+
+
+@numba.njit()
+def get_random_edge(bgraph, side=-1):
+    """ Sample a random existing edge. If `side` is 0 or 1, the edge starts from 
+        a random node of the given side; by default (-1) edges are drawn uniformly, 
+        i.e. nodes of both sides in proportion to their degrees. 
+    """
+    if side < 0:
+        v, e = half(bgraph, 0)
+        if not e.size:
+            raise ValueError("graph has no edges")
+        i = np.random.randint(e.size)
+        src = np.searchsorted(v, i, side='right') - 1
+        return np.array([src, e[i]], dtype=bgraph[1].dtype)
+    g = half(bgraph, side)
+    n = core.vcount(g)
+    while True:
+        src = np.random.choice(n) + 1  # @indexing
+        nbs = core.neighbors(src, g)
+        if nbs[0]:
+            e = np.array([src, np.random.choice(nbs)], dtype=bgraph[1].dtype)
+            return e[::-1].copy() if side else e
+
+
+@numba.njit()
+def get_random_pair(bgraph, vcount2=0, noise=None):
+    """ Sample a random (left, right) pair of nodes, with the right node drawn 
+        from the noise distribution (see `get_random_anti_edge`). 
+    """
+    left = np.random.randint(vcount(bgraph, 0)) + 1  # @indexing
+    right = _noise.draw(vcount(bgraph, 1), noise)
+    return np.array([left, right], dtype=bgraph[1].dtype)
+
+
+@numba.njit(cache=True)
+def half(bgraph, side=0):
+    """ Get neighbour lists of the nodes of the given side, as grl graph.
+    """
+    if side:
+        return bgraph[2], bgraph[3]
+    return bgraph[0], bgraph[1]
+
+
+@numba.njit(cache=True)
+def is_edge(left, right, bgraph):
+    """ Tell if the left and right nodes are connected.
+        Binary search runs over the shorter of the two neighbour lists.
+    """
+    v, e, rv, re = bgraph
+    if v[left+1] - v[left] <= rv[right+1] - rv[right]:
+        return utils.find_edge(left, right, (v, e)) >= 0
+    return utils.find_edge(right, left, (rv, re)) >= 0
+
+
+def left(bgraph):
+    """ Get neighbour lists of the left nodes, as grl graph.
+    """
+    return bgraph[0], bgraph[1]
+
+
+@numba.njit()
+def neighbors(i, bgraph, side=0):
+    """ Get neighbors of i-th node of the given side (see ``grl.graph.core.neighbors``),
+        i.e. indices of the nodes of the other side.
+    """
+    return core.neighbors(i, half(bgraph, side))
+
+
+def right(bgraph):
+    """ Get neighbour lists of the right nodes, as grl graph.
+    """
+    return bgraph[2], bgraph[3]
+
+
+def to_edgelist(bgraph):
+    """ Get edge list of (left, right) pairs.
+    """
+    return utils.to_edgelist(left(bgraph))
+
+
+@numba.njit(cache=True)
+def vcount(bgraph, side=0):
+    """ Get vertex count of the given side.
+    """
+    return core.vcount(half(bgraph, side))
+
+
+@numba.njit(cache=False)
+@sample.sampler(get_random_edge, get_random_pair)
+def get_nce_sample():
+    """ Sample edges of a bipartite graph with balanced noise contrast
+        (see ``grl.graph.sample.get_nce_sample``). Positional arguments 
+        to the positive sampler (`pargs`) take the side to start sampling 
+        from (see `get_random_edge`), and to the contrastive sampler (`nargs`): 
+            (vcount2, noise)
+        as in ``grl.graph.sample``. 
+    """
+    pass
+
+
+@numba.njit(cache=False)
+@sample.sampler(get_random_edge, get_random_anti_edge)
+def get_neg_sample():
+    """ Sample edges of a bipartite graph with balanced negative contrast
+        (see ``grl.graph.sample.get_neg_sample``). Arguments as in `get_nce_sample`. 
+    """
+    pass
+
+
+# Alias
+nce = get_nce_sample
+neg = get_neg_sample
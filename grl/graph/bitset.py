@@ -0,0 +1,119 @@
+""" Bitset adjacency of grl graphs. 
+
+Adjacency matrix is packed to uint64 words (64 node pairs per word, see ``grl.numby.bits``), 
+giving 8x less memory than ``grl.graph.utils.to_adjacency``, and constant-time 
+edge membership tests. Rows and columns are indexed by node indices, so 
+0-th row and column are empty (@indexing).
+
+Samplers use bitset adjacency automatically for graphs where it fits 
+within ``grl.config.BITSET_MEMORY`` bytes (see `get`). 
+"""
+import numba
+import numpy as np
+
+from grl import config
+from . import cache
+from . import core
+from .. import numby
+
+
+@numba.njit(cache=True)
+def common_neighbors(vi, vj, bits):
+    """ Count common neighbours of nodes vi and vj. 
+    """
+    res = 0
+    for k in range(bits.shape[1]):
+        res += numby.popcount(bits[vi, k] & bits[vj, k])
+    return res
+
+
+@numba.njit(cache=True, parallel=True)
+def degree(bits):
+    """ Get degrees of nodes (see ``grl.graph.core.degree``). 
+    """
+    res = np.zeros(bits.shape[0]-1, dtype=np.uint64)
+    for i in numba.prange(1, bits.shape[0]):  # @indexing
+        res[i-1] = numby.popcount_1d(bits[i])
+    return res
+
+
+@numba.njit(cache=True, parallel=True)
+def from_graph(graph):
+    """ Pack adjacency matrix of the graph to a bitset. 
+
+        Parameters
+        ----------
+        graph : tuple
+            grl graph
+
+        Returns
+        -------
+        2darray[uint64]
+            Bitset adjacency with a row per node and a bit per column.
+    """
+    v, e = graph
+    n = core.vcount(graph)
+    bits = np.zeros((n+1, _words(graph)), dtype=np.uint64)  # @indexing
+    for i in numba.prange(1, n+1):
+        for j in range(v[i], v[i+1]):
+            numby.bitset_set(bits[i], e[j])
+    return bits
+
+
+def get(graph):
+    """ Get bitset adjacency of the graph if it fits within ``grl.config.BITSET_MEMORY``
+        bytes, or None otherwise. Bitsets are cached (see ``grl.graph.cache``).
+    """
+    bits = cache.get(graph, 'bitset')
+    if bits is None:
+        bits = from_graph(graph) if nbytes(graph) <= config.BITSET_MEMORY else False
+        cache.set(graph, 'bitset', bits)
+    return bits if bits is not False else None
+
+
+@numba.njit(cache=True)
+def is_neighbor(vi, vj, bits):
+    """ Tell if the nodes vi and vj are neighbors. 
+    """
+    return numby.bitset_get(bits[vj], vi)
+
+
+@numba.njit(cache=True)
+def nbytes(graph):
+    """ Get size of the bitset adjacency of a graph in bytes. 
+    """
+    return (core.vcount(graph)+1) * _words(graph) * 8
+
+
+@numba.njit(cache=True)
+def neighbors(vi, bits):
+    """ Get neighbors of i-th node. 
+    """
+    res = np.empty(numby.popcount_1d(bits[vi]), dtype=np.uint32)
+    k = 0
+    for i in range(bits.shape[1]):
+        w = bits[vi, i]
+        for j in range(64):
+            if (w >> np.uint64(63 - j)) & np.uint64(1):
+                res[k] = i*64 + j
+                k += 1
+    return res
+
+
+@numba.njit(cache=True)
+def to_adjacency(bits):
+    """ Unpack bitset to adjacency matrix (see ``grl.graph.utils.to_adjacency``). 
+    """
+    n = bits.shape[0] - 1
+    A = numby.unpack64(bits[1:].ravel()).reshape(n, bits.shape[1]*64)
+    return A[:, 1:n+1]  # @indexing
+
+
+@numba.njit(cache=True)
+def _words(graph):
+    # columns span the largest node index in the edges, 
+    # which can exceed vcount in bimodal graphs
+    v, e = graph
+    n = core.vcount(graph)
+    top = max(n, e.max()) if e.size else n
+    return (top + 1 + 63) // 64  # @indexing
@@ -0,0 +1,41 @@
+""" Cache of structures derived from graphs (e.g. bitset adjacency).
+
+Graphs are plain tuples of arrays, so entries are keyed by the identity 
+of the arrays, and dropped once any of the arrays is garbage collected 
+(so that a key is never reused by different arrays). 
+Structures cached before the worker processes are forked (see ``grl.shmem.graph.register``)
+are shared with the workers. 
+"""
+import weakref
+
+_cache = {}
+
+
+def _key(graph):
+    return tuple(id(x) for x in graph)
+
+
+def clear(graph=None):
+    """ Drop cached structures of a graph, or of all graphs. 
+    """
+    if graph is None:
+        _cache.clear()
+    else:
+        _cache.pop(_key(graph), None)
+
+
+def get(graph, name, default=None):
+    """ Get structure cached for the graph under the given name. 
+    """
+    return _cache.get(_key(graph), {}).get(name, default)
+
+
+def set(graph, name, value):
+    """ Cache structure derived from the graph under the given name. 
+    """
+    key = _key(graph)
+    if key not in _cache:
+        _cache[key] = {}
+        for x in graph:
+            weakref.finalize(x, _cache.pop, key, None)
+    _cache[key][name] = value
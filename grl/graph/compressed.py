@@ -0,0 +1,304 @@
+""" Compressed neighbour lists.
+
+A compressed graph is a 3-tuple of arrays:
+    - `nodes`: the same as in ``grl.graph.core``, i.e. offsets of neighbour
+      lists (counted in edges),
+    - `blocks`: uint64 array with byte offsets in `data` of every BLOCK-th edge,
+      followed by the size of `data`,
+    - `data`: uint8 array with sorted neighbour lists, gap-encoded as unsigned
+      varints (7 bits per byte, the high bit marks continuation).
+The first neighbour of every node and the first edge of every block are stored
+as absolute values (restart points), so decoding can start at any block,
+and accessing a single neighbour takes at most BLOCK varints to decode.
+
+Gaps between neighbours are small when nodes with close indices are connected,
+so the compression ratio depends on node ordering: for graphs with locality
+most gaps take 1-2 bytes instead of 4.
+
+The compiled functions in this module mirror their counterparts in ``grl.graph.core``
+and ``grl.graph.sample``, and decode neighbour lists on the fly.
+"""
+import numba
+import numpy as np
+
+from . import noise as _noise
+from . import sample
+
+BLOCK = 64
+
+
+@numba.njit(cache=True)
+def _decode(a, b, s, cgraph, out):
+    """ Decode edges [a, b) of a node whose list starts at s into `out`. """
+    v, blocks, data = cgraph
+    p = a - a % BLOCK
+    k = np.int64(blocks[p // BLOCK])
+    x = 0
+    while p < b:
+        g, k = _varint(data, k)
+        x = g if (p % BLOCK == 0 or p == s) else x + g
+        if p >= a:
+            out[p-a] = x
+        p += 1
+
+
+@numba.njit(cache=True)
+def _gap(p, edges, starts):
+    """ Get value to encode for the p-th edge. """
+    if p % BLOCK == 0 or starts[p]:
+        return np.int64(edges[p])
+    return np.int64(edges[p]) - np.int64(edges[p-1])
+
+
+@numba.njit(cache=True)
+def _put(data, k, x):
+    """ Encode varint at k-th byte, return offset of the next one. """
+    while x >= 0x80:
+        data[k] = (x & 0x7f) | 0x80
+        x >>= 7
+        k += 1
+    data[k] = x
+    return k + 1
+
+
+@numba.njit(cache=True)
+def _scan(a, b, s, vi, cgraph):
+    """ Tell if vi is among edges [a, b) of a node whose list starts at s. """
+    v, blocks, data = cgraph
+    p = a - a % BLOCK
+    k = np.int64(blocks[p // BLOCK])
+    x = 0
+    while p < b:
+        g, k = _varint(data, k)
+        x = g if (p % BLOCK == 0 or p == s) else x + g
+        if p >= a:
+            if x == vi:
+                return True
+            if x > vi:
+                return False
+        p += 1
+    return False
+
+
+@numba.njit(cache=True)
+def _size(x):
+    """ Get number of bytes of the varint encoding of x. """
+    res = 1
+    while x >= 0x80:
+        x >>= 7
+        res += 1
+    return res
+
+
+@numba.njit(cache=True, parallel=True)
+def _starts(nodes, size):
+    """ Mark edges at the beginning of neighbour lists. """
+    res = np.zeros(size, dtype=np.uint8)
+    for i in numba.prange(1, nodes.size-1):
+        if nodes[i] < nodes[i+1]:
+            res[nodes[i]] = 1
+    return res
+
+
+@numba.njit(cache=True)
+def _varint(data, k):
+    """ Decode varint at k-th byte, return it with the offset of the next one. """
+    x = 0
+    shift = 0
+    while True:
+        c = np.int64(data[k])
+        x |= (c & 0x7f) << shift
+        k += 1
+        if c < 0x80:
+            return x, k
+        shift += 7
+
+
+@numba.njit(cache=True, parallel=True)
+def compress(graph):
+    """ Compress neighbour lists of the graph.
+
+        Parameters
+        ----------
+        graph : tuple
+            grl graph, with sorted neighbour lists.
+
+        Returns
+        -------
+        tuple
+            Compressed graph: (nodes, blocks, data).
+            The `nodes` array is shared with the input graph.
+    """
+    v, e = graph
+    nblocks = -(-e.size // BLOCK)
+    starts = _starts(v, e.size)
+    size = np.zeros(nblocks+1, dtype=np.int64)
+    for b in numba.prange(nblocks):
+        for p in range(b*BLOCK, min(e.size, (b+1)*BLOCK)):
+            size[b+1] += _size(_gap(p, e, starts))
+    blocks = np.cumsum(size)
+    data = np.empty(blocks[-1], dtype=np.uint8)
+    for b in numba.prange(nblocks):
+        k = blocks[b]
+        for p in range(b*BLOCK, min(e.size, (b+1)*BLOCK)):
+            k = _put(data, k, _gap(p, e, starts))
+    return v, blocks.astype(np.uint64), data
+
+
+@numba.njit(cache=True, parallel=True)
+def decompress(cgraph):
+    """ Decode compressed graph back to grl graph.
+    """
+    v, blocks, data = cgraph
+    size = np.int64(v[-1])
+    starts = _starts(v, size)
+    edges = np.empty(size, dtype=np.uint32)
+    for b in numba.prange(blocks.size-1):
+        k = np.int64(blocks[b])
+        x = 0
+        for p in range(b*BLOCK, min(size, (b+1)*BLOCK)):
+            g, k = _varint(data, k)
+            x = g if (p % BLOCK == 0 or starts[p]) else x + g
+            edges[p] = x
+    return v, edges
+
+
+@numba.njit(cache=True)
+def degree(cgraph):
+    """ Get degrees of nodes (see ``grl.graph.core.degree``).
+    """
+    v = cgraph[0]
+    return (v[1:] - v[:-1])[1:]  # @indexing
+
+
+@numba.njit(cache=True)
+def ecount(cgraph):
+    """ Get edge count of a compressed graph.
+    """
+    return np.int64(cgraph[0][-1])  # @symmetry
+
+
+@numba.njit()
+def get_random_anti_edge(cgraph, vcount2=0, noise=None):
+    """ Sample a random nonexistent edge (see ``grl.graph.sample.get_random_anti_edge``). """
+    n = vcount(cgraph)
+    while True:
+        src = np.random.choice(n) + 1  # @indexing
+        v = _noise.draw(vcount2 if vcount2 else n, noise)
+        if not is_neighbor(v, src, cgraph):
+            return np.array([src, v], dtype=np.uint32)
+
+
+@numba.njit()
+def get_random_edge(cgraph):
+    """ Sample a random existing edge. """
+    n = vcount(cgraph)
+    while True:
+        src = np.random.choice(n) + 1  # @indexing
+        dst = get_random_neighbor(src, cgraph)
+        if dst:
+            return np.array([src, dst], dtype=np.uint32)
+
+
+@numba.njit()
+def get_random_neighbor(i, cgraph):
+    """ Sample a random neighbour of i-th node, or 0 if it has none. """
+    v = cgraph[0]
+    d = np.int64(v[i+1]) - np.int64(v[i])
+    if not d:
+        return 0
+    return neighbor(i, np.random.randint(d), cgraph)
+
+
+@numba.njit()
+def get_random_pair(cgraph, vcount2=0, noise=None):
+    """ Sample a random pair of nodes (see ``grl.graph.sample.get_random_pair``). """
+    n = vcount(cgraph)
+    src = np.random.choice(n) + 1  # @indexing
+    dst = _noise.draw(vcount2 if vcount2 else n, noise)
+    return np.array([src, dst], dtype=np.uint32)
+
+
+@numba.njit(cache=True)
+def is_neighbor(vi, vj, cgraph):
+    """ Tell if the nodes vi and vj are neighbors.
+        Restart points are binary searched, so at most one block is decoded.
+    """
+    v, blocks, data = cgraph
+    a, b = np.int64(v[vj]), np.int64(v[vj+1])
+    if a == b:
+        return False
+    # aligned blocks within the neighbour list
+    lo, hi = -(-a // BLOCK), (b-1) // BLOCK + 1
+    if lo >= hi or _varint(data, np.int64(blocks[lo]))[0] > vi:
+        return _scan(a, min(b, lo*BLOCK), a, vi, cgraph)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if _varint(data, np.int64(blocks[mid]))[0] <= vi:
+            lo = mid
+        else:
+            hi = mid
+    return _scan(lo*BLOCK, min(b, (lo+1)*BLOCK), a, vi, cgraph)
+
+
+@numba.njit(cache=True)
+def nbytes(cgraph):
+    """ Get memory taken by a compressed graph, in bytes.
+    """
+    v, blocks, data = cgraph
+    return v.nbytes + blocks.nbytes + data.nbytes
+
+
+@numba.njit(cache=True)
+def neighbor(i, j, cgraph):
+    """ Get j-th neighbour of i-th node.
+    """
+    a = np.int64(cgraph[0][i])
+    out = np.empty(1, dtype=np.int64)
+    _decode(a+j, a+j+1, a, cgraph, out)
+    return out[0]
+
+
+@numba.njit()
+def neighbors(i, cgraph):
+    """ Get neighbors of i-th node (see ``grl.graph.core.neighbors``).
+    """
+    v = cgraph[0]
+    if i > v.size - 2:
+        raise IndexError("node not in graph")
+    a, b = np.int64(v[i]), np.int64(v[i+1])
+    if b > a:
+        out = np.empty(b-a, dtype=np.uint32)
+        _decode(a, b, a, cgraph, out)
+        return out
+    return np.array([0], dtype=np.uint32)
+
+
+@numba.njit(cache=True)
+def vcount(cgraph):
+    """ Get vertex count of a compressed graph.
+    """
+    return cgraph[0].size - 2
+
+
+@numba.njit(cache=False)
+@sample.sampler(get_random_edge, get_random_pair)
+def get_nce_sample():
+    """ Sample edges of a compressed graph with balanced noise contrast
+        (see ``grl.graph.sample.get_nce_sample``).
+    """
+    pass
+
+
+@numba.njit(cache=False)
+@sample.sampler(get_random_edge, get_random_anti_edge)
+def get_neg_sample():
+    """ Sample edges of a compressed graph with balanced negative contrast
+        (see ``grl.graph.sample.get_neg_sample``).
+    """
+    pass
+
+
+# Alias
+nce = get_nce_sample
+neg = get_neg_sample
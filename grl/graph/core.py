@@ -18,18 +18,24 @@ It contains indices of the `edges` array laid out as follows:
 The `edges` array is of type ``uint32`` and length `2m`, where `m` is the number 
 of edges in the graph (currently only symmetric graphs are supported). 
 It contains indices of the `nodes` array corresponding to node neighbourhoods as described above. 
+Neighbour lists are sorted in increasing order and contain no duplicates: all graph 
+builders in ``grl.graph.utils`` (and ``grl.graph.ingest``) guarantee it, and the 
+membership tests rely on it (see ``grl.graph.utils.as_sorted`` for graphs built otherwise). 
 
 Note that this implies that nodes are 1-indexed (in some scenarios it was useful 
 to have a meaningless embedding at index 0; this might change at any time), and
 the maximum supported number of nodes is 2^32. 
 
 All functions in this module have to be compiled with numba in nopython mode, 
-so that higher-level functions also compile this way.  
+so that higher-level functions also compile this way. The only exception is 
+`is_neighbor`, which looks up cached bitset adjacency of the graph; compiled 
+code calls `_is_neighbor` instead.  
 """
 
 import numba
 import numpy as np
 
+from . import cache
 from .. import numby
 
 
@@ -86,10 +92,134 @@ def ecount(graph):
     return e.shape[0]  # @symmetry
 
 
+def is_neighbor(vi, vj, graph, bits=None):
+    """ Tell if the nodes vi and vj are neighbors (binary search over the neighbour list).
+        If bitset adjacency of the graph is given, or has been built for it 
+        (see ``grl.graph.bitset.get``), the test takes constant time. 
+    """
+    if bits is None:
+        bits = cache.get(graph, 'bitset')
+    return _is_neighbor(vi, vj, graph, bits if bits is not False else None)
+
+
+@numba.njit(cache=True)
+def _is_neighbor(vi, vj, graph, bits=None):
+    """ Compiled `is_neighbor`, taking bitset adjacency explicitly. 
+    """
+    if bits is None:
+        return numby.isin_sorted_1d(vi, neighbors(vj, graph))
+    return numby.bitset_get(bits[vj], vi)
+
+
 @numba.njit(cache=True)
-def is_neighbor(vi, vj, graph):
-    """ Tell if the nodes vi and vj are neighbors. """
-    return numby.isin_1d(vi, neighbors(vj, graph))
+def _k_hop(seed, k, graph):
+    """ Get sorted nodes within k hops from the seed. """
+    v, e = graph
+    vs = np.array([seed], dtype=np.int64)
+    frontier = vs
+    for _ in range(k):
+        size = 0
+        for u in frontier:
+            size += np.int64(v[u+1]) - np.int64(v[u])
+        nb = np.empty(size, dtype=np.int64)
+        size = 0
+        for u in frontier:
+            a, b = np.int64(v[u]), np.int64(v[u+1])
+            nb[size:size+b-a] = e[a:b]
+            size += b - a
+        nb = np.unique(nb)
+        pos = np.searchsorted(vs, nb)
+        new = np.ones(nb.size, dtype=np.bool_)
+        for i in range(nb.size):
+            new[i] = pos[i] == vs.size or vs[pos[i]] != nb[i]
+        frontier = nb[new]
+        if not frontier.size:
+            break
+        vs = np.sort(np.concatenate((vs, frontier)))
+    return vs
+
+
+@numba.njit(cache=True)
+def _ego_count(vs, graph):
+    """ Count edges of the subgraph spanned by the sorted nodes. """
+    v, e = graph
+    c = 0
+    for u in vs:
+        a, b = np.int64(v[u]), np.int64(v[u+1])
+        pos = np.searchsorted(vs, e[a:b])
+        for j in range(b - a):
+            if pos[j] < vs.size and vs[pos[j]] == e[a+j]:
+                c += 1
+    return c
+
+
+@numba.njit(cache=True, parallel=True)
+def k_hop_subgraph(seeds, k, graph):
+    """ Extract ego networks: subgraphs spanned by nodes within k hops 
+        from each of the seeds. 
+
+        Parameters
+        ----------
+        seeds : 1darray[int]
+            Nodes of the input graph.
+        k : int
+            Number of hops.
+        graph : tuple
+            Input graph.
+
+        Returns
+        -------
+        subgraph : tuple
+            Disjoint union of the ego networks: nodes ``ptr[i]+1, ..., ptr[i+1]`` 
+            (@indexing) make up the ego network of the i-th seed. 
+        vs : 1darray[int64]
+            Nodes of the input graph corresponding to the nodes of the subgraph
+            (i.e. ``vs[j-1]`` for the j-th node). Sorted within every ego network.
+        ptr : 1darray[int64]
+            Offsets of the ego networks, of length ``seeds.size+1``.
+
+        Notes
+        -----
+        Ego networks are computed once, in parallel, and kept until the 
+        output is filled in the second pass, with the work proportional to their size rather 
+        than the size of the graph: node indices are mapped by binary search 
+        over the sorted nodes of the ego network.
+        To get a subgraph spanned by the union of the ego networks, 
+        use ``subgraph(np.unique(vs), graph)``.
+    """
+    v, e = graph
+
+    # first pass: find the ego networks and count their nodes and edges
+    egos = numba.typed.List.empty_list(numba.int64[:])
+    for i in range(seeds.size):
+        egos.append(np.empty(0, dtype=np.int64))
+    nv = np.zeros(seeds.size+1, dtype=np.int64)
+    ne = np.zeros(seeds.size+1, dtype=np.int64)
+    for i in numba.prange(seeds.size):
+        ego = _k_hop(seeds[i], k, graph)
+        egos[i] = ego
+        nv[i+1] = ego.size
+        ne[i+1] = _ego_count(ego, graph)
+    ptr = np.cumsum(nv)
+    eptr = np.cumsum(ne)
+
+    # second pass: fill the disjoint union
+    vs = np.empty(ptr[-1], dtype=np.int64)
+    nodes = np.zeros(ptr[-1]+2, dtype=v.dtype)
+    edges = np.empty(eptr[-1], dtype=e.dtype)
+    for i in numba.prange(seeds.size):
+        ego = egos[i]
+        vs[ptr[i]:ptr[i+1]] = ego
+        c = eptr[i]
+        for j in range(ego.size):
+            a, b = np.int64(v[ego[j]]), np.int64(v[ego[j]+1])
+            pos = np.searchsorted(ego, e[a:b])
+            for l in range(b - a):
+                if pos[l] < ego.size and ego[pos[l]] == e[a+l]:
+                    edges[c] = ptr[i] + pos[l] + 1  # @indexing
+                    c += 1
+            nodes[ptr[i]+j+2] = c
+    return (nodes, edges), vs, ptr
 
 
 @numba.njit()
@@ -121,31 +251,62 @@ def neighbors_with_mask(vi, graph, mask):
         return np.zeros(1, dtype=e.dtype.type)  # @indexing
 
 
-@numba.njit(parallel=True)
+@numba.njit(cache=True, parallel=True)
 def subgraph(vs, graph):
     """ Filter to a subgraph spanned by the given nodes.
+
+        Parameters
+        ----------
+        vs : 1darray[int]
+            Unique nodes of the input graph; i-th node of the subgraph 
+            corresponds to ``vs[i-1]`` (@indexing).
+        graph : tuple
+            Input graph.
+
+        Returns
+        -------
+        tuple
+            Induced subgraph (with sorted neighbour lists).
+
+        Notes
+        -----
+        Neighbour ids may exceed the node count of the graph (e.g. a half 
+        of a bipartite graph, see ``grl.graph.bipartite``); neighbours are 
+        then kept if they are among `vs` too. 
     """
-    
-    nodes = np.zeros(vs.size+2, dtype=graph[0].dtype.type)
-    edges = np.zeros(degree(graph)[vs-1].sum(), dtype=graph[1].dtype.type)
-    
-    # filter edges
-    for i, v in enumerate(vs):
-        nb = neighbors(v, graph)
-        inb = np.intersect1d(nb, vs)
-        edges[(nodes[i+1]):int(nodes[i+1]+inb.size)] = inb
-        nodes[i+2] = nodes[i+1] + inb.size
-    edges = edges[:nodes[-1]]
-    
-    # reindex nodes
-    # TODO: hashmap
-    for i in range(edges.size):
-        for j in range(vs.size):
-            if edges[i] == vs[j]:
-                edges[i] = j + 1
-                break    
-    
-    return nodes, edges
+    v, e = graph
+    n = vcount(graph)
+    if e.size:
+        n = max(n, np.int64(e.max()))
+    # old -> new node index map (0 for nodes outside of the subgraph)
+    idx = np.zeros(n+1, dtype=np.int64)  # @indexing
+    for i in numba.prange(vs.size):
+        idx[vs[i]] = i + 1  # @indexing
+
+    # first pass: count edges of every node
+    cnt = np.zeros(vs.size+2, dtype=np.int64)
+    for i in numba.prange(vs.size):
+        c = 0
+        for j in range(np.int64(v[vs[i]]), np.int64(v[vs[i]+1])):
+            if idx[e[j]]:
+                c += 1
+        cnt[i+2] = c
+    nodes = np.cumsum(cnt)
+
+    # second pass: reindex edges
+    edges = np.empty(nodes[-1], dtype=e.dtype)
+    for i in numba.prange(vs.size):
+        a, b = nodes[i+1], nodes[i+1]
+        srt = True
+        for j in range(np.int64(v[vs[i]]), np.int64(v[vs[i]+1])):
+            if idx[e[j]]:
+                edges[b] = idx[e[j]]
+                srt = srt and (b == a or edges[b-1] < edges[b])
+                b += 1
+        if not srt:
+            edges[a:b] = np.sort(edges[a:b])
+
+    return nodes.astype(v.dtype), edges
 
 
 @numba.njit(cache=True)
@@ -0,0 +1,117 @@
+""" Directed graphs.
+
+A directed graph is laid out as in ``grl.graph.core``, except that the `edges`
+array holds out-neighbours only, so that every edge is stored once (m entries
+instead of 2m). Functions of ``grl.graph.core`` work on directed graphs as they
+are, with `neighbors` and `degree` referring to out-neighbours, and so do
+the samplers of ``grl.graph.sample``: edges are sampled from their source,
+and contrastive examples are tested against out-neighbour lists only, which
+fits the asymmetric models (with separate source and target embeddings).
+
+In-neighbour lists are the transpose of the graph, built lazily and cached
+(see `transpose`).
+"""
+import numba
+import numpy as np
+
+from . import cache
+from . import core
+from . import utils
+
+
+def from_edgelist(el, vcount=None):
+    """ Convert edge list to directed graph.
+
+        Parameters
+        ----------
+        el : 2darray[int]
+            Edge list of shape (m, 2) with (src, dst) pairs, with nodes indexed from 1.
+        vcount : int, optional
+            Number of nodes in the graph. Defaults to the largest node index in `el`.
+
+        Returns
+        -------
+        tuple
+            grl graph
+
+        Notes
+        -----
+        Self-loops and duplicated edges are dropped.
+    """
+    return utils.from_edgelist(el, vcount, symmetric=False)
+
+
+@numba.njit(cache=True)
+def get_edge_mask(p, graph):
+    """ Generate an array of binary edge attributes, independent for every
+        direction of an edge (see ``grl.graph.utils.get_edge_mask``).
+    """
+    return np.random.binomial(1, p, graph[1].size)
+
+
+@numba.njit(cache=True)
+def in_degree(graph):
+    """ Get in-degrees of nodes in a directed graph.
+    """
+    v, e = graph
+    res = np.zeros(core.vcount(graph)+1, dtype=np.int64)  # @indexing
+    for x in e:
+        res[x] += 1
+    return res[1:]
+
+
+def in_neighbors(i, graph):
+    """ Get in-neighbours of i-th node (see ``grl.graph.core.neighbors``).
+    """
+    return core.neighbors(i, transpose(graph))
+
+
+@numba.njit(cache=True)
+def is_edge(src, dst, graph):
+    """ Tell if there is an edge from src to dst.
+    """
+    return utils.find_edge(src, dst, graph) >= 0
+
+
+@numba.njit(cache=True)
+def out_degree(graph):
+    """ Get out-degrees of nodes in a directed graph (see ``grl.graph.core.degree``).
+    """
+    return core.degree(graph)
+
+
+def split_edges(graph, fractions=(.8, .1, .1), seed=None):
+    """ Randomly split edges of a directed graph (see ``grl.graph.utils.split_edges``).
+    """
+    return utils.split_edges(graph, fractions, seed, directed=True)
+
+
+def symmetrize(graph):
+    """ Get undirected graph with edges of the directed graph in both directions.
+    """
+    el = utils.to_edgelist(graph)
+    return utils.from_arrays(el[:, 0], el[:, 1], core.vcount(graph))
+
+
+@numba.njit(cache=True, parallel=True)
+def to_edge_mask(el, graph):
+    """ Convert edge list to an edge mask, with 1 at the listed (src, dst) edges
+        only (see ``grl.graph.utils.to_edge_mask``).
+    """
+    mask = np.zeros(graph[1].size, dtype=np.uint8)
+    for i in numba.prange(el.shape[0]):
+        j = utils.find_edge(el[i, 0], el[i, 1], graph)
+        if j >= 0:
+            mask[j] = 1
+    return mask
+
+
+def transpose(graph):
+    """ Get in-neighbour lists of the directed graph, as grl graph.
+        Transposed graphs are cached (see ``grl.graph.cache``).
+    """
+    res = cache.get(graph, 'transpose')
+    if res is None:
+        res = utils.transpose(graph, core.vcount(graph))
+        cache.set(graph, 'transpose', res)
+    return res
@@ -0,0 +1,359 @@
+""" Graphs with edge insertions and deletions.
+
+A dynamic graph keeps a base graph (see ``grl.graph.core``) along with
+a delta log of changes, so that edges can be added and removed without
+rebuilding `nodes` and `edges` arrays on every update.
+The compiled functions in this module take the merged view of the graph,
+which is a 4-tuple of arrays:
+    - `nodes` and `edges` of the base graph (with sorted neighbour lists),
+    - `deleted`: sorted int64 array of positions of the deleted edges
+      of the base graph in the `edges` array (tombstones),
+    - `inserted`: sorted uint64 array of keys (src << 32 | dst) of the edges
+      added on top of the base graph.
+Every update builds a new merged view and swaps it in at once, so that views 
+taken before (e.g. by samplers running in other threads) are never modified.
+
+Once the delta log grows large relative to the base graph, it is folded back
+into a fresh base graph (compaction), by default in a background thread.
+
+Merged views are not grl graphs, so the functions of ``grl.graph.core`` and 
+``grl.graph.sample`` take the base graph only. Their counterparts for merged 
+views are defined here (`neighbors`, `degree`, `ecount`, `is_neighbor`, and 
+the `nce` and `neg` samplers), and differ from them in that:
+    - samplers draw examples one at a time (see ``grl.graph.sample.sampler``),
+      and `neg` tests membership with binary search, without bitset adjacency,
+    - edge masks and weights are not supported, as the edges array changes 
+      with every compaction.
+``grl.graph.Model`` takes a `DynamicGraph` as it is, and fits it to the current 
+graph (see `DynamicGraph.compact`), which is the base graph itself unless 
+the graph changed since the last compaction. 
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numba
+import numpy as np
+
+from . import noise as _noise
+from . import sample
+from . import utils
+
+SHIFT = np.uint64(32)
+LOWER = np.uint64(0xffffffff)
+
+
+@numba.njit(cache=True)
+def _merged(i, dgraph):
+    """ Get neighbors of i-th node, sorted, without the [0] placeholder for isolates.
+    """
+    v, e, deleted, inserted = dgraph
+    a, b = np.int64(v[i]), np.int64(v[i+1])
+    lo = np.searchsorted(inserted, np.uint64(i) << SHIFT)
+    hi = np.searchsorted(inserted, np.uint64(i+1) << SHIFT)
+    d = np.searchsorted(deleted, a)
+    res = np.empty(b - a - (np.searchsorted(deleted, b) - d) + hi - lo, dtype=e.dtype)
+    # merge alive base edges with the inserted ones
+    k = 0
+    j = lo
+    for p in range(a, b):
+        if d < deleted.size and deleted[d] == p:
+            d += 1
+            continue
+        while j < hi and (inserted[j] & LOWER) < e[p]:
+            res[k] = inserted[j] & LOWER
+            k += 1
+            j += 1
+        res[k] = e[p]
+        k += 1
+    while j < hi:
+        res[k] = inserted[j] & LOWER
+        k += 1
+        j += 1
+    return res
+
+
+@numba.njit(cache=True, parallel=True, nogil=True)
+def _fold(dgraph):
+    """ Fold the delta log into a fresh graph.
+    """
+    v, e, deleted, inserted = dgraph
+    n = v.size - 2
+    cnt = np.zeros(n+2, dtype=np.int64)
+    cnt[2:] = degree(dgraph)
+    nodes = np.cumsum(cnt)
+    edges = np.empty(nodes[-1], dtype=e.dtype)
+    for i in numba.prange(1, n+1):
+        edges[nodes[i]:nodes[i+1]] = _merged(i, dgraph)
+    return nodes.astype(np.uint64), edges
+
+
+@numba.njit(cache=True, parallel=True)
+def _positions(src, dst, graph):
+    res = np.empty(src.size, dtype=np.int64)
+    for i in numba.prange(src.size):
+        res[i] = utils.find_edge(src[i], dst[i], graph)
+    return res
+
+
+@numba.njit(cache=True)
+def degree(dgraph):
+    """ Get degrees of nodes in a dynamic graph.
+    """
+    v, e, deleted, inserted = dgraph
+    n = v.size - 2
+    bounds = np.arange(1, n+2).astype(np.uint64) << SHIFT  # @indexing
+    ins = np.searchsorted(inserted, bounds)
+    dels = np.searchsorted(deleted, v[1:].astype(np.int64))
+    return ((v[1:] - v[:-1])[1:]).astype(np.int64) + (ins[1:] - ins[:-1]) - (dels[1:] - dels[:-1])
+
+
+@numba.njit(cache=True)
+def ecount(dgraph):
+    """ Get edge count of a dynamic graph.
+    """
+    v, e, deleted, inserted = dgraph
+    return e.size - deleted.size + inserted.size  # @symmetry
+
+
+@numba.njit()
+def get_random_anti_edge(dgraph, vcount2=0, noise=None):
+    """ Sample a random nonexistent edge (see ``grl.graph.sample.get_random_anti_edge``). """
+    n = vcount(dgraph)
+    while True:
+        src = np.random.choice(n) + 1  # @indexing
+        v = _noise.draw(vcount2 if vcount2 else n, noise)
+        if not is_neighbor(v, src, dgraph):
+            return np.array([src, v], dtype=dgraph[1].dtype)
+
+
+@numba.njit()
+def get_random_edge(dgraph):
+    """ Sample a random existing edge, uniformly over the edges 
+        (see ``grl.graph.sample.get_random_edge``): a random position in the 
+        edges of the base graph followed by the inserted ones, redrawn if 
+        it hits a deleted edge. 
+    """
+    v, e, deleted, inserted = dgraph
+    if e.size == deleted.size and not inserted.size:
+        raise ValueError("graph has no edges")
+    while True:
+        p = np.random.randint(e.size + inserted.size)
+        if p >= e.size:
+            key = inserted[p - e.size]
+            return np.array([key >> SHIFT, key & LOWER], dtype=e.dtype)
+        k = np.searchsorted(deleted, p)
+        if k == deleted.size or deleted[k] != p:
+            src = np.searchsorted(v, np.uint64(p), side='right') - 1
+            return np.array([src, e[p]], dtype=e.dtype)
+
+
+@numba.njit()
+def get_random_pair(dgraph, vcount2=0, noise=None):
+    """ Sample a random pair of nodes (see ``grl.graph.sample.get_random_pair``). """
+    n = vcount(dgraph)
+    src = np.random.choice(n) + 1  # @indexing
+    dst = _noise.draw(vcount2 if vcount2 else n, noise)
+    return np.array([src, dst], dtype=dgraph[1].dtype)
+
+
+@numba.njit(cache=True)
+def is_neighbor(vi, vj, dgraph):
+    """ Tell if the nodes vi and vj are neighbors. """
+    v, e, deleted, inserted = dgraph
+    p = utils.find_edge(vj, vi, (v, e))
+    if p >= 0:
+        k = np.searchsorted(deleted, p)
+        return k == deleted.size or deleted[k] != p
+    key = (np.uint64(vj) << SHIFT) | np.uint64(vi)
+    k = np.searchsorted(inserted, key)
+    return k < inserted.size and inserted[k] == key
+
+
+@numba.njit(cache=True)
+def neighbors(i, dgraph):
+    """ Get neighbors of i-th node (see ``grl.graph.core.neighbors``).
+    """
+    if i > dgraph[0].size - 2:
+        raise IndexError("node not in graph")
+    res = _merged(i, dgraph)
+    if res.size:
+        return res
+    return np.array([0], dtype=dgraph[1].dtype)
+
+
+@numba.njit(cache=True)
+def vcount(dgraph):
+    """ Get vertex count of a dynamic graph.
+    """
+    return dgraph[0].size - 2
+
+
+@numba.njit(cache=False)
+@sample.sampler(get_random_edge, get_random_pair)
+def get_nce_sample():
+    """ Sample edges of a dynamic graph with balanced noise contrast
+        (see ``grl.graph.sample.get_nce_sample``). 
+    """
+    pass
+
+
+@numba.njit(cache=False)
+@sample.sampler(get_random_edge, get_random_anti_edge)
+def get_neg_sample():
+    """ Sample edges of a dynamic graph with balanced negative contrast
+        (see ``grl.graph.sample.get_neg_sample``). 
+    """
+    pass
+
+
+class DynamicGraph:
+    def __init__(self, graph, compaction=.25, background=True):
+        """ Create a graph supporting edge insertions and deletions.
+
+            Parameters
+            ----------
+            graph : tuple
+                Base grl graph.
+            compaction : float, optional
+                Compaction is triggered once the number of changed (inserted
+                or deleted) half-edges exceeds this fraction of the base graph's
+                edge count. Defaults to 0.25.
+            background : bool, optional
+                If set (default), compaction runs in a background thread,
+                otherwise it blocks the update that triggered it.
+                Call `close` to stop the thread once the graph is not updated anymore.
+        """
+        self._future = None
+        self._lock = threading.RLock()
+        self._log = None  # updates applied during background compaction
+        self._pool = ThreadPoolExecutor(1) if background else None
+        self.compaction = compaction
+        self._reset(utils.as_sorted(graph))
+
+    def __del__(self):
+        # the last reference may be dropped by the compaction thread itself
+        pool = getattr(self, '_pool', None)
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    @property
+    def base(self):
+        """ Base graph of the current merged view.
+        """
+        graph = self._graph
+        return graph[0], graph[1]
+
+    def close(self):
+        """ Wait for background compaction to finish and stop its thread.
+            Compaction triggered by subsequent updates blocks them.
+        """
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def compact(self):
+        """ Fold the delta log into a fresh base graph and return it, 
+            i.e. get the current graph (the base graph itself if no changes are pending).
+        """
+        self.wait()
+        with self._lock:
+            if self.pending:
+                self._reset(_fold(self._graph))
+            return self.base
+
+    def delete(self, el):
+        """ Delete edges (in both directions). Missing edges are ignored.
+
+            Parameters
+            ----------
+            el : 2darray[int]
+                Edge list of shape (k, 2), with nodes indexed from 1.
+        """
+        self._update(el, False)
+
+    @property
+    def graph(self):
+        """ Merged view of the graph, to be passed to compiled functions of this module.
+            The view is a snapshot: it is not modified by subsequent updates.
+        """
+        return self._graph
+
+    def insert(self, el):
+        """ Insert edges (in both directions). Existing edges and self-loops are ignored.
+
+            Parameters
+            ----------
+            el : 2darray[int]
+                Edge list of shape (k, 2), with nodes indexed from 1.
+        """
+        self._update(el, True)
+
+    @property
+    def pending(self):
+        """ Number of changed half-edges not yet folded into the base graph.
+        """
+        graph = self._graph
+        return graph[2].size + graph[3].size
+
+    def wait(self):
+        """ Wait for background compaction to finish.
+        """
+        future = self._future
+        if future is not None:
+            future.result()
+
+    def _apply(self, keys, insert):
+        v, e, deleted, inserted = self._graph
+        src = (keys >> SHIFT).astype(np.int64)
+        dst = (keys & LOWER).astype(np.int64)
+        pos = _positions(src, dst, (v, e))
+        base = pos >= 0
+        if insert:
+            deleted = np.setdiff1d(deleted, pos[base], assume_unique=True)
+            inserted = np.union1d(inserted, keys[~base])
+        else:
+            deleted = np.union1d(deleted, pos[base])
+            inserted = np.setdiff1d(inserted, keys[~base], assume_unique=True)
+        self._graph = (v, e, deleted, inserted)
+
+    def _compact_in_background(self):
+        with self._lock:
+            snapshot = self._graph
+            self._log = []
+        try:
+            graph = _fold(snapshot)
+            with self._lock:
+                self._reset(graph)
+                for keys, insert in self._log:
+                    self._apply(keys, insert)
+        finally:
+            # reset even if folding failed, so that updates are not logged forever
+            with self._lock:
+                self._log = None
+                self._future = None
+
+    def _reset(self, graph):
+        self._graph = (graph[0], graph[1], np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint64))
+
+    def _update(self, el, insert):
+        el = np.asarray(el, dtype=np.int64).reshape(-1, 2)
+        if el.size and (el.min() < 1 or el.max() > vcount(self.graph)):
+            raise ValueError("edge list refers to nodes outside of the graph")
+        el = el[el[:, 0] != el[:, 1]]
+        src = np.concatenate([el[:, 0], el[:, 1]]).astype(np.uint64)  # @symmetry
+        dst = np.concatenate([el[:, 1], el[:, 0]]).astype(np.uint64)
+        keys = np.unique((src << SHIFT) | dst)
+        with self._lock:
+            self._apply(keys, insert)
+            if self._log is not None:
+                self._log.append((keys, insert))
+            if self._future is None and self.pending > self.compaction * max(self._graph[1].size, 1):
+                if self._pool is None:
+                    self._reset(_fold(self._graph))
+                else:
+                    self._future = self._pool.submit(self._compact_in_background)
+
+
+# Alias
+nce = get_nce_sample
+neg = get_neg_sample
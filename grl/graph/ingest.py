@@ -0,0 +1,277 @@
+""" Chunked ingestion of edge list files into grl graph representation.
+
+Edge files are read in two passes: the first one counts node degrees,
+and the second one places edges directly into preallocated `nodes` and `edges`
+arrays (see ``grl.graph.core``), which can be memory-mapped to disk.
+Only a single chunk of the input file is held in memory at any time.
+
+If `memory` limit is given and the edges do not fit into it, the second pass
+spills sorted runs of edges to disk, which are then merged by ranges of nodes.
+"""
+import os
+import shutil
+import tempfile
+
+import numba
+import numpy as np
+
+from . import utils
+
+
+@numba.njit(cache=True)
+def _parse(buf):
+    """ Parse first two integers from every line of a text buffer.
+        Lines starting with '#' or '%' are treated as comments,
+        lines with less than two integers are skipped.
+        Negative node indices are rejected (other columns, e.g. weights, may be negative).
+    """
+    src = np.empty(buf.size//4+1, dtype=np.int64)
+    dst = np.empty(buf.size//4+1, dtype=np.int64)
+    cnt = 0
+    i = 0
+    while i < buf.size:
+        # comment
+        if buf[i] == 35 or buf[i] == 37:  # '#' or '%'
+            while i < buf.size and buf[i] != 10:
+                i += 1
+            i += 1
+            continue
+        # parse line
+        k = 0
+        x = 0
+        digit = False
+        while i < buf.size and buf[i] != 10:
+            c = buf[i]
+            if c == 45 and k < 2 and i+1 < buf.size and 48 <= buf[i+1] <= 57:  # '-' in a node index
+                raise ValueError("edge list refers to negative node indices")
+            if 48 <= c <= 57:
+                x = x*10 + (c - 48)
+                digit = True
+            elif digit:
+                if k == 0:
+                    src[cnt] = x
+                elif k == 1:
+                    dst[cnt] = x
+                k += 1
+                x = 0
+                digit = False
+            i += 1
+        if digit:
+            if k == 0:
+                src[cnt] = x
+            elif k == 1:
+                dst[cnt] = x
+            k += 1
+        if k >= 2:
+            cnt += 1
+        i += 1
+    return src[:cnt], dst[:cnt]
+
+
+@numba.njit(cache=True)
+def _compact(offset, nodes, edges):
+    """ Move deduplicated neighbour lists to their final positions. """
+    for i in range(1, offset.size-1):
+        if offset[i] != nodes[i]:
+            for j in range(nodes[i+1] - nodes[i]):
+                edges[nodes[i]+j] = edges[offset[i]+j]
+
+
+def chunks(path, fmt=None, chunk_size=2**22, dtype=np.int64, skiprows=0):
+    """ Read an edge list file in chunks.
+
+        Parameters
+        ----------
+        path : str
+            Path to the edge list file.
+        fmt : str, optional
+            One of: 'text' (whitespace delimited), 'csv', 'binary' (raw array
+            of node pairs) or 'npy'. Inferred from file extension if not given,
+            defaults to 'text'.
+        chunk_size : int, optional
+            Approximate number of edges per chunk.
+        dtype : numpy.dtype, optional
+            Type of the integers in 'binary' files. Defaults to int64.
+        skiprows : int, optional
+            Number of header lines to skip in 'text' and 'csv' files.
+
+        Yields
+        ------
+        (1darray[int64], 1darray[int64])
+            Source and destination nodes, as stored in the file.
+    """
+    fmt = fmt if fmt is not None else _infer_fmt(path)
+    if fmt in ('text', 'csv'):
+        yield from _chunks_text(path, chunk_size*16, skiprows)
+    elif fmt in ('binary', 'npy'):
+        if fmt == 'npy':
+            el = np.load(path, mmap_mode='r')
+        else:
+            el = np.memmap(path, dtype=dtype, mode='r')
+        el = el.reshape(-1, 2)
+        for i in range(0, el.shape[0], chunk_size):
+            chunk = np.asarray(el[i:i+chunk_size], dtype=np.int64)
+            yield chunk[:, 0].copy(), chunk[:, 1].copy()
+    else:
+        raise ValueError(f"unknown edge list format: {fmt}")
+
+
+def _chunks_text(path, block, skiprows):
+    with open(path, 'rb') as f:
+        for _ in range(skiprows):
+            f.readline()
+        tail = b''
+        while True:
+            buf = f.read(block)
+            if not buf:
+                break
+            buf = tail + buf
+            cut = buf.rfind(b'\n') + 1
+            buf, tail = buf[:cut], buf[cut:]
+            if buf:
+                yield _parse(np.frombuffer(buf, dtype=np.uint8))
+        if tail:
+            yield _parse(np.frombuffer(tail, dtype=np.uint8))
+
+
+def _infer_fmt(path):
+    ext = os.path.splitext(path)[1].lower()
+    return {'.csv': 'csv', '.npy': 'npy', '.bin': 'binary'}.get(ext, 'text')
+
+
+def from_file(path,
+              fmt=None,
+              vcount=None,
+              symmetric=True,
+              indexing=1,
+              out=None,
+              memory=None,
+              chunk_size=2**22,
+              dtype=np.int64,
+              skiprows=0,
+              tmpdir=None):
+    """ Convert edge list file to grl graph representation without loading
+        the whole edge list into memory.
+
+        Parameters
+        ----------
+        path : str
+            Path to the edge list file.
+        fmt : str, optional
+            One of: 'text', 'csv', 'binary', 'npy'; see `chunks`.
+        vcount : int, optional
+            Number of nodes in the graph. Defaults to the largest node index in the file.
+        symmetric : bool, optional
+            If set, every edge is added in both directions. Defaults to True.
+        indexing : int, optional
+            Index of the first node in the file (0 or 1). Defaults to 1.
+        out : str, optional
+            If given, the graph is written to this path in grl binary format
+            (see ``grl.graph.utils.save``) and memory-mapped from it.
+        memory : int, optional
+            Memory limit (in bytes) for edge placement. If the edges do not fit,
+            sorted runs are spilled to `tmpdir` and merged. Requires `out`, 
+            so that the edges are placed in a memory-mapped file rather than 
+            in memory. Defaults to no limit.
+        chunk_size : int, optional
+            Approximate number of edges read at once.
+        dtype : numpy.dtype, optional
+            Type of the integers in 'binary' files.
+        skiprows : int, optional
+            Number of header lines to skip in 'text' and 'csv' files.
+        tmpdir : str, optional
+            Directory for the spilled runs.
+
+        Returns
+        -------
+        tuple
+            grl graph
+
+        Notes
+        -----
+        Self-loops and duplicated edges are dropped, neighbour lists are sorted.
+    """
+    if memory is not None and out is None:
+        raise ValueError("memory limit requires an output file (out)")
+    read = lambda: chunks(path, fmt, chunk_size, dtype, skiprows)
+    shift = 1 - indexing  # @indexing
+
+    # first pass: count degrees
+    cnt = np.zeros((vcount or 0)+2, dtype=np.int64)
+    for src, dst in read():
+        if not src.size:
+            continue
+        src += shift
+        dst += shift
+        if min(src.min(), dst.min()) < 1:
+            raise ValueError("edge list refers to nodes outside of the graph")
+        top = int(max(src.max(), dst.max()))
+        if top+2 > cnt.size:
+            if vcount is not None:
+                raise ValueError("edge list refers to nodes outside of the graph")
+            cnt = np.concatenate([cnt, np.zeros(top+2-cnt.size, dtype=np.int64)])
+        utils._count_degrees(src, dst, cnt, symmetric)
+    offset = np.cumsum(cnt)
+    size = int(offset[-1])
+
+    if out is None:
+        nodes = np.empty(offset.size, dtype=np.uint64)
+        edges = np.empty(size, dtype=np.uint32)
+    else:
+        nodes, edges = utils.open_memmap(out, offset.size-2, size)
+
+    # second pass: place edges
+    if memory is None or size*edges.itemsize <= memory:
+        cursor = offset[:-1].copy()
+        for src, dst in read():
+            utils._scatter_edges(src+shift, dst+shift, edges, cursor, symmetric)
+        ucnt = utils._sort_unique(offset, edges)
+        nodes[:] = np.cumsum(ucnt)
+        _compact(offset, nodes, edges)
+    else:
+        _spill_and_merge(read, shift, offset, nodes, edges, symmetric, memory, tmpdir)
+
+    ecount = int(nodes[-1])
+    if out is None:
+        return nodes, edges[:ecount].copy() if ecount < size else edges
+    utils.save_header(out, (nodes, edges[:ecount]))
+    return utils.load(out)
+
+
+def _spill_and_merge(read, shift, offset, nodes, edges, symmetric, memory, tmpdir):
+    """ Write sorted runs of edges (as uint64 keys: src << 32 | dst) to disk,
+        then merge them in ranges of nodes that fit in memory.
+    """
+    tmp = tempfile.mkdtemp(dir=tmpdir, prefix='grl-')
+    try:
+        runs = []
+        for src, dst in read():
+            src, dst = src+shift, dst+shift
+            loop = src == dst
+            src, dst = src[~loop], dst[~loop]
+            if symmetric:
+                src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+            keys = np.unique((src.astype(np.uint64) << np.uint64(32)) | dst.astype(np.uint64))
+            runs.append(os.path.join(tmp, f"run-{len(runs)}.npy"))
+            np.save(runs[-1], keys)
+        runs = [np.load(run, mmap_mode='r') for run in runs]
+
+        # merge: every window spans nodes whose (raw) edges fit in half of the memory
+        window = max(memory//(2*8), 1)
+        nodes[:2] = 0
+        lo, pos = 1, 0
+        vcount = offset.size - 2
+        while lo <= vcount:
+            hi = max(int(np.searchsorted(offset, offset[lo] + window, side='right')) - 1, lo+1)
+            hi = min(hi, vcount+1)
+            a, b = np.uint64(lo) << np.uint64(32), np.uint64(hi) << np.uint64(32)
+            keys = np.unique(np.concatenate(
+                [run[np.searchsorted(run, a):np.searchsorted(run, b)] for run in runs]))
+            src = (keys >> np.uint64(32)).astype(np.int64)
+            edges[pos:pos+keys.size] = keys & np.uint64(0xffffffff)
+            nodes[lo+1:hi+1] = pos + np.cumsum(np.bincount(src - lo, minlength=hi-lo))
+            pos += keys.size
+            lo = hi
+        del runs
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
@@ -5,6 +5,7 @@ from grl import metrics
 from grl import numby
 from grl import shmem
 from grl.graph import sample
+from grl.graph import weighted
 from grl.utils import log, random_hex
 from . import activations
 from . import initializers
@@ -19,7 +20,9 @@ class Model:
                  dim, 
                  emb_type='asymmetric', 
                  activation='sigmoid', 
-                 sampler='nce'):
+                 sampler='nce',
+                 reorder=None,
+                 noise=None):
         """ Create a shallow model of a graph.
 
             Parameters
@@ -34,10 +37,26 @@ class Model:
                 symmetric. Defaults to 'asymmetric'.
             activation : str, optional
                 Name of the activation, defaults to 'sigmoid'.
-            sampler : str, optional
+            sampler : str or function, optional
                 Name of the sampler, one of the functions implemented in the 
-                graph.sample module. Defaults to 'nce' (noise contrastive). 
+                graph.sample module, or a sampler with the same signature 
+                (e.g. ``grl.graph.node2vec.get_random_walk_sample``). 
+                Defaults to 'nce' (noise contrastive). 
+            reorder : str, optional
+                If given, nodes of the graphs passed to `fit` and `evaluate` are 
+                relabeled for memory locality of parameter updates, with one of 
+                the methods of ``grl.graph.utils.reorder``. The permutation is 
+                stored in `perm`, `predict` takes nodes of the original graph, 
+                and `export` returns parameters in the original order. 
+                Unimodal graphs only. Defaults to None (no reordering).
+            noise : str, float or 1darray, optional
+                Noise distribution of the contrastive sampler (see 
+                ``grl.graph.noise.get``): 'uniform', exponent of the unigram 
+                distribution (e.g. 0.75 for degree**0.75), or weights of the nodes. 
+                Defaults to None (uniform).
         """
+        if reorder is not None and not (type(obs) is int or len(obs) == 1):
+            raise ValueError("reordering is supported for unimodal graphs only")
         self._futures = []  # for debugging; workers return None
         self._id = random_hex()
         self._params = []
@@ -46,29 +65,38 @@ class Model:
         self.bimodal = False if type(obs) is int or len(obs) == 1 else True
         self.dim = dim
         self.obs = obs
-        self.sampler = getattr(sample, sampler)
+        self.sampler = getattr(sample, sampler) if type(sampler) is str else sampler
         self.emb_type = emb_type
         self.nargs = (obs[1] if self.bimodal else 0,)  # :| 
+        self.perm = None  # node permutation, see `reorder`
+        self.iperm = None
+        self.noise = noise
+        self.reorder = reorder
         self.initialize()
 
     def evaluate(self, graph_or_ref, pargs=(), sample_size=8192):
-        if type(graph_or_ref) is not str:
-            graph = graph_or_ref
-        else:
-            graph = shmem.get(graph_or_ref)
-        x, y = self.sampler(graph, sample_size, pargs=pargs, nargs=self.nargs)
-        yhat = self.predict(x) 
+        graph = utils.reordered(self, graph_or_ref)
+        sampler, nargs = utils.sampler(self, graph)
+        pargs = utils.pargs(self, graph_or_ref, pargs)
+        x, y = sampler(graph, sample_size, pargs=pargs, nargs=nargs)
+        yhat = self._predict(x) 
         return metrics.accuracy(y, yhat)
 
-    def fit(self, graph_or_ref, steps, pargs=(), lr=.01, dropout=.0, cos_decay=False):
+    def fit(self, graph_or_ref, steps, pargs=(), lr=.01, dropout=.0, cos_decay=False, weights=None):
         """ Perform `steps` parameter updates.
 
             Parameters
             ----------
-            graph_or_ref : tuple or str
-                A graph or a reference to a graph registered in grl's shmem.
+            graph_or_ref : tuple, str or DynamicGraph
+                A graph, a reference to a graph registered in grl's shmem, 
+                or a dynamic graph (see ``grl.graph.dynamic``), fitted to its 
+                current graph. 
             steps : int
                 Number of updates to perform.
+            pargs : tuple, optional
+                Positional arguments to the positive sampler, for the graph 
+                as given (edge masks are reordered along with the graph, 
+                see `reorder`). 
             lr : float, optional
                 Learning rate. Defaults to 0.01.
             dropout : float, optional
@@ -76,18 +104,31 @@ class Model:
             cos_decay : bool, optional
                 If set, cosine decay schedule will be applied to learning rate.
                 Defaults to False.
+            weights : 1darray[float], optional
+                Edge weights aligned with the edges array of the graph 
+                (see ``grl.graph.weighted``). If given, the loss of positive 
+                examples is scaled by the weights of their edges. Samplers 
+                of ``grl.graph.weighted`` take the weights instead (rejected 
+                here, as they draw edges in proportion to the weights already). 
 
             Returns
             -------
             None
                 Used for side effects. 
         """
-        if type(graph_or_ref) is not str:
-            ref = shmem.graph.register(graph_or_ref)
+        if type(graph_or_ref) is not str or self.reorder is not None:
+            ref = shmem.graph.register(utils.reordered(self, graph_or_ref))
         else:
             ref = graph_or_ref
+        wref = utils.weights(self, graph_or_ref, ref, weights)
+        pargs = utils.pargs(self, graph_or_ref, pargs)
         checks(self, shmem.get(ref))
-        return encode(self, ref, pargs, steps, lr, cos_decay, dropout)
+        return encode(self, ref, pargs, steps, lr, cos_decay, dropout, wref)
+
+    def export(self):
+        """ Get copies of parameters, with rows indexed by nodes of the original graph.
+        """
+        return utils.export(self)
 
     def initialize(self):
         # init params
@@ -98,6 +139,11 @@ class Model:
         return self._params
 
     def predict(self, x):
+        """ Predict edges between nodes of the original graph. 
+        """
+        return self._predict(x if self.perm is None else self.iperm[x])
+
+    def _predict(self, x):
         return getattr(predictors, self.emb_type)(x, *self.params, self.activation)
     
     @property
@@ -117,22 +163,27 @@ def encode(model,
            steps, 
            lr, 
            cos_decay, 
-           dropout): 
+           dropout,
+           wref=None): 
+    sampler, nargs = utils.sampler(model, shmem.get(ref))
     with ProcessPoolExecutor(config.CORES) as p:
         for core in range(config.CORES):
             model._futures.append(
                 p.submit(worker_mp_wrapper, 
                          worker=getattr(workers, model.emb_type),
-                         sampler=model.sampler,
+                         sampler=sampler,
                          activation=model.activation,
                          ref=ref,
                          refs=model.refs,
                          pargs=pargs,
-                         nargs=model.nargs,
+                         nargs=nargs,
                          steps=utils.split_steps(steps, config.CORES), 
                          lr=lr, 
                          cos_decay=cos_decay, 
-                         dropout=dropout)) 
+                         dropout=dropout,
+                         wref=wref)) 
+        for future in model._futures[-config.CORES:]:
+            future.result()  # raise exceptions of the workers
 
 
 def worker_mp_wrapper(worker,
@@ -145,10 +196,12 @@ def worker_mp_wrapper(worker,
                       steps,
                       lr, 
                       cos_decay, 
-                      dropout): 
+                      dropout,
+                      wref=None):  # edge weights ref
     parts = steps//config.PART_SIZE
     for i in range(parts):
         x, y = sampler(shmem.get(ref), config.PART_SIZE, pargs=pargs, nargs=nargs)
+        s = None if wref is None else weighted.scale(x, y, shmem.get(ref), shmem.get(wref))
         clr = lr if not cos_decay else numby.cos_decay(i/parts)*lr
-        worker(x, y, *(shmem.get(e) for e in refs), clr, activation, dropout)
+        worker(x, y, s, *(shmem.get(e) for e in refs), clr, activation, dropout)
 
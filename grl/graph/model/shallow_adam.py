@@ -5,6 +5,7 @@ from grl import metrics
 from grl import numby
 from grl import shmem
 from grl.graph import sample
+from grl.graph import weighted
 from grl.utils import log, random_hex
 from . import activations
 from . import initializers_adam
@@ -19,7 +20,9 @@ class ModelAdam:
                  dim, 
                  emb_type='asymmetric', 
                  activation='sigmoid', 
-                 sampler='neg'):
+                 sampler='neg',
+                 reorder=None,
+                 noise=None):
         """ Create a shallow model of a graph.
 
             Parameters
@@ -34,10 +37,26 @@ class ModelAdam:
                 symmetric. Defaults to 'asymmetric'.
             activation : str, optional
                 Name of the activation, defaults to 'sigmoid'.
-            sampler : str, optional
+            sampler : str or function, optional
                 Name of the sampler, one of the functions implemented in the 
-                graph.sample module. Defaults to 'nce' (noise contrastive). 
+                graph.sample module, or a sampler with the same signature 
+                (e.g. ``grl.graph.node2vec.get_random_walk_sample``). 
+                Defaults to 'nce' (noise contrastive). 
+            reorder : str, optional
+                If given, nodes of the graphs passed to `fit` and `evaluate` are 
+                relabeled for memory locality of parameter updates, with one of 
+                the methods of ``grl.graph.utils.reorder``. The permutation is 
+                stored in `perm`, `predict` takes nodes of the original graph, 
+                and `export` returns parameters in the original order. 
+                Unimodal graphs only. Defaults to None (no reordering).
+            noise : str, float or 1darray, optional
+                Noise distribution of the contrastive sampler (see 
+                ``grl.graph.noise.get``): 'uniform', exponent of the unigram 
+                distribution (e.g. 0.75 for degree**0.75), or weights of the nodes. 
+                Defaults to None (uniform).
         """
+        if reorder is not None and not (type(obs) is int or len(obs) == 1):
+            raise ValueError("reordering is supported for unimodal graphs only")
         self._futures = []  # for debugging; workers return None
         self._id = random_hex()
         self._params = []
@@ -46,45 +65,62 @@ class ModelAdam:
         self.bimodal = False if type(obs) is int or len(obs) == 1 else True
         self.dim = dim
         self.obs = obs
-        self.sampler = getattr(sample, sampler)
+        self.sampler = getattr(sample, sampler) if type(sampler) is str else sampler
         self.emb_type = emb_type
         self.vcount2 = obs[1] if self.bimodal else 0 
+        self.nargs = (self.vcount2,)
+        self.perm = None  # node permutation, see `reorder`
+        self.iperm = None
+        self.noise = noise
+        self.reorder = reorder
         self.initialize()
 
     def evaluate(self, graph_or_ref, sample_size=8192):
-        if type(graph_or_ref) is not str:
-            graph = graph_or_ref
-        else:
-            graph = shmem.get(graph_or_ref)
-        x, y = self.sampler(graph, sample_size, self.vcount2)
-        yhat = self.predict(x) 
+        graph = utils.reordered(self, graph_or_ref)
+        sampler, nargs = utils.sampler(self, graph)
+        x, y = sampler(graph, sample_size, nargs=nargs)
+        yhat = self._predict(x) 
         return metrics.accuracy(y, yhat)
 
-    def fit(self, graph_or_ref, steps, lr=1e-4, b1=.9, b2=.999):
+    def fit(self, graph_or_ref, steps, lr=1e-4, b1=.9, b2=.999, weights=None):
         """ Perform `steps` parameter updates.
 
             Parameters
             ----------
-            graph_or_ref : tuple or str
-                A graph or a reference to a graph registered in grl's shmem.
+            graph_or_ref : tuple, str or DynamicGraph
+                A graph, a reference to a graph registered in grl's shmem, 
+                or a dynamic graph (see ``grl.graph.dynamic``), fitted to its 
+                current graph. 
             steps : int
                 Number of updates to perform.
             lr : float, optional
                 Learning rate. Defaults to 0.25.
             b1 : float, optional
             b2 : float, optional
+            weights : 1darray[float], optional
+                Edge weights aligned with the edges array of the graph 
+                (see ``grl.graph.weighted``). If given, the loss of positive 
+                examples is scaled by the weights of their edges. Samplers 
+                of ``grl.graph.weighted`` take the weights instead (rejected 
+                here, as they draw edges in proportion to the weights already). 
 
             Returns
             -------
             None
                 Used for side effects. 
         """
-        if type(graph_or_ref) is not str:
-            ref = shmem.graph.register(graph_or_ref)
+        if type(graph_or_ref) is not str or self.reorder is not None:
+            ref = shmem.graph.register(utils.reordered(self, graph_or_ref))
         else:
             ref = graph_or_ref
+        wref = utils.weights(self, graph_or_ref, ref, weights)
         checks(self, shmem.get(ref))
-        return encode(self, ref, steps, lr, b1, b2)
+        return encode(self, ref, steps, lr, b1, b2, wref)
+
+    def export(self):
+        """ Get copies of parameters, with rows indexed by nodes of the original graph.
+        """
+        return utils.export(self)
 
     def initialize(self):
         # init params
@@ -95,6 +131,11 @@ class ModelAdam:
         return self._params
 
     def predict(self, x):
+        """ Predict edges between nodes of the original graph. 
+        """
+        return self._predict(x if self.perm is None else self.iperm[x])
+
+    def _predict(self, x):
         return getattr(predictors, self.emb_type)(x, *self.params[:2], self.activation)
     
     @property
@@ -111,19 +152,24 @@ def checks(model, graph):
 def encode(model,
            ref, 
            steps, 
-           lr, b1, b2): 
+           lr, b1, b2,
+           wref=None): 
+    sampler, nargs = utils.sampler(model, shmem.get(ref))
     with ProcessPoolExecutor(config.CORES) as p:
         for core in range(config.CORES):
             model._futures.append(
                 p.submit(worker_mp_wrapper, 
                          worker=getattr(workers_adam, model.emb_type),
-                         sampler=model.sampler,
+                         sampler=sampler,
                          activation=model.activation,
                          ref=ref,
                          refs=model.refs,
-                         vcount2=model.vcount2,
+                         nargs=nargs,
                          steps=utils.split_steps(steps, config.CORES), 
-                         lr=lr, b1=b1, b2=b2)) 
+                         lr=lr, b1=b1, b2=b2,
+                         wref=wref)) 
+        for future in model._futures[-config.CORES:]:
+            future.result()  # raise exceptions of the workers
 
 
 def worker_mp_wrapper(worker,
@@ -131,11 +177,13 @@ def worker_mp_wrapper(worker,
                       activation,
                       ref,   # data ref  
                       refs,  # param refs
-                      vcount2,
+                      nargs,
                       steps,
-                      lr, b1, b2): 
+                      lr, b1, b2,
+                      wref=None):  # edge weights ref
     parts = steps//config.PART_SIZE
     for i in range(parts):
-        x, y = sampler(shmem.get(ref), config.PART_SIZE, vcount2)
-        worker(x, y, lr, b1, b2, activation, *(shmem.get(e) for e in refs))
+        x, y = sampler(shmem.get(ref), config.PART_SIZE, nargs=nargs)
+        s = None if wref is None else weighted.scale(x, y, shmem.get(ref), shmem.get(wref))
+        worker(x, y, s, lr, b1, b2, activation, *(shmem.get(e) for e in refs))
 
@@ -1,6 +1,114 @@
 import numba
+import numpy as np
 
 import grl
+from grl import shmem
+from grl.graph import bipartite
+from grl.graph import bitset
+from grl.graph import cache
+from grl.graph import dynamic
+from grl.graph import noise
+from grl.graph import sample
+from grl.graph import weighted
+
+
+# bipartite counterparts of the samplers (see `sampler`)
+BIPARTITE = {
+    sample.get_nce_sample: bipartite.get_nce_sample,
+    sample.get_neg_sample: bipartite.get_neg_sample,
+}
+
+
+def export(model):
+    """ Get copies of model parameters, with rows indexed by the nodes of the 
+        original graph (i.e. undoing node reordering, see `reordered`). 
+    """
+    if model.perm is None:
+        return [np.array(p) for p in model.params]
+    return [p[model.iperm] if p.shape[0] == model.iperm.size else np.array(p) 
+            for p in model.params]
+
+
+def pargs(model, graph_or_ref, args):
+    """ Get positional arguments of the positive sampler for the graph the model 
+        is fitted to (see `reordered`), given for the graph as passed to the model: 
+        edge masks (arrays aligned with the edges array) are permuted along with 
+        the edges. Other arrays (e.g. alias tables) cannot be, and are rejected 
+        if the model reorders nodes. 
+    """
+    if model.reorder is None or not args:
+        return args
+    graph = resolve(graph_or_ref)
+    sub, perm = cache.get(graph, f"reorder_{model.reorder}")
+    res = []
+    for x in args:
+        if isinstance(x, np.ndarray) and x.shape == graph[1].shape:
+            x = weighted.take(perm[1:], sub, graph, x)
+        elif not np.isscalar(x):
+            raise ValueError("only edge masks and scalars can be passed to the sampler of a model reordering nodes")
+        res.append(x)
+    return tuple(res)
+
+
+def reordered(model, graph_or_ref):
+    """ Get graph to fit the model to: the given graph (or the graph registered 
+        under the given reference), with nodes relabeled if the model reorders them 
+        (see ``grl.graph.utils.reorder``). 
+        The permutation of the first graph is stored in the model, and later graphs 
+        are relabeled with it, so that rows of the parameters keep referring to 
+        the same nodes. Reordered graphs are cached, so that refitting does not 
+        relabel them again. 
+    """
+    graph = resolve(graph_or_ref)
+    if model.reorder is None:
+        return graph
+    key = f"reorder_{model.reorder}"
+    res = cache.get(graph, key)
+    if res is None or (model.perm is not None and res[1] is not model.perm):
+        if model.perm is None:
+            res = grl.graph.utils.reorder(graph, model.reorder)
+        elif grl.vcount(graph) != model.perm.size - 1:
+            raise ValueError("graph has a different number of nodes than the graph the model was reordered for")
+        else:
+            res = grl.subgraph(model.perm[1:], graph), model.perm
+        cache.set(graph, key, res)
+    graph, perm = res
+    if model.perm is None:
+        model.perm, model.iperm = perm, np.argsort(perm)
+    return graph
+
+
+def resolve(graph_or_ref):
+    """ Get the graph given as a graph, a reference to a graph registered in shmem, 
+        or a dynamic graph (its current graph, see ``grl.graph.dynamic.DynamicGraph.compact``). 
+    """
+    if type(graph_or_ref) is str:
+        return shmem.get(graph_or_ref)
+    if isinstance(graph_or_ref, dynamic.DynamicGraph):
+        return graph_or_ref.compact()
+    return graph_or_ref
+
+
+def sampler(model, graph):
+    """ Get the model's sampler for the graph, with its contrastive arguments. 
+        Bipartite graphs (see ``grl.graph.bipartite``) are sampled with 
+        the bipartite counterpart of the sampler (see `BIPARTITE`), with edges 
+        drawn uniformly, so that nodes of both sides are trained. 
+        The noise table of the model (see ``grl.graph.noise``) is cached 
+        for the graph, so that it is built once per registered graph. 
+        Bitset adjacency of samplers using it (see ``grl.graph.sample.with_bitset``) 
+        is built here as well, before the workers are forked, so that they share it. 
+    """
+    sampler = model.sampler
+    if len(graph) == 4:
+        if sampler not in BIPARTITE:
+            raise ValueError(f"sampler {sampler.__name__} is not supported for bipartite graphs")
+        sampler = BIPARTITE[sampler]
+    elif isinstance(sampler, sample.BitsetSampler):
+        bitset.get(graph)
+    if model.noise is None:
+        return sampler, model.nargs
+    return sampler, (*model.nargs, noise.get(graph, model.noise, model.nargs[0]))
 
 
 @numba.njit(cache=True)
@@ -12,3 +120,23 @@ def split_steps(steps, cores):
     # so we need to correct for that. 
     res = steps//cores
     return res - res % 2
+
+
+def weights(model, graph_or_ref, ref, w):
+    """ Register edge weights of the graph in shmem, for the graph the model 
+        is fitted to (see `reordered`), registered under `ref`. 
+        Weights are normalised to mean 1, so that weighting the loss 
+        (see ``grl.graph.weighted.scale``) keeps the scale of the learning rate. 
+        Returns reference to the weights, or None if not given. 
+        Weighted samplers (see ``grl.graph.weighted``) draw edges in proportion 
+        to their weights already, so weighting their loss as well is rejected. 
+    """
+    if w is None:
+        return None
+    if model.sampler in weighted.SAMPLERS:
+        raise ValueError("weighted samplers draw edges in proportion to their weights; pass the weights to the sampler or to fit, not both")
+    graph = resolve(graph_or_ref)
+    if model.reorder is not None:
+        perm = cache.get(graph, f"reorder_{model.reorder}")[1]
+        w = weighted.take(perm[1:], shmem.get(ref), graph, w)
+    return shmem.graph.register_weights(ref, w / w.mean())
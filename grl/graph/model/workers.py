@@ -6,7 +6,7 @@ from grl import numby
 
 
 @numba.njit(cache=True)
-def asymmetric(x, y, L, R, lr, activation, dropout):
+def asymmetric(x, y, s, L, R, lr, activation, dropout):
     n = x.shape[0]
     if dropout > 0:
         j = np.random.choice(L.shape[1], int(L.shape[1]*(1-dropout)))
@@ -17,6 +17,8 @@ def asymmetric(x, y, L, R, lr, activation, dropout):
         xR = R[x[i, 1]][j]
         # compute gradients
         dy = activation(np.sum(xL*xR)) - y[i]
+        if s is not None:  # loss weights
+            dy *= s[i]
         dxL = clip(xR*dy)
         dxR = clip(xL*dy)
         # update parameters
@@ -31,7 +33,7 @@ def clip(x):
 
 
 @numba.njit(cache=True)
-def diagonal(x, y, L, D, lr, activation, dropout):
+def diagonal(x, y, s, L, D, lr, activation, dropout):
     n = x.shape[0]
     if dropout > 0:
         j = np.random.choice(L.shape[1], int(L.shape[1]*(1-dropout)))
@@ -42,6 +44,8 @@ def diagonal(x, y, L, D, lr, activation, dropout):
         xR = L[x[i, 1]][j]
         # compute gradients
         dy = activation(np.sum(xL*xR*D)) - y[i]  # output
+        if s is not None:  # loss weights
+            dy *= s[i]
         dxLR = D*dy  # embedding product 
         dD = clip(xL*xR*dy)  # diagonal
         dxL = clip(xR*dxLR)  # left vector
@@ -53,7 +57,7 @@ def diagonal(x, y, L, D, lr, activation, dropout):
 
 
 @numba.njit(cache=True)
-def symmetric(x, y, L, lr, activation, dropout):
+def symmetric(x, y, s, L, lr, activation, dropout):
     n = x.shape[0]    
     if dropout > 0:
         j = np.random.choice(L.shape[1], int(L.shape[1]*(1-dropout)))
@@ -64,6 +68,8 @@ def symmetric(x, y, L, lr, activation, dropout):
         xR = L[x[i, 1]][j]
         # compute gradients
         dy = activation(np.sum(xL*xR)) - y[i]
+        if s is not None:  # loss weights
+            dy *= s[i]
         dxL = clip(xR*dy)
         dxR = clip(xL*dy)
         # update parameters
@@ -6,7 +6,7 @@ from grl import numby
 
 
 @numba.njit(cache=True)
-def asymmetric(x, y, lr, b1, b2, activation, 
+def asymmetric(x, y, s, lr, b1, b2, activation, 
                L, R, mL, mR, vL, vR, tL, tR):
     n = x.shape[0]
     for j in range(n):
@@ -15,6 +15,8 @@ def asymmetric(x, y, lr, b1, b2, activation,
         xR = R[iR]
         # compute gradients
         dy = activation(np.sum(xL*xR)) - y[j]
+        if s is not None:  # loss weights
+            dy *= s[j]
         dxL = clip(xR*dy)
         dxR = clip(xL*dy)
         # update adam parameters
@@ -42,13 +44,15 @@ def clip(x):
 
 
 @numba.njit(cache=True)
-def diagonal(x, y, L, D, lr, activation):
+def diagonal(x, y, s, L, D, lr, activation):
     n = x.shape[0]
     for i in range(n):
         xL = L[x[i, 0]]
         xR = L[x[i, 1]]
         # compute gradients
         dy = activation(np.sum(xL*xR*D)) - y[i]  # output
+        if s is not None:  # loss weights
+            dy *= s[i]
         dxLR = D*dy  # embedding product 
         dD = clip(xL*xR*dy)  # diagonal
         dxL = clip(xR*dxLR)  # left vector
@@ -60,13 +64,15 @@ def diagonal(x, y, L, D, lr, activation):
 
 
 @numba.njit(cache=True)
-def symmetric(x, y, L, lr, activation):
+def symmetric(x, y, s, L, lr, activation):
     n = x.shape[0]    
     for i in range(n):
         xL = L[x[i, 0]]
         xR = L[x[i, 1]]
         # compute gradients
         dy = activation(np.sum(xL*xR)) - y[i]
+        if s is not None:  # loss weights
+            dy *= s[i]
         dxL = clip(xR*dy)
         dxR = clip(xL*dy)
         # update parameters
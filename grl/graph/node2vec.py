@@ -0,0 +1,232 @@
+""" Second-order (node2vec) random walks.
+
+A node2vec walk that moved from node t to node v moves on to a neighbour x
+of v with probability proportional to:
+    - 1/p if x == t (return),
+    - 1 if x is a neighbour of t (same distance from t),
+    - 1/q otherwise (moving away from t).
+Low q makes walks explore outwards (DFS-like, homophily), and high q keeps them
+local (BFS-like, structural equivalence). The first step of a walk is uniform.
+
+Steps are drawn in one of two modes:
+    - rejection sampling (default): a uniform neighbour of v is accepted with
+      probability proportional to its weight, which is tested with a binary
+      search over the (sorted) neighbour list of t. No memory is needed beyond
+      the graph itself.
+    - alias tables (see `alias_tables`): every edge (t, v) has its own alias
+      table over the neighbours of v, so that steps take O(1). The tables take
+      sum(degree**2) entries, so this mode fits graphs of moderate size only.
+"""
+import numba
+import numpy as np
+
+from grl import numby
+from . import cache
+from . import core
+from . import sample
+from . import utils
+
+
+@numba.njit(cache=True, parallel=True)
+def alias_tables(graph, p, q):
+    """ Build alias tables of node2vec transitions along every edge.
+
+        Parameters
+        ----------
+        graph : tuple
+        p : float
+            Return parameter.
+        q : float
+            In-out parameter.
+
+        Returns
+        -------
+        tuple
+            (offset, prob, alias): the table of the edge at position j of
+            the edges array spans [offset[j], offset[j+1]) of `prob` and `alias`,
+            with entries for the neighbours of its destination node (aliases
+            are offsets within the neighbour list).
+    """
+    v, e = graph
+    n = core.vcount(graph)
+    size = np.zeros(e.size+1, dtype=np.int64)
+    for j in numba.prange(e.size):
+        size[j+1] = np.int64(v[e[j]+1]) - np.int64(v[e[j]])
+    offset = np.cumsum(size)
+    prob = np.empty(offset[-1], dtype=np.float32)
+    alias = np.empty(offset[-1], dtype=np.int64)
+    for t in numba.prange(1, n+1):
+        for j in range(np.int64(v[t]), np.int64(v[t+1])):
+            x = e[j]
+            lo, hi = np.int64(v[x]), np.int64(v[x+1])
+            w = np.empty(hi-lo, dtype=np.float64)
+            for k in range(hi-lo):
+                w[k] = _bias(t, e[lo+k], graph, p, q)
+            numby.alias_table(w, prob[offset[j]:offset[j+1]], alias[offset[j]:offset[j+1]])
+    return offset, prob, alias
+
+
+@numba.njit(cache=True)
+def _bias(t, x, graph, p, q):
+    """ Get unnormalised probability of moving to x, given the previous node t. """
+    if x == t:
+        return 1 / p
+    if utils.find_edge(t, x, graph) >= 0:
+        return 1.
+    return 1 / q
+
+
+def get(graph, p, q):
+    """ Get alias tables of node2vec transitions (see `alias_tables`),
+        cached for the graph and parameters (see ``grl.graph.cache``).
+    """
+    key = f"node2vec_{p}_{q}"
+    res = cache.get(graph, key)
+    if res is None:
+        res = alias_tables(graph, p, q)
+        cache.set(graph, key, res)
+    return res
+
+
+@numba.njit()
+def _step(j, graph, p, q, tables=None):
+    """ Get position of the next edge of a walk which moved along the edge
+        at position j, or -1 if it reached a node without neighbours.
+    """
+    v, e = graph
+    x = e[j]
+    lo, hi = np.int64(v[x]), np.int64(v[x+1])
+    if lo == hi:
+        return -1
+    if tables is not None:
+        offset, prob, alias = tables
+        a, b = offset[j], offset[j+1]
+        return lo + numby.alias_draw(prob[a:b], alias[a:b])
+    # rejection sampling
+    t = np.searchsorted(v, np.uint64(j), side='right') - 1
+    top = max(1 / p, 1., 1 / q)
+    while True:
+        k = lo + np.random.randint(hi-lo)
+        if np.random.random() * top < _bias(t, e[k], graph, p, q):
+            return k
+
+
+@numba.njit()
+def _next(x, j, graph, p, q, tables=None):
+    """ Move a walk from node x, which it reached along the edge at position j 
+        (-1 at the start of the walk), return the next node and edge position. 
+        Walks at node 0 (after a dead end) stay there. 
+    """
+    v, e = graph
+    if not x:
+        return 0, -1
+    if j < 0:
+        lo, hi = np.int64(v[x]), np.int64(v[x+1])
+        j = lo + np.random.randint(hi-lo) if hi > lo else -1
+    else:
+        j = _step(j, graph, p, q, tables)
+    if j < 0:
+        return 0, -1
+    return np.int64(e[j]), j
+
+
+@numba.njit()
+def _walk(vi, graph, out, p, q, tables=None):
+    """ Fill `out` with a node2vec walk starting from vi (padded with 0 at a dead end). """
+    out[0] = vi
+    x, j = np.int64(vi), -1
+    for k in range(1, out.size):
+        x, j = _next(x, j, graph, p, q, tables)
+        out[k] = x
+
+
+@numba.njit(parallel=True)
+def fill_random_walk_pairs(graph, out, walk_length, p, q, tables=None):
+    """ Fill rows of `out` with pairs of nodes at two random (distinct) steps
+        of node2vec walks started from random nodes
+        (see ``grl.graph.sample.fill_random_walk_pairs``).
+    """
+    n = core.vcount(graph)
+    for i in numba.prange(out.shape[0]):
+        a, b = sample._walk_steps(walk_length)
+        x, j = np.int64(np.random.randint(n) + 1), -1  # @indexing
+        for k in range(max(a, b) + 1):
+            if k == a:
+                out[i, 0] = x
+            if k == b:
+                out[i, 1] = x
+            x, j = _next(x, j, graph, p, q, tables)
+
+
+@numba.njit()
+def random_walk(vi, graph, length, p, q, tables=None):
+    """ node2vec walk of the given length starting from vi.
+
+        Parameters
+        ----------
+        vi : int
+        graph : tuple
+        length : int
+            Number of steps.
+        p : float
+            Return parameter.
+        q : float
+            In-out parameter.
+        tables : tuple, optional
+            Alias tables of the transitions (see `get`), built for the same p
+            and q. Steps are drawn with rejection sampling if not given.
+
+        Returns
+        -------
+        1darray
+            Nodes of the walk (length+1 of them, including vi), padded with 0
+            if the walk reaches a node without neighbours.
+    """
+    res = np.empty(length+1, dtype=graph[1].dtype)
+    _walk(vi, graph, res, p, q, tables)
+    return res
+
+
+@numba.njit(parallel=True)
+def random_walks(graph, seeds, length, p, q, tables=None, out=None):
+    """ Generate node2vec walks in parallel, one from every seed node
+        (see `random_walk` and ``grl.graph.sample.random_walks``).
+
+        Returns
+        -------
+        2darray
+            Walks of shape (seeds.size, length+1), one per row.
+    """
+    if out is None:
+        out = np.empty((seeds.size, length+1), dtype=graph[1].dtype)
+    for i in numba.prange(seeds.size):
+        _walk(seeds[i], graph, out[i], p, q, tables)
+    return out
+
+
+@numba.njit(cache=False)
+@sample.batch_sampler(fill_random_walk_pairs, sample.fill_random_pairs)
+def get_random_walk_sample():
+    """ Draw a graph sample where positive node pairs are taken from node2vec
+        walks, and negative pairs are drawn at random (uniform noise contrast).
+
+        Parameters
+        ----------
+        graph : tuple
+            A grl graph.
+        n : int
+            Sample size.
+        pargs : tuple
+            Positional arguments to the random walk sampler:
+                (walk_length, p, q)
+            or, to draw steps from alias tables (see `get`):
+                (walk_length, p, q, tables)
+        nargs : tuple, optional
+            Positional arguments to the contrastive sampler:
+                (vcount2, noise)
+
+        Returns
+        -------
+        result : (2darray, 1darray)
+    """
+    pass
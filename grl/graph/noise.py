@@ -0,0 +1,72 @@
+""" Noise distributions of the contrastive samplers.
+
+Negative examples pair a uniformly random source node with a destination node
+drawn from the noise distribution, which is one of:
+    - uniform over nodes (default of all samplers, no table needed),
+    - unigram: proportional to degree**alpha (word2vec uses alpha=0.75),
+      with the degree of the destination nodes, i.e. the number of edges
+      pointing at them (for bimodal graphs: nodes of the second modality),
+    - custom: proportional to the given weights.
+Non-uniform noise is passed to the samplers as an alias table (prob, alias)
+over the destination nodes (see ``grl.numby.alias_table``), which takes O(1)
+per draw. Tables are built once per graph and cached (see `get`); for graphs
+registered in shmem the cache is shared with the forked workers.
+"""
+import numba
+import numpy as np
+
+from grl import numby
+from . import cache
+
+
+@numba.njit(cache=True)
+def draw(n, table=None):
+    """ Draw a node from the noise distribution, or uniformly among n nodes
+        if the table is None (@indexing).
+    """
+    if table is None:
+        return np.random.randint(n) + 1  # @indexing
+    return numby.alias_draw(table[0], table[1]) + 1  # @indexing
+
+
+def get(graph, noise=.75, vcount2=0):
+    """ Get alias table of a noise distribution for the graph.
+        Unigram tables are cached for the graph (see ``grl.graph.cache``).
+
+        Parameters
+        ----------
+        graph : tuple
+        noise : str, float or 1darray, optional
+            'uniform' (or None), exponent alpha of the unigram distribution
+            (degree**alpha), or weights of the destination nodes (without the
+            0-th entry, @indexing). Defaults to 0.75.
+        vcount2 : int, optional
+            Number of nodes of the second modality of a bimodal graph,
+            0 (default) for unimodal graphs.
+
+        Returns
+        -------
+        tuple or None
+            (prob, alias), or None for the uniform distribution.
+    """
+    if noise is None or (type(noise) is str and noise == 'uniform'):
+        return None
+    if type(noise) is str:
+        raise ValueError(f"unknown noise distribution: {noise}")
+    if np.ndim(noise):
+        return numby.alias_table(np.asarray(noise, dtype=np.float64))
+    key = f"noise_{float(noise)}_{vcount2}"
+    res = cache.get(graph, key)
+    if res is None:
+        res = numby.alias_table(unigram(graph, noise, vcount2))
+        cache.set(graph, key, res)
+    return res
+
+
+def unigram(graph, alpha=.75, vcount2=0):
+    """ Get weights of the unigram noise distribution: degree**alpha
+        of the destination nodes (without the 0-th entry, @indexing).
+    """
+    n = vcount2 if vcount2 else graph[0].size - 2
+    deg = np.bincount(graph[1], minlength=n+1)[1:n+1]  # @indexing
+    return deg.astype(np.float64) ** alpha
@@ -17,7 +17,9 @@
 import numba
 import numpy as np
 
+from . import bitset
 from . import core
+from . import noise as _noise
 from . import utils
 from .. import numby
 
@@ -64,6 +66,44 @@ def sampler(f_positives, f_negatives):
     return wrap
 
 
+def batch_sampler(k_positives, k_negatives):
+    """ Define graph sampler from batch kernels (see e.g. `fill_random_edges`), 
+        which fill rows of a preallocated buffer in parallel, so that no arrays 
+        are allocated per example. The sampler has the same signature as 
+        the ones defined with `sampler`. 
+        
+        Parameters
+        ----------
+        k_positives : function(graph, out, *pargs)
+            A function taking graph, 2darray of shape (k, 2) and optional arguments, 
+            and filling the array with random examples of edges. 
+        k_negatives : function(graph, out, *nargs)
+            A function taking graph, 2darray of shape (k, 2) and optional arguments, 
+            and filling the array with random examples of non-edges. 
+        
+        Returns
+        -------
+        function
+    """
+    def wrap(f):
+        def get_sample(graph, n, pargs=(), nargs=()):
+
+            n //= 2
+            X = np.empty((n*2, 2), dtype=graph[1].dtype)
+            Y = np.hstack((np.ones(n), np.zeros(n)))
+
+            k_positives(graph, X[:n], *pargs)
+            k_negatives(graph, X[n:], *nargs)
+
+            shuffle_inplace(X, Y)
+            return X, Y
+        # propagate name & docstring of the wrapped function
+        get_sample.__name__ = f.__name__
+        get_sample.__doc__ = f.__doc__
+        return get_sample
+    return wrap
+
+
 def with_mask(edge_sampler):
     """ Modify edge sampler to return unmasked examples.
         Mask should be the last positional argument to the wrapped function.
@@ -72,11 +112,10 @@ def with_mask(edge_sampler):
         @numba.njit()
         def wrapd(graph, *args):
             fargs, mask = args[:-1], args[-1]
-            edge = edge_sampler(graph, *fargs)
-            if utils.is_edge_masked(edge, graph, mask):
-                return wrapd(graph, *args)
-            else:
-                return edge
+            while True:
+                edge = edge_sampler(graph, *fargs)
+                if not utils.is_edge_masked(edge, graph, mask):
+                    return edge
         # propagate name & docstring of the wrapped function
         wrapd.__name__ = dummy.__name__
         wrapd.__doc__ = dummy.__doc__
@@ -84,34 +123,313 @@ def with_mask(edge_sampler):
     return wrap
 
 
+class BitsetSampler:
+    def __init__(self, get_sample):
+        """ Sampler passing bitset adjacency of the graph (if it fits in memory,
+            see ``grl.graph.bitset.get``) to the contrastive sampler, 
+            i.e. extending its positional arguments to (vcount2, noise, bits). 
+            The bitset is built on the first call for a graph and cached. 
+            Unlike a closure, the sampler can be pickled to worker processes.
+        """
+        self.get_sample = get_sample
+        # propagate name & docstring of the wrapped function
+        self.__name__ = get_sample.__name__
+        self.__doc__ = get_sample.__doc__
+
+    def __call__(self, graph, n, pargs=(), nargs=()):
+        bits = bitset.get(graph)
+        if bits is not None:
+            nargs = (nargs[0] if len(nargs) else 0, nargs[1] if len(nargs) > 1 else None, bits)
+        return self.get_sample(graph, n, pargs, nargs)
+
+
+def with_bitset(get_sample):
+    """ Modify sampler to pass bitset adjacency of the graph to the contrastive 
+        sampler (see `BitsetSampler`). 
+    """
+    return BitsetSampler(get_sample)
+
+
+# Batch kernels (see `batch_sampler`). 
+# Rows are filled in parallel; every thread draws from its own random state, 
+# so samples are not reproducible with ``numpy.random.seed``. 
+
+@numba.njit(cache=False, parallel=True)
+def fill_random_anti_edges(graph, out, vcount2=0, noise=None, bits=None):
+    """ Fill rows of `out` with random nonexistent edges (see `get_random_anti_edge`). """
+    n = core.vcount(graph)
+    m = vcount2 if vcount2 else n
+    for i in numba.prange(out.shape[0]):
+        while True:
+            src = np.random.randint(n) + 1  # @indexing
+            dst = _noise.draw(m, noise)
+            if bits is None:
+                hit = utils.find_edge(src, dst, graph) >= 0
+            else:
+                hit = core._is_neighbor(dst, src, graph, bits)
+            if not hit:
+                out[i, 0] = src
+                out[i, 1] = dst
+                break
+
+
+@numba.njit(cache=False, parallel=True)
+def fill_random_edges(graph, out, src=None):
+    """ Fill rows of `out` with random existing edges, uniformly over the edges 
+        (see `get_random_edges`). 
+    """
+    v, e = graph
+    if not e.size:
+        raise ValueError("graph has no edges")
+    for i in numba.prange(out.shape[0]):
+        p = np.random.randint(e.size)
+        if src is None:
+            out[i, 0] = np.searchsorted(v, np.uint64(p), side='right') - 1
+        else:
+            out[i, 0] = src[p]
+        out[i, 1] = e[p]
+
+
+@numba.njit(cache=False, parallel=True)
+def fill_random_edges_with_mask(graph, out, mask):
+    """ Fill rows of `out` with random existing edges allowed by mask
+        (i.e. if their corresponding mask values are 1). 
+    """
+    v, e = graph
+    for i in numba.prange(out.shape[0]):
+        p = np.random.randint(e.size)
+        while mask[p] != 1:
+            p = np.random.randint(e.size)
+        out[i, 0] = np.searchsorted(v, np.uint64(p), side='right') - 1
+        out[i, 1] = e[p]
+
+
+@numba.njit(cache=False, parallel=True)
+def fill_random_pairs(graph, out, vcount2=0, noise=None):
+    """ Fill rows of `out` with random pairs of nodes (see `get_random_pair`). """
+    n = core.vcount(graph)
+    m = vcount2 if vcount2 else n
+    for i in numba.prange(out.shape[0]):
+        out[i, 0] = np.random.randint(n) + 1  # @indexing
+        out[i, 1] = _noise.draw(m, noise)
+
+
+@numba.njit(cache=False, parallel=True)
+def fill_random_walk_pairs(graph, out, walk_length, mask=None):
+    """ Fill rows of `out` with pairs of nodes at two random (distinct) steps 
+        of uniform random walks of the given length, started from random nodes. 
+        Pairs are redrawn if the walk gets stuck at a node without neighbours 
+        before reaching both steps. 
+        If mask is given, walks move along the edges allowed by it. 
+    """
+    if walk_length < 1:
+        raise ValueError("walk length should be positive")
+    if mask is None:
+        if not graph[1].size:
+            raise ValueError("graph has no edges")
+    elif not _any_allowed(mask):
+        raise ValueError("mask allows no edges")
+    n = core.vcount(graph)
+    for i in numba.prange(out.shape[0]):
+        x = 0
+        while not x:
+            a, b = _walk_steps(walk_length)
+            x = np.random.randint(n) + 1  # @indexing
+            for k in range(max(a, b) + 1):
+                if k == a:
+                    out[i, 0] = x
+                if k == b:
+                    out[i, 1] = x
+                if k == max(a, b):
+                    break
+                x = _step(x, graph, mask)
+                if not x:
+                    break
+
+
+@numba.njit(cache=False)
+def fill_random_walk_pairs_with_mask(graph, out, walk_length, mask):
+    """ Fill rows of `out` with pairs of nodes from random walks along the edges 
+        allowed by mask (see `fill_random_walk_pairs`). 
+    """
+    fill_random_walk_pairs(graph, out, walk_length, mask)
+
+
+@numba.njit(cache=False)
+def _any_allowed(mask):
+    """ Tell if mask allows any edge (stops at the first one). """
+    for j in range(mask.size):
+        if mask[j] == 1:
+            return True
+    return False
+
+
+@numba.njit(cache=False)
+def _step(x, graph, mask=None):
+    """ Move from node x to its random neighbour (allowed by mask, if given), 
+        or to 0 if there is none. 
+    """
+    v, e = graph
+    lo, hi = np.int64(v[x]), np.int64(v[x+1])
+    if mask is None:
+        return np.int64(e[lo + np.random.randint(hi-lo)]) if hi > lo else 0
+    d = 0
+    for j in range(lo, hi):
+        d += mask[j] == 1
+    if not d:
+        return 0
+    r = np.random.randint(d)
+    for j in range(lo, hi):
+        if mask[j] == 1:
+            if not r:
+                return np.int64(e[j])
+            r -= 1
+    return 0
+
+
+@numba.njit(cache=False, parallel=True)
+def fill_window_pairs(graph, out, walk_length, window, keep=None):
+    """ Fill rows of `out` with skip-gram pairs of uniform random walks started 
+        from random nodes: every (center, context) pair of nodes at most `window` 
+        steps apart in a walk, so that a walk yields up to 
+        ``2*window*walk_length`` pairs (instead of one, see `fill_random_walk_pairs`). 
+        Rows are filled in parallel blocks, with pairs of consecutive walks. 
+
+        If `keep` is given (see `subsampling`), nodes are dropped from walks 
+        with probability ``1-keep[node]`` before the pairs are taken. 
+    """
+    n = core.vcount(graph)
+    w = min(window, walk_length)
+    size = max(w*(2*walk_length + 1 - w), 1)  # pairs of a full walk
+    for b in numba.prange(-(-out.shape[0] // size)):
+        walk = np.empty(walk_length+1, dtype=np.int64)
+        i, end = b*size, min((b+1)*size, out.shape[0])
+        while i < end:
+            _walk(np.random.randint(n) + 1, graph, walk)  # @indexing
+            # drop dead-end padding and subsampled nodes
+            m = 0
+            for k in range(walk.size):
+                if walk[k] and (keep is None or np.random.random() < keep[walk[k]]):
+                    walk[m] = walk[k]
+                    m += 1
+            for c in range(m):
+                for k in range(max(0, c-window), min(m, c+window+1)):
+                    if k != c and i < end:
+                        out[i, 0] = walk[c]
+                        out[i, 1] = walk[k]
+                        i += 1
+
+
+@numba.njit(cache=False)
+def _walk_steps(walk_length):
+    """ Draw two distinct steps of a walk (of walk_length+1 nodes), in random order. """
+    a = np.random.randint(walk_length+1)
+    b = np.random.randint(walk_length)
+    return a, b + (b >= a)
+
+
+@numba.njit(cache=False)
+def subsampling(graph, t=1e-3):
+    """ Get probabilities of keeping nodes in walks (see `fill_window_pairs`) 
+        with word2vec subsampling of frequent nodes: ``sqrt(t/f) + t/f``, 
+        where f is the frequency of the node in walks, i.e. degree/ecount. 
+
+        Returns
+        -------
+        1darray[float64]
+            Probabilities indexed by nodes (@indexing). 
+    """
+    f = core.degree(graph) / max(core.ecount(graph), 1)
+    res = np.ones(core.vcount(graph)+1, dtype=np.float64)  # @indexing
+    for i in range(f.size):
+        if f[i] > 0:
+            res[i+1] = min(1., np.sqrt(t/f[i]) + t/f[i])
+    return res
+
+
+@numba.njit(cache=False)
+def shuffle_inplace(X, Y):
+    """ Shuffle rows of X and Y in place, in unison (Fisher-Yates). """
+    for i in range(Y.size-1, 0, -1):
+        j = np.random.randint(i+1)
+        X[i, 0], X[j, 0] = X[j, 0], X[i, 0]
+        X[i, 1], X[j, 1] = X[j, 1], X[i, 1]
+        Y[i], Y[j] = Y[j], Y[i]
+
+
 @numba.njit()  
-def get_random_anti_edge(graph, vcount2=0):
-    """ Sample a random nonexistent edge. """
-    if not vcount2:
-        vs = np.random.choice(core.vcount(graph), 16) + 1  # @indexing
-        src, dst = vs[0], vs[1:]
-        nbs = core.neighbors(src, graph)
-        for v in dst:
-            if not numby.isin_1d(v, nbs):
-                return np.array([src, v], dtype=graph[1].dtype)
-    else:
-        src = np.random.choice(core.vcount(graph)) + 1  # @indexing
-        dst = np.random.choice(vcount2, 16) + 1  # @indexing
-        nbs = core.neighbors(src, graph)
-        for v in dst:
-            if not numby.isin_1d(v, nbs):
-                return np.array([src, v], dtype=graph[1].dtype)
-    return get_random_anti_edge(graph, vcount2)
+def get_random_anti_edge(graph, vcount2=0, noise=None, bits=None):
+    """ Sample a random nonexistent edge, with the destination node drawn from 
+        the noise distribution (see ``grl.graph.noise``), uniform if not given. 
+        If bitset adjacency of the graph is given, it is used for membership tests,
+        otherwise all candidates are tested at once with a galloping search 
+        over the (sorted) neighbour list. 
+    """
+    n = core.vcount(graph)
+    m = vcount2 if vcount2 else n
+    dst = np.empty(16, dtype=np.int64)
+    while True:
+        src = np.random.randint(n) + 1  # @indexing
+        for i in range(dst.size):
+            dst[i] = _noise.draw(m, noise)
+        if bits is None:
+            hit = numby.gallop_isin_1d(dst, core.neighbors(src, graph))
+            for i in range(dst.size):
+                if not hit[i]:
+                    return np.array([src, dst[i]], dtype=graph[1].dtype)
+        else:
+            for v in dst:
+                if not core._is_neighbor(v, src, graph, bits):
+                    return np.array([src, v], dtype=graph[1].dtype)
+
+
+@numba.njit(cache=False, parallel=True)
+def get_edge_sources(graph):
+    """ Get source node of every edge, i.e. an array aligned with the edges array
+        (to be passed to `get_random_edges`).
+    """
+    v, e = graph
+    res = np.empty(e.size, dtype=e.dtype)
+    for i in numba.prange(1, v.size-1):
+        res[np.int64(v[i]):np.int64(v[i+1])] = i
+    return res
 
 
 @numba.njit(cache=False)
 def get_random_edge(graph):
-    """ Sample a random existing edge. """
-    src = np.random.choice(core.vcount(graph)) + 1  # @indexing
-    dst = np.random.choice(core.neighbors(src, graph))
-    if not dst:
-        return get_random_edge(graph)
-    return np.array([src, dst], dtype=graph[1].dtype)
+    """ Sample a random existing edge, uniformly over the edges: a random position
+        in the edges array, with its source node found by binary search over `nodes`.
+    """
+    v, e = graph
+    if not e.size:
+        raise ValueError("graph has no edges")
+    p = np.random.randint(e.size)
+    src = np.searchsorted(v, np.uint64(p), side='right') - 1
+    return np.array([src, e[p]], dtype=e.dtype)
+
+
+@numba.njit(cache=False)
+def get_random_edges(graph, n, src=None):
+    """ Sample n random existing edges (with replacement), uniformly over the edges
+        (see `get_random_edge`).
+
+        Parameters
+        ----------
+        graph : tuple
+        n : int
+            Sample size.
+        src : 1darray, optional
+            Source nodes of the edges (see `get_edge_sources`). If given, they
+            are looked up instead of binary searched for.
+
+        Returns
+        -------
+        2darray
+            Edge list of shape (n, 2).
+    """
+    res = np.empty((n, 2), dtype=graph[1].dtype)
+    fill_random_edges(graph, res, src)
+    return res
 
 
 @with_mask(get_random_edge)
@@ -136,7 +454,7 @@ def _alt_get_random_edge_with_mask(graph, mask):
 
 
 @numba.njit(cache=False)
-def get_random_pair(graph, vcount2=0):
+def get_random_pair(graph, vcount2=0, noise=None):
     """ Sample a random pair of nodes. 
         
         Parameters
@@ -146,24 +464,23 @@ def get_random_pair(graph, vcount2=0):
         vcount2 : int, optional
             Number of nodes of the second (non-indexed) modality in the graph. 
             For unimodal graphs this value should be 0 (default).
+        noise : tuple, optional
+            Alias table of the noise distribution of the second node 
+            (see ``grl.graph.noise.get``). Defaults to uniform. 
 
         Returns
         -------
         1darray[2]
     """
-    if not vcount2:
-        res = np.random.randint(0, core.vcount(graph), 2) + 1  # @indexing
-        return res.astype(graph[1].dtype.type)
-    else:
-        src = np.random.choice(core.vcount(graph)) + 1  # @indexing
-        dst = np.random.choice(vcount2) + 1  # @indexing
-        return np.array([src, dst], dtype=graph[1].dtype)
+    src = np.random.randint(core.vcount(graph)) + 1  # @indexing
+    dst = _noise.draw(vcount2 if vcount2 else core.vcount(graph), noise)
+    return np.array([src, dst], dtype=graph[1].dtype)
     
 
 @numba.njit(cache=False)
 def get_random_walk_pair(graph, walk_length):
     v = np.random.choice(core.vcount(graph)) + 1  # @indexing
-    w = random_walk(v, graph, walk_length).copy()
+    w = random_walk(v, graph, walk_length)
     np.random.shuffle(w)
     return w[:2]
 
@@ -171,13 +488,13 @@ def get_random_walk_pair(graph, walk_length):
 @numba.njit(cache=False)
 def get_random_walk_pair_with_mask(graph, walk_length, mask):
     v = np.random.choice(core.vcount(graph)) + 1  # @indexing
-    w = random_walk_with_mask(v, graph, walk_length, mask).copy()
+    w = random_walk_with_mask(v, graph, walk_length, mask)
     np.random.shuffle(w)
     return w[:2]
 
 
 @numba.njit(cache=False)
-@sampler(get_random_edge, get_random_pair)
+@batch_sampler(fill_random_edges, fill_random_pairs)
 def get_nce_sample():
     """ Sample edges with balanced noise contrast.
         
@@ -189,13 +506,16 @@ def get_nce_sample():
             Sample size. 
         nargs : tuple, optional
             Positional arguments to the contrastive sampler:
-                (vcount2,)
+                (vcount2, noise)
             Defaults to:
-                (0,)
+                (0, None)
             Details:
                 vcount2 : int
                     Number of nodes in the second (non-indexed) modality in the graph. 
                     For unimodal graphs this value should be 0 (default).
+                noise : tuple
+                    Alias table of the noise distribution (see ``grl.graph.noise.get``). 
+                    Uniform if None (default).
 
         Returns
         -------
@@ -206,7 +526,7 @@ def get_nce_sample():
 
 
 @numba.njit(cache=False)
-@sampler(get_random_edge_with_mask, get_random_pair)
+@batch_sampler(fill_random_edges_with_mask, fill_random_pairs)
 def get_nce_sample_with_mask():
     """ Draw a graph sample where positive node pairs are 
         neighbors (k=1) allowed by the given mask, and negative pairs 
@@ -224,13 +544,16 @@ def get_nce_sample_with_mask():
                 (mask,)
         nargs : tuple, optional
             Positional arguments to the contrastive sampler:
-                (vcount2,)
+                (vcount2, noise)
             Defaults to:
-                (0,)
+                (0, None)
             Details:
                 vcount2 : int
                     Number of nodes in the second (non-indexed) modality in the graph. 
                     For unimodal graphs this value should be 0 (default).
+                noise : tuple
+                    Alias table of the noise distribution (see ``grl.graph.noise.get``). 
+                    Uniform if None (default).
                 
         Returns
         -------
@@ -243,8 +566,9 @@ def get_nce_sample_with_mask():
     pass
 
 
+@with_bitset
 @numba.njit(cache=False)
-@sampler(get_random_edge, get_random_anti_edge)
+@batch_sampler(fill_random_edges, fill_random_anti_edges)
 def get_neg_sample():
     """ Sample edges with balanced negative contrast.
         
@@ -256,13 +580,16 @@ def get_neg_sample():
             Sample size. 
         nargs : tuple, optional
             Positional arguments to the contrastive sampler:
-                (vcount2,)
+                (vcount2, noise)
             Defaults to:
-                (0,)
+                (0, None)
             Details:
                 vcount2 : int
                     Number of nodes in the second (non-indexed) modality in the graph. 
                     For unimodal graphs this value should be 0 (default).
+                noise : tuple
+                    Alias table of the noise distribution (see ``grl.graph.noise.get``). 
+                    Uniform if None (default).
 
         Returns
         -------
@@ -272,8 +599,9 @@ def get_neg_sample():
     pass
 
 
+@with_bitset
 @numba.njit(cache=False)
-@sampler(get_random_edge_with_mask, get_random_anti_edge)
+@batch_sampler(fill_random_edges_with_mask, fill_random_anti_edges)
 def get_neg_sample_with_mask():
     """ Draw a graph sample where positive node pairs are 
         neighbors (k=1) allowed by the given mask, and negative pairs 
@@ -291,13 +619,16 @@ def get_neg_sample_with_mask():
                 (mask,)
         nargs : tuple, optional
             Positional arguments to the contrastive sampler:
-                (vcount2,)
+                (vcount2, noise)
             Defaults to:
-                (0,)
+                (0, None)
             Details:
                 vcount2 : int
                     Number of nodes in the second (non-indexed) modality in the graph. 
                     For unimodal graphs this value should be 0 (default).
+                noise : tuple
+                    Alias table of the noise distribution (see ``grl.graph.noise.get``). 
+                    Uniform if None (default).
                 
         Returns
         -------
@@ -311,7 +642,7 @@ def get_neg_sample_with_mask():
 
 
 @numba.njit(cache=False)
-@sampler(get_random_walk_pair, get_random_pair)
+@batch_sampler(fill_random_walk_pairs, fill_random_pairs)
 def get_random_walk_sample():
     """ Draw a graph sample where positive node pairs are taken
         from random walks of given length, and negative pairs are 
@@ -329,9 +660,9 @@ def get_random_walk_sample():
                 (walk_length,)
         nargs : tuple, optional
             Positional arguments to the contrastive sampler:
-                (vcount2,)
+                (vcount2, noise)
             Defaults to:
-                (0,)
+                (0, None)
                 
         Returns
         -------
@@ -345,7 +676,7 @@ def get_random_walk_sample():
 
 
 @numba.njit(cache=False)
-@sampler(get_random_walk_pair_with_mask, get_random_pair)
+@batch_sampler(fill_random_walk_pairs_with_mask, fill_random_pairs)
 def get_random_walk_sample_with_mask():
     """ Draw a graph sample where positive node pairs are taken
         from random walks of given length, and negative pairs are 
@@ -363,9 +694,9 @@ def get_random_walk_sample_with_mask():
                 (walk_length, mask,)
         nargs : tuple, optional
             Positional arguments to the contrastive sampler:
-                (vcount2,)
+                (vcount2, noise)
             Defaults to:
-                (0,)
+                (0, None)
                 
         Returns
         -------
@@ -379,35 +710,136 @@ def get_random_walk_sample_with_mask():
 
 
 @numba.njit(cache=False)
-def _random_uniform_walk(vi, graph, length, data=None, step=0):
-    if data is None:
-        data = np.zeros(length+1, dtype=graph[1].dtype.type)  # +1 for the first node
-        data[0] = vi
-    if length == 0:
-        return data
-    data[step+1] = np.random.choice(core.neighbors(vi, graph))
-    return _random_uniform_walk(data[step], graph, length-1, data, step+1)
+def _walk(vi, graph, out, mask=None):
+    """ Fill `out` with a random walk starting from vi (padded with 0 at a dead end). """
+    out[0] = vi
+    x = np.int64(vi)
+    for k in range(1, out.size):
+        if x:
+            x = _step(x, graph, mask)
+        out[k] = x
 
 
 @numba.njit(cache=False)
 def random_walk(vi, graph, length):
-    return _random_uniform_walk(vi, graph, length)
+    """ Uniform random walk of the given length starting from vi.
+
+        Returns
+        -------
+        1darray
+            Nodes of the walk (length+1 of them, including vi), padded with 0 
+            if the walk reaches a node without neighbours. 
+    """
+    res = np.zeros(length+1, dtype=graph[1].dtype)
+    _walk(vi, graph, res)
+    return res
 
 
 @numba.njit(cache=False)
-def _random_uniform_walk_with_mask(vi, graph, length, mask, data=None, step=0):
-    if data is None:
-        data = np.zeros(length+1, dtype=graph[1].dtype.type)  # +1 for the first node
-        data[0] = vi
-    if length == 0:
-        return data
-    data[step+1] = np.random.choice(core.neighbors_with_mask(vi, graph, mask))
-    return _random_uniform_walk_with_mask(data[step], graph, length-1, mask, data, step+1)
+def random_walk_with_mask(vi, graph, length, mask):
+    """ Uniform random walk along the edges allowed by mask (see `random_walk`). """
+    res = np.zeros(length+1, dtype=graph[1].dtype)
+    _walk(vi, graph, res, mask)
+    return res
+
+
+@numba.njit(cache=False, parallel=True)
+def random_walks(graph, seeds, length, mask=None, out=None):
+    """ Generate uniform random walks in parallel, one from every seed node. 
+
+        Parameters
+        ----------
+        graph : tuple
+        seeds : 1darray[int]
+            Start nodes of the walks. 
+        length : int
+            Number of steps of every walk. 
+        mask : 1darray, optional
+            If given, walks move along the edges allowed by the mask only. 
+        out : 2darray, optional
+            Output array of shape (seeds.size, length+1). 
+
+        Returns
+        -------
+        2darray
+            Walks, one per row, padded with 0 after dead ends (and isolates). 
+    """
+    if out is None:
+        out = np.empty((seeds.size, length+1), dtype=graph[1].dtype)
+    for i in numba.prange(seeds.size):
+        _walk(seeds[i], graph, out[i], mask)
+    return out
+
+
+def random_walk_corpus(graph, length, walks_per_node=1, mask=None, path=None, 
+                       chunk_size=2**20, seed=None):
+    """ Generate a corpus of random walks (e.g. for DeepWalk), 
+        `walks_per_node` walks from every node, in random order. 
+
+        Parameters
+        ----------
+        graph : tuple
+        length : int
+            Number of steps of every walk. 
+        walks_per_node : int, optional
+            Defaults to 1. 
+        mask : 1darray, optional
+            If given, walks move along the edges allowed by the mask only. 
+        path : str, optional
+            If given, walks are streamed to a .npy file at this path, 
+            `chunk_size` walks at a time, and returned memory-mapped from it. 
+        chunk_size : int, optional
+            Number of walks written to the file at once. 
+        seed : int, optional
+            Seed of the order of the start nodes. 
+
+        Returns
+        -------
+        2darray
+            Walks of shape (vcount*walks_per_node, length+1), see `random_walks`. 
+    """
+    seeds = np.tile(np.arange(1, core.vcount(graph)+1), walks_per_node)  # @indexing
+    np.random.default_rng(seed).shuffle(seeds)
+    if path is None:
+        return random_walks(graph, seeds, length, mask)
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=graph[1].dtype, 
+                                    shape=(seeds.size, length+1))
+    for a in range(0, seeds.size, chunk_size):
+        random_walks(graph, seeds[a:a+chunk_size], length, mask, np.asarray(out[a:a+chunk_size]))
+        out.flush()
+    return np.load(path, mmap_mode='r')
 
 
 @numba.njit(cache=False)
-def random_walk_with_mask(vi, graph, length, mask):
-    return _random_uniform_walk_with_mask(vi, graph, length, mask)
+@batch_sampler(fill_window_pairs, fill_random_pairs)
+def get_window_sample():
+    """ Draw a graph sample where positive node pairs are skip-gram pairs 
+        of random walks, i.e. nodes within a window in the walks, and negative 
+        pairs are drawn at random (i.e. this sampler uses a uniform noise 
+        contrast). 
+        
+        Parameters
+        ----------
+        graph : tuple
+            A grl graph.
+        n : int
+            Sample size.
+        pargs : tuple
+            Positional arguments to the window pairs sampler:
+                (walk_length, window)
+            or, with subsampling of frequent nodes (see `subsampling`): 
+                (walk_length, window, keep)
+        nargs : tuple, optional
+            Positional arguments to the contrastive sampler:
+                (vcount2, noise)
+            Defaults to:
+                (0, None)
+                
+        Returns
+        -------
+        result : (2darray, 1darray)
+    """
+    pass
 
 
 # Alias
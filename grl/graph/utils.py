@@ -1,15 +1,49 @@
 import hashlib
 import pickle
+import struct
+from concurrent.futures import ThreadPoolExecutor
 
 import igraph
 import numba
 import numpy as np
+import scipy.sparse
 
+from grl import config
+from . import cache
 from . import core
 
+HASH_BLOCK = 2**20
+
+
+def as_sorted(graph):
+    """ Get the graph with sorted neighbour lists: the graph itself if its lists 
+        are already sorted, or a sorted copy otherwise. 
+        The result is flagged as sorted, so that subsequent calls take constant time. 
+
+        Parameters
+        ----------
+        graph : tuple
+
+        Returns
+        -------
+        tuple
+            grl graph
+    """
+    if not cache.get(graph, 'sorted', False):
+        if not is_sorted(graph):
+            graph = sort_neighbors(graph)
+        cache.set(graph, 'sorted', True)
+    return graph
+
 
 def digest(graph):
-    """ Get SHA256 digest of a deterministic graph sample.
+    """ Get SHA256 tree hash of the graph content.
+
+        Arrays of the graph are split into blocks of HASH_BLOCK bytes, which are 
+        hashed in parallel threads; the digest is the hash of dtypes and sizes 
+        of the arrays, followed by hashes of their blocks. 
+        Digests are cached (see ``grl.graph.cache``), so graphs are assumed 
+        not to be modified in place once hashed. 
 
         Parameters
         ----------
@@ -19,17 +53,22 @@ def digest(graph):
         -------
         bytes
     """
-    nodes, edges = graph
-    # make seed from hash
-    n = nodes[:1024].tobytes()
-    e = edges[:1024].tobytes()
-    seed = hashlib.sha256(n+e).digest()
-    # sample nodes and edges with seed
-    np.random.seed(np.frombuffer(seed[:4], dtype=np.uint32))
-    n = np.random.choice(nodes, 1024).tobytes()
-    e = np.random.choice(edges, 1024).tobytes()
-    # hash the sample
-    return hashlib.sha256(n+e).digest()
+    res = cache.get(graph, 'digest')
+    if res is None:
+        root = hashlib.sha256(b'grl')
+        views = []
+        for x in graph:
+            x = np.ascontiguousarray(x)
+            root.update(x.dtype.str.encode() + struct.pack('<Q', x.size))
+            views.append(memoryview(x.reshape(-1).view(np.uint8)))
+        blocks = [v[i:i+HASH_BLOCK] for v in views for i in range(0, len(v), HASH_BLOCK)]
+        # hashlib releases the GIL for large buffers
+        with ThreadPoolExecutor(config.CORES) as pool:
+            for h in pool.map(lambda b: hashlib.sha256(b).digest(), blocks):
+                root.update(h)
+        res = root.digest()
+        cache.set(graph, 'digest', res)
+    return res
 
 
 @numba.njit(cache=True)
@@ -51,6 +90,30 @@ def enumerate_nodes(graph):
     return (np.arange(core.vcount(graph))+1).astype(graph[1].dtype)
 
 
+@numba.njit(cache=True, parallel=True)
+def enumerate_upper_edges(graph):
+    """ Enumerate edges (src, dst) such that src < dst, 
+        i.e. every edge of a symmetric graph once. 
+    """
+    v, e = graph
+    n = core.vcount(graph)
+    cnt = np.zeros(n+1, dtype=np.int64)
+    for i in numba.prange(1, n+1):
+        for j in range(v[i], v[i+1]):
+            if e[j] > i:
+                cnt[i] += 1
+    offset = np.cumsum(cnt)
+    res = np.empty((offset[-1], 2), dtype=e.dtype)
+    for i in numba.prange(1, n+1):
+        k = offset[i-1]
+        for j in range(v[i], v[i+1]):
+            if e[j] > i:
+                res[k, 0] = i
+                res[k, 1] = e[j]
+                k += 1
+    return res
+
+
 @numba.njit(cache=True)
 def enumerate_without(graph, subset):
     """ Enumerate nodes and remove given subset from the enumeration. 
@@ -77,87 +140,265 @@ def from_adjacency(A):
     return nodes, edges
 
 
-def from_edgelist(el):
-    """ Make edgelist symmetric and convert to grl graph representation.
+@numba.njit(cache=True)
+def _count_degrees(src, dst, cnt, symmetric, loops=False):
+    """ Add degrees of the source (and if symmetric, destination) nodes 
+        of the edges to `cnt`, at `i+1` for `i`-th node (see `from_arrays`). 
     """
-    el = np.unique(np.vstack((el, el[:, ::-1])), axis=0)
+    for i in range(src.size):
+        if loops or src[i] != dst[i]:
+            cnt[src[i]+1] += 1
+            if symmetric:
+                cnt[dst[i]+1] += 1
 
-    # make graph
 
-    edges = np.empty(el.shape[0], dtype=np.uint32)
-    nodes = np.zeros(el.max()+2, dtype=np.uint64)
+@numba.njit(cache=True)
+def _scatter_edges(src, dst, edges, cursor, symmetric, loops=False):
+    """ Place the edges at the cursors of their source nodes, 
+        advancing the cursors (see `from_arrays`). 
+    """
+    for i in range(src.size):
+        if loops or src[i] != dst[i]:
+            edges[cursor[src[i]]] = dst[i]
+            cursor[src[i]] += 1
+            if symmetric:
+                edges[cursor[dst[i]]] = src[i]
+                cursor[dst[i]] += 1
 
-    cnt = 0
-    for i in range(el.max()):
-        nbs = el[el[:, 0] == i+1, 1]
-        edges[cnt:cnt+nbs.size] = nbs.astype(np.uint32)
-        cnt += nbs.size
-        nodes[i+2] = cnt
-    
-    return (nodes, edges)
+
+@numba.njit(cache=True, parallel=True)
+def _sort_unique(offset, edges):
+    """ Sort neighbour lists (spanning offset[i]:offset[i+1]) in place and drop 
+        duplicates, return the resulting neighbour list sizes (at `i+1` for `i`-th node).
+    """
+    cnt = np.zeros(offset.size, dtype=np.int64)
+    for i in numba.prange(1, offset.size-1):
+        a, b = offset[i], offset[i+1]
+        if b - a > 1:
+            edges[a:b] = np.sort(edges[a:b])
+            k = a + 1
+            for j in range(a+1, b):
+                if edges[j] != edges[k-1]:
+                    edges[k] = edges[j]
+                    k += 1
+            cnt[i+1] = k - a
+        else:
+            cnt[i+1] = b - a
+    return cnt
+
+
+@numba.njit(cache=True, parallel=True)
+def from_arrays(src, dst, vcount, symmetric=True, loops=False):
+    """ Convert arrays of source and destination nodes to grl graph representation.
+
+        Self-loops (unless `loops` is set) and duplicated edges are dropped, 
+        and neighbour lists of the resulting graph are sorted. 
+
+        Parameters
+        ----------
+        src : 1darray[int]
+            Source nodes (1-indexed). 
+        dst : 1darray[int]
+            Destination nodes (1-indexed). 
+        vcount : int
+            Number of nodes in the graph; must not be lower than the largest
+            node index in `src` and `dst`. 
+        symmetric : bool, optional
+            If set, every edge is added in both directions. Defaults to True.
+        loops : bool, optional
+            If set, edges with src == dst are kept, e.g. when source and 
+            destination nodes are indexed separately (see ``grl.graph.bipartite``). 
+            Defaults to False.
+
+        Returns
+        -------
+        tuple
+            grl graph
+    """
+    # count degrees
+    # (nodes[i+1] holds the degree of i-th node, so that after the prefix sum 
+    # nodes[i] and nodes[i+1] mark the beginning and the end of its neighbour list)
+    cnt = np.zeros(vcount+2, dtype=np.int64)
+    _count_degrees(src, dst, cnt, symmetric, loops)
+    offset = np.cumsum(cnt)
+
+    # scatter edges
+    edges = np.empty(offset[-1], dtype=np.uint32)
+    cursor = offset[:-1].copy()
+    _scatter_edges(src, dst, edges, cursor, symmetric, loops)
+
+    # sort and deduplicate neighbour lists
+    cnt = _sort_unique(offset, edges)
+    nodes = np.cumsum(cnt)
+    if nodes[-1] == edges.size:
+        return nodes.astype(np.uint64), edges
+
+    # compact
+    res = np.empty(nodes[-1], dtype=np.uint32)
+    for i in numba.prange(1, vcount+1):
+        res[nodes[i]:nodes[i+1]] = edges[offset[i]:offset[i]+nodes[i+1]-nodes[i]]
+    return nodes.astype(np.uint64), res
+
+
+def from_edgelist(el, vcount=None, symmetric=True):
+    """ Convert edge list to grl graph representation, symmetric by default.
+
+        Parameters
+        ----------
+        el : 2darray[int]
+            Edge list of shape (m, 2), with nodes indexed from 1. 
+        vcount : int, optional
+            Number of nodes in the graph. Defaults to the largest node index in `el`.
+        symmetric : bool, optional
+            If set (default), every edge is added in both directions, 
+            otherwise the graph is directed (see ``grl.graph.directed``).
+
+        Returns
+        -------
+        tuple
+            grl graph
+
+        Notes
+        -----
+        Self-loops and duplicated edges are dropped. 
+    """
+    el = np.asarray(el, dtype=np.int64)
+    if el.size and el.min() < 1:
+        raise ValueError("nodes in the edge list should be 1-indexed")
+    if vcount is None:
+        vcount = int(el.max()) if el.size else 0
+    elif el.size and el.max() > vcount:
+        raise ValueError("edge list refers to nodes outside of the graph")
+    return from_arrays(el[:, 0], el[:, 1], vcount, symmetric)
 
 
 def from_igraph(g):
     """ Convert igraph.Graph to grl graph representation.
-        Note: currently it assumes that graph is symmetric. 
-    """
-    nodes = np.zeros((g.vcount()+2,), dtype=np.uint64)
-    edges = np.zeros((g.ecount()*2,), dtype=np.uint32)
-    offset = 0
-    for v in g.vs:
-        i = v.index
-        vnb = np.array(g.neighbors(v), dtype=np.uint32) + 1  # @indexing 
-        degree = vnb.shape[0]
-        nodes[i+1] = offset  # @indexing 
-        edges[offset:offset+degree] = vnb
-        offset += degree
-    nodes[-1] = offset
-    return nodes, edges
+        Note: the graph is made symmetric, self-loops and multi-edges are dropped. 
+    """
+    el = np.array(g.get_edgelist(), dtype=np.int64).reshape(-1, 2) + 1  # @indexing
+    return from_arrays(el[:, 0], el[:, 1], g.vcount())
 
 
-def from_ogb(dataset):
+def from_ogb(dataset, split=None, masks=False):
     """ Convert Open Graph Benchmark library-agnostic format to grl.
-        @todo:numba
+
+        Parameters
+        ----------
+        dataset : object
+            OGB dataset, i.e. an object with `graph` dict holding 
+            `edge_index` (2darray of shape (2, m)) and `num_nodes`.
+        split : dict, optional
+            Edge split, as returned by `dataset.get_edge_split()`. If given, 
+            positive edges of every part of the split are returned along with 
+            the graph. 
+        masks : bool, optional
+            If set (and `split` is given), the split is returned as edge masks 
+            of the full graph, i.e. the graph with positive edges of all parts 
+            of the split added. Defaults to False.
+
+        Returns
+        -------
+        tuple, (tuple, dict) or (tuple, dict, dict)
+            grl graph built from `edge_index` only (i.e. the training graph, 
+            so that validation and test edges are never sampled as positives), 
+            and (if `split` is given) a dict mapping parts of the split to their 
+            positive edges, as edge lists of shape (m_i, 2) with nodes indexed 
+            from 1 (@indexing). 
+            If `masks` is set: the full graph, a dict mapping parts of the split 
+            to edge masks, and the dict of edge lists. Following grl's convention 
+            (1 = the edge may be sampled), the mask of every held-out part is 0 at 
+            both halves of its edges, and the 'train' mask is 0 at the edges of 
+            all held-out parts, so that masked samplers (e.g. 
+            ``grl.graph.sample.get_nce_sample_with_mask``) given the 'train' 
+            mask train on the training edges only. 
     """
-    e0 = dataset.graph['edge_index'].T
-    e1 = np.hstack([e0[:, 1:], e0[:, :1]])  # @symmetry
-    es = np.unique(np.vstack([e0, e1]), axis=0) + 1  # @indexing @slow
+    vcount = int(dataset.graph['num_nodes'])
+    el = np.asarray(dataset.graph['edge_index'], dtype=np.int64).T + 1  # @indexing
+    graph = from_arrays(el[:, 0], el[:, 1], vcount)
+    if split is None:
+        return graph
+    parts = {}
+    for key, part in split.items():
+        if 'edge' in part:
+            parts[key] = np.asarray(part['edge'], dtype=np.int64) + 1  # @indexing
+        else:
+            parts[key] = np.vstack([part['source_node'], part['target_node']]).T.astype(np.int64) + 1
+    if not masks:
+        return graph, parts
+    el = np.vstack([el, *parts.values()])
+    full = from_arrays(el[:, 0], el[:, 1], vcount)
+    train = np.ones(full[1].size, dtype=np.uint8)
+    res = {}
+    for key, part in parts.items():
+        if key != 'train':
+            res[key] = 1 - to_edge_mask(part, full)
+            train &= res[key]
+    res['train'] = train
+    return full, res, parts
 
-    vcount = dataset.graph['num_nodes']
-    ecount = es.shape[0]
 
-    diff = np.diff(es[:, 0])
-    assert np.all(np.unique(diff) == np.array([0, 1])),  "edgelist not sorted"
-    ix = np.hstack([0, np.where(diff)[0] + 1, ecount])  # node boundaries
+@numba.njit(cache=True, parallel=True)
+def filter_edges(graph, mask):
+    """ Get a copy of the graph with only the edges allowed by the mask
+        (i.e. with their corresponding values set to 1). 
 
-    nodes = np.zeros((vcount+2,), dtype=np.uint64)
-    edges = np.zeros((ecount,), dtype=np.uint32)
-    offset = 0
+        Parameters
+        ----------
+        graph : tuple
+        mask : 1darray
+            Array aligned with the edges array.
 
-    for i in range(ix.shape[0]-1):
-        nb = es[ix[i]:ix[i+1], 1]
-        degree = nb.shape[0]
-        nodes[i+1] = offset  # @indexing
-        edges[offset:offset+degree] = nb
-        offset += degree
-    nodes[-1] = offset
-    
-    return nodes, edges 
+        Returns
+        -------
+        tuple
+            grl graph
+    """
+    v, e = graph
+    n = core.vcount(graph)
+    cnt = np.zeros(n+2, dtype=np.int64)
+    for i in numba.prange(1, n+1):
+        c = 0
+        for j in range(np.int64(v[i]), np.int64(v[i+1])):
+            if mask[j] == 1:
+                c += 1
+        cnt[i+1] = c
+    nodes = np.cumsum(cnt)
+    edges = np.empty(nodes[-1], dtype=e.dtype)
+    for i in numba.prange(1, n+1):
+        k = nodes[i]
+        for j in range(np.int64(v[i]), np.int64(v[i+1])):
+            if mask[j] == 1:
+                edges[k] = e[j]
+                k += 1
+    return nodes.astype(v.dtype), edges
 
 
 @numba.njit(cache=True)
-def get_edge_mask(p, graph):
+def find_edge(src, dst, graph):
+    """ Get position of the edge (src, dst) in the edges array, or -1 
+        if there is no such edge. Assumes sorted neighbour lists.
+    """
+    v, e = graph
+    a, b = np.int64(v[src]), np.int64(v[src+1])
+    i = a + np.searchsorted(e[a:b], dst)
+    if i < b and e[i] == dst:
+        return i
+    return -1
+
+
+@numba.njit(cache=True, parallel=True)
+def get_edge_mask(p, graph, reverse=None):
     """ Generate an array of binary edge attributes, 
         making sure that graph symmetry is respected.
+        Reverse index of the graph (see `reverse_index`) is built if not given.
     """
+    if reverse is None:
+        reverse = reverse_index(graph)
     mask = np.random.binomial(1, p, graph[1].size)
-    el = to_edgelist(graph)
-    for i in range(mask.size):
-        src, dst = el[i]
-        addr = core.addr_neighbors(dst, graph)
-        for j in addr:
-            if j > i and el[j, 1] == src:
-                mask[j] = mask[i]
+    for i in numba.prange(mask.size):
+        if reverse[i] > i:
+            mask[reverse[i]] = mask[i]
     return mask
 
 
@@ -171,12 +412,243 @@ def is_edge_masked(edge, graph, mask):
         (i.e. has its corresponding value set to 0). 
     """
     src, dst = edge
-    nb = core.neighbors(src, graph)
-    nb_mask = mask[core.addr_neighbors(src, graph)]
-    for i in range(nb.size):
-        if nb[i] == dst and nb_mask[i] == 0:
-            return True
-    return False
+    i = find_edge(src, dst, graph)
+    return i >= 0 and mask[i] == 0
+
+
+@numba.njit(cache=True, parallel=True)
+def is_sorted(graph):
+    """ Tell if neighbour lists of the graph are sorted (in strictly increasing order).
+    """
+    v, e = graph
+    res = 0
+    for i in numba.prange(1, core.vcount(graph)+1):
+        for j in range(np.int64(v[i])+1, np.int64(v[i+1])):
+            if e[j-1] >= e[j]:
+                res += 1
+                break
+    return res == 0
+
+
+def kfold_edges(graph, k, seed=None, directed=False):
+    """ Split edges of the graph into k folds (see `split_edges`). 
+
+        Parameters
+        ----------
+        graph : tuple
+            Symmetric graph.
+        k : int
+            Number of folds.
+        seed : int, optional
+            Seed of the random assignment of edges to folds.
+        directed : bool, optional
+            If set, edges are assigned independently of their reverse edges
+            (see ``grl.graph.directed``). Defaults to False.
+
+        Returns
+        -------
+        list
+            For every fold, a tuple of: training graph without the edges 
+            of the fold, and an edge list (of shape (m_i, 2)) of the fold. 
+    """
+    part, upper = _assign(graph, np.full(k, 1/k), seed, directed)
+    el = _upper_edgelist(graph, upper)
+    res = []
+    for i in range(k):
+        mask = (part != i).astype(np.uint8)
+        res.append((filter_edges(graph, mask), el[part[upper] == i]))
+    return res
+
+
+def reorder(graph, method='degree'):
+    """ Relabel nodes of the graph to improve memory locality, i.e. so that 
+        nodes likely to be accessed together (hubs, neighbours) get close indices, 
+        and so do the rows of embedding matrices indexed by them. 
+
+        Parameters
+        ----------
+        graph : tuple
+        method : str, optional
+            One of: 
+                - 'degree': nodes sorted by decreasing degree (default), 
+                - 'bfs': breadth-first traversal, starting from hubs, 
+                - 'rcm': reverse Cuthill-McKee (breadth-first traversal starting 
+                  from low degree nodes, visiting neighbours in increasing 
+                  order of degree, reversed). 
+
+        Returns
+        -------
+        graph : tuple
+            Reordered graph.
+        perm : 1darray[int64]
+            Permutation of length ``vcount+1``: i-th node of the reordered graph 
+            is ``perm[i]``-th node of the input graph (``perm[0] == 0``, @indexing).
+            Use ``numpy.argsort(perm)`` for the inverse permutation. 
+    """
+    deg = core.degree(graph).astype(np.int64)
+    if method == 'degree':
+        order = np.argsort(-deg, kind='stable') + 1  # @indexing
+    elif method == 'bfs':
+        order = _traverse(graph, np.argsort(-deg, kind='stable') + 1, deg, False)
+    elif method == 'rcm':
+        order = _traverse(graph, np.argsort(deg, kind='stable') + 1, deg, True)[::-1]
+    else:
+        raise ValueError(f"unknown reordering method: {method}")
+    perm = np.concatenate((np.zeros(1, dtype=np.int64), order))
+    return core.subgraph(order, graph), perm
+
+
+@numba.njit(cache=True, parallel=True)
+def reverse_index(graph):
+    """ Map every edge to its reverse, i.e. position of (dst, src) in the edges 
+        array to the position of (src, dst), or -1 if there is no reverse edge. 
+        With the index, edge attributes (masks, weights) are kept symmetric 
+        with plain array indexing, e.g. ``x[reverse]`` for the attributes 
+        of reverse edges. 
+
+        Parameters
+        ----------
+        graph : tuple
+
+        Returns
+        -------
+        1darray[int64]
+            Array aligned with the edges array.
+    """
+    v, e = graph
+    res = np.empty(e.size, dtype=np.int64)
+    for i in numba.prange(1, core.vcount(graph)+1):
+        for j in range(np.int64(v[i]), np.int64(v[i+1])):
+            res[j] = find_edge(e[j], i, graph)
+    return res
+
+
+@numba.njit(cache=True, parallel=True)
+def sort_neighbors(graph):
+    """ Get a copy of the graph with sorted neighbour lists.
+    """
+    v, e = graph
+    edges = e.copy()
+    for i in numba.prange(1, core.vcount(graph)+1):
+        a, b = np.int64(v[i]), np.int64(v[i+1])
+        edges[a:b] = np.sort(edges[a:b])
+    return v.copy(), edges
+
+
+@numba.njit(cache=True)
+def _traverse(graph, roots, deg, by_degree):
+    """ Get breadth-first order of all nodes, starting a new traversal from 
+        the next unvisited root for every connected component. 
+        If `by_degree` is set, neighbours are visited in increasing order of degree.
+    """
+    v, e = graph
+    n = core.vcount(graph)
+    seen = np.zeros(n+1, dtype=np.uint8)  # @indexing
+    order = np.empty(n, dtype=np.int64)
+    head = tail = 0
+    for r in roots:
+        if seen[r]:
+            continue
+        seen[r] = 1
+        order[tail] = r
+        tail += 1
+        while head < tail:
+            u = order[head]
+            head += 1
+            nb = e[v[u]:v[u+1]]
+            if by_degree:
+                nb = nb[np.argsort(deg[nb.astype(np.int64)-1], kind='mergesort')]  # @indexing
+            for w in nb:
+                if not seen[w]:
+                    seen[w] = 1
+                    order[tail] = w
+                    tail += 1
+    return order
+
+
+def split_edges(graph, fractions=(.8, .1, .1), seed=None, directed=False):
+    """ Randomly split edges of the graph, e.g. into training, validation 
+        and test sets for link prediction. 
+        Training edges make up a graph, so that training needs no edge masks
+        (see ``grl.graph.sample.get_random_edge_with_mask``). 
+
+        Parameters
+        ----------
+        graph : tuple
+            Symmetric graph.
+        fractions : tuple, optional
+            Fractions of (undirected) edges in every part, the first one being 
+            the training part. Edges left over if the fractions sum to less 
+            than 1 are dropped. Defaults to (.8, .1, .1).
+        seed : int, optional
+            Seed of the random assignment of edges to parts.
+        directed : bool, optional
+            If set, edges are assigned independently of their reverse edges, 
+            and edge lists keep their direction (see ``grl.graph.directed``). 
+            Defaults to False.
+
+        Returns
+        -------
+        tuple
+            Training graph (with all nodes of the input graph), followed by 
+            an edge list (of shape (m_i, 2), with src < dst unless directed) 
+            for every other part.
+    """
+    fractions = np.asarray(fractions, dtype=np.float64)
+    if fractions.min() < 0 or fractions.sum() > 1 + 1e-9:
+        raise ValueError("fractions should be non-negative and sum to at most 1")
+    part, upper = _assign(graph, fractions, seed, directed)
+    el = _upper_edgelist(graph, upper)
+    train = filter_edges(graph, (part == 0).astype(np.uint8))
+    return (train, *(el[part[upper] == i] for i in range(1, fractions.size)))
+
+
+def _assign(graph, fractions, seed, directed=False):
+    """ Randomly assign undirected edges to parts of given sizes (fractions), 
+        return part of every edge (aligned with the edges array, the same for 
+        both halves; fractions.size for unassigned edges) and positions of 
+        the upper halves of the edges (of all edges if directed). 
+    """
+    if directed:
+        upper = np.arange(graph[1].size)
+    else:
+        reverse = reverse_index(graph)
+        upper = np.flatnonzero(reverse > np.arange(reverse.size))
+    bounds = np.round(np.cumsum(fractions) * upper.size).astype(np.int64)
+    order = np.random.default_rng(seed).permutation(upper.size)
+    part = np.full(graph[1].size, fractions.size, dtype=np.int64)
+    labels = np.searchsorted(bounds, np.arange(upper.size), side='right')
+    part[upper[order]] = labels
+    if not directed:
+        part[reverse[upper[order]]] = labels
+    return part, upper
+
+
+def _upper_edgelist(graph, upper):
+    """ Get edge list of edges at the given positions of the edges array. """
+    src = np.searchsorted(graph[0], upper, side='right').astype(np.int64) - 1
+    return np.stack([src, graph[1][upper].astype(np.int64)], axis=1)
+
+
+def transpose(graph, vcount=None):
+    """ Get graph with reversed edges, i.e. with in-neighbour lists. 
+
+        Parameters
+        ----------
+        graph : tuple
+        vcount : int, optional
+            Number of nodes of the transposed graph. Defaults to the larger 
+            of: vcount of the graph and the largest node index in its edges.
+
+        Returns
+        -------
+        tuple
+            grl graph
+    """
+    if vcount is None:
+        vcount = max(core.vcount(graph), int(graph[1].max(initial=0)))
+    el = enumerate_edges(graph)
+    return from_arrays(el[:, 1], el[:, 0], vcount, symmetric=False, loops=True)
 
 
 @numba.njit(cache=True, parallel=True)
@@ -190,6 +662,22 @@ def to_adjacency(graph):
     return A
 
 
+@numba.njit(cache=True, parallel=True)
+def to_edge_mask(el, graph):
+    """ Convert edge list to an edge mask, with 1 at both halves of the listed
+        edges. Edges missing in the graph are ignored. 
+    """
+    mask = np.zeros(graph[1].size, dtype=np.uint8)
+    for i in numba.prange(el.shape[0]):
+        j = find_edge(el[i, 0], el[i, 1], graph)
+        if j >= 0:
+            mask[j] = 1
+        j = find_edge(el[i, 1], el[i, 0], graph)
+        if j >= 0:
+            mask[j] = 1
+    return mask
+
+
 @numba.njit(cache=True)
 def to_edgelist(graph):
     return enumerate_edges(graph)
@@ -198,24 +686,313 @@ def to_edgelist(graph):
 def to_igraph(g):
     """ Convert grl graph to igraph.Graph
     """
-    n = core.vcount(g)
-    e = enumerate_edges(g)-1  # @indexing
-    Graph = igraph.Graph(n)
-    Graph.add_edges(e[e[:, 0] < e[:, 1]])
+    Graph = igraph.Graph(core.vcount(g))
+    Graph.add_edges(enumerate_upper_edges(g)-1)  # @indexing
     return Graph
 
 
+def to_scipy(graph, dtype=np.float32, pad=False):
+    """ Convert grl graph to scipy.sparse.csr_matrix.
+
+        Parameters
+        ----------
+        graph : tuple
+        dtype : numpy.dtype, optional
+            Type of the matrix values (all ones). Defaults to float32.
+        pad : bool, optional
+            If set, the matrix has shape (n+1, n+1), with empty 0-th row and column
+            (i.e. it keeps grl's 1-indexing), and shares the `edges` buffer 
+            of the graph; only `nodes` are copied if scipy needs 32-bit offsets. 
+            Otherwise (default) the matrix has shape (n, n), and requires 
+            a shifted copy of `edges`.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+    """
+    nodes, edges = graph
+    n = core.vcount(graph)
+    data = np.ones(edges.size, dtype=dtype)
+    itype = np.int32 if n+1 < 2**31 else np.int64
+    if pad:
+        indices = edges.view(np.int32) if itype is np.int32 and edges.dtype == np.uint32 else edges.astype(itype)
+        return scipy.sparse.csr_matrix((data, indices, nodes.astype(np.int64, copy=False)), shape=(n+1, n+1))
+    indices = (edges - 1).astype(itype)  # @indexing
+    return scipy.sparse.csr_matrix((data, indices, nodes[1:].astype(np.int64, copy=False)), shape=(n, n))
+
+
+def from_scipy(A, pad=False):
+    """ Convert scipy.sparse matrix to grl graph representation. 
+        Every stored entry of the matrix is treated as an edge. 
+
+        Parameters
+        ----------
+        A : scipy.sparse.spmatrix
+            Square (and for most of grl functionality: symmetric) sparse matrix.
+        pad : bool, optional
+            If set, the matrix is expected to have empty 0-th row and column
+            (see `to_scipy`), and its `indices` buffer is shared with the graph
+            whenever the index types allow it. Otherwise (default) 
+            i-th row of the matrix becomes (i+1)-th node of the graph. 
+
+        Returns
+        -------
+        tuple
+            grl graph
+    """
+    if A.shape[0] != A.shape[1]:
+        raise ValueError("adjacency matrix should be square")
+    A = A.tocsr()
+    if not A.has_canonical_format:
+        A = A.copy()
+        A.sum_duplicates()
+    indptr, indices = A.indptr, A.indices
+    if pad:
+        if indptr[1] != 0 or (indices.size and indices.min() == 0):
+            raise ValueError("0-th row and column of a padded matrix should be empty")
+        nodes = indptr.view(np.uint64) if indptr.dtype == np.int64 else indptr.astype(np.uint64)
+        edges = indices.view(np.uint32) if indices.dtype == np.int32 else indices.astype(np.uint32)
+        return nodes, edges
+    nodes = np.zeros(indptr.size+1, dtype=np.uint64)
+    nodes[1:] = indptr
+    edges = (indices + 1).astype(np.uint32)  # @indexing
+    return nodes, edges
+
+
 def to_ogb(g):
     raise NotImplementedError
 
 
-# --- ?
+# Alias
+addr_neighbors = core.addr_neighbors
 
-def save(path, graph):
-    with open(path, 'wb') as f:
-        f.write(pickle.dumps(graph))
+
+# --- storage
+#
+# Graphs are stored in a binary container laid out as follows:
+#   - header (padded to GRL_ALIGN bytes): magic, format version, flags,
+#     dtypes of nodes and edges, vcount, ecount, digest, and offsets of the blocks;
+#   - raw `nodes` array, starting at an offset aligned to GRL_ALIGN;
+#   - raw `edges` array, starting at an offset aligned to GRL_ALIGN.
+# This way both arrays can be memory-mapped directly, and processes loading 
+# the same file share the page cache. 
+# Flags record properties of the stored graph, so that they need not be 
+# verified on load (FLAG_SORTED: neighbour lists are sorted). 
+# Since version 2 the header stores the full content digest (see `digest`), 
+# so that loaded graphs need not be hashed (version 1 stored a sample digest). 
+# Edge weights (see ``grl.graph.weighted``) are stored as a raw float32 array 
+# aligned to GRL_ALIGN after the edges (FLAG_WEIGHTS); they are not part of the digest. 
+
+FLAG_SORTED = 1
+FLAG_WEIGHTS = 2
+GRL_ALIGN = 4096
+GRL_MAGIC = b'GRLGRAPH'
+GRL_VERSION = 2
+_GRL_HEADER = struct.Struct('<8sII8s8sQQ32sQQ')
+
+
+def _align(offset):
+    return -(-offset // GRL_ALIGN) * GRL_ALIGN
+
+
+def _layout(vcount, ecount, nodes_dtype=np.uint64, edges_dtype=np.uint32):
+    """ Get offsets of the nodes and edges blocks and the total file size. """
+    nodes_offset = GRL_ALIGN
+    edges_offset = _align(nodes_offset + (vcount+2)*np.dtype(nodes_dtype).itemsize)
+    return nodes_offset, edges_offset, edges_offset + ecount*np.dtype(edges_dtype).itemsize
 
 
-def load(path):
+def _memmap(path, dtype, mode, offset, size):
+    if not size:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=(size,))
+
+
+def _write_header(f, graph, flags):
+    nodes, edges = graph
+    vcount, ecount = nodes.size-2, edges.size
+    nodes_offset, edges_offset, _ = _layout(vcount, ecount, nodes.dtype, edges.dtype)
+    if cache.get(graph, 'sorted', False) or is_sorted(graph):
+        flags |= FLAG_SORTED
+    f.seek(0)
+    f.write(_GRL_HEADER.pack(GRL_MAGIC, GRL_VERSION, flags,
+                             nodes.dtype.str.encode(), edges.dtype.str.encode(),
+                             vcount, ecount, digest(graph), nodes_offset, edges_offset))
+
+
+def header(path):
+    """ Read the header of a graph file.
+
+        Parameters
+        ----------
+        path : str
+
+        Returns
+        -------
+        dict
+            Format version, flags, dtypes, vcount, ecount, digest and block offsets. 
+            Empty if the file is not in grl binary format. 
+    """
     with open(path, 'rb') as f:
-        return pickle.loads(f.read())
+        buf = f.read(_GRL_HEADER.size)
+    if len(buf) < _GRL_HEADER.size or not buf.startswith(GRL_MAGIC):
+        return {}
+    _, version, flags, ndt, edt, vcount, ecount, dig, noff, eoff = _GRL_HEADER.unpack(buf)
+    if version > GRL_VERSION:
+        raise ValueError(f"unsupported graph format version: {version}")
+    return {
+        'version': version,
+        'flags': flags,
+        'nodes_dtype': np.dtype(ndt.rstrip(b'\x00').decode()),
+        'edges_dtype': np.dtype(edt.rstrip(b'\x00').decode()),
+        'vcount': vcount,
+        'ecount': ecount,
+        'digest': dig,
+        'nodes_offset': noff,
+        'edges_offset': eoff
+    }
+
+
+def _weights_offset(h):
+    return _align(h['edges_offset'] + h['ecount']*h['edges_dtype'].itemsize)
+
+
+def load(path, mmap=True):
+    """ Load graph from file. 
+
+        Parameters
+        ----------
+        path : str
+        mmap : bool, optional
+            If set (default), nodes and edges are read-only memory maps of the file, 
+            otherwise they are read to memory. 
+
+        Returns
+        -------
+        tuple
+            grl graph
+
+        Notes
+        -----
+        Files written with pickle by older versions of grl are still supported 
+        (and always read to memory). 
+        Neighbour lists of graphs stored without FLAG_SORTED are sorted on load 
+        (in memory, see `as_sorted`). 
+        The digest stored in the header is cached for the loaded graph. 
+    """
+    h = header(path)
+    if not h:
+        with open(path, 'rb') as f:
+            return as_sorted(pickle.loads(f.read()))  # legacy format
+    nodes = _memmap(path, h['nodes_dtype'], 'r', h['nodes_offset'], h['vcount']+2)
+    edges = _memmap(path, h['edges_dtype'], 'r', h['edges_offset'], h['ecount'])
+    if not mmap:
+        nodes, edges = np.array(nodes), np.array(edges)
+    if h['version'] >= 2:
+        cache.set((nodes, edges), 'digest', h['digest'])
+    if h['flags'] & FLAG_SORTED:
+        cache.set((nodes, edges), 'sorted', True)
+        return nodes, edges
+    return as_sorted((nodes, edges))
+
+
+def load_weights(path, mmap=True):
+    """ Load edge weights stored along with the graph (see `save`). 
+
+        Parameters
+        ----------
+        path : str
+        mmap : bool, optional
+            If set (default), weights are a read-only memory map of the file, 
+            otherwise they are read to memory. 
+
+        Returns
+        -------
+        1darray[float32] or None
+            Weights aligned with the edges array of the graph returned by `load`, 
+            or None if the file stores no weights. 
+    """
+    h = header(path)
+    if not h or not h['flags'] & FLAG_WEIGHTS:
+        return None
+    w = _memmap(path, np.float32, 'r', _weights_offset(h), h['ecount'])
+    return w if mmap else np.array(w)
+
+
+def open_memmap(path, vcount, ecount, flags=0):
+    """ Create a graph file and memory-map its (uninitialised) nodes and edges. 
+        Write the header with `save_header` once the arrays are filled.
+
+        Parameters
+        ----------
+        path : str
+        vcount : int
+        ecount : int
+        flags : int, optional
+
+        Returns
+        -------
+        tuple
+            grl graph, with arrays memory-mapped in read-write mode
+    """
+    nodes_offset, edges_offset, size = _layout(vcount, ecount)
+    with open(path, 'wb') as f:
+        f.truncate(size)
+    nodes = _memmap(path, np.uint64, 'r+', nodes_offset, vcount+2)
+    edges = _memmap(path, np.uint32, 'r+', edges_offset, ecount)
+    return nodes, edges
+
+
+def save(path, graph, flags=0, weights=None):
+    """ Save graph to file in grl binary format. 
+
+        Parameters
+        ----------
+        path : str
+        graph : tuple
+        flags : int, optional
+            Bit flags to store in the header. FLAG_SORTED is set automatically 
+            if neighbour lists of the graph are sorted.
+        weights : 1darray[float], optional
+            Edge weights aligned with the edges array, stored as float32 
+            (see `load_weights`). FLAG_WEIGHTS is set if given. 
+    """
+    nodes, edges = graph
+    nodes_offset, edges_offset, size = _layout(nodes.size-2, edges.size, nodes.dtype, edges.dtype)
+    if weights is not None:
+        if weights.size != edges.size:
+            raise ValueError("weights should be aligned with the edges array")
+        flags |= FLAG_WEIGHTS
+        weights_offset = _align(size)
+        size = weights_offset + edges.size*4
+    with open(path, 'wb') as f:
+        _write_header(f, graph, flags)
+        f.seek(nodes_offset)
+        np.ascontiguousarray(nodes).tofile(f)
+        f.seek(edges_offset)
+        np.ascontiguousarray(edges).tofile(f)
+        if weights is not None:
+            f.seek(weights_offset)
+            np.ascontiguousarray(weights, dtype=np.float32).tofile(f)
+        f.truncate(size)
+
+
+def save_header(path, graph, flags=0):
+    """ Write the header of a graph file created with `open_memmap`, 
+        truncating the file if the graph has less edges than allocated.
+
+        Parameters
+        ----------
+        path : str
+        graph : tuple
+            Graph memory-mapped from the file at `path`.
+        flags : int, optional
+    """
+    nodes, edges = graph
+    if isinstance(edges, np.memmap):
+        edges.flush()
+    if isinstance(nodes, np.memmap):
+        nodes.flush()
+    with open(path, 'r+b') as f:
+        _write_header(f, graph, flags)
+        f.truncate(_layout(nodes.size-2, edges.size, nodes.dtype, edges.dtype)[2])
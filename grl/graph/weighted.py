@@ -0,0 +1,276 @@
+""" Weighted graphs.
+
+Edge weights (e.g. interaction counts) are kept outside of the graph tuple, as
+a float32 array aligned with the `edges` array (see ``grl.graph.core``), so that
+all functions working on graphs work on weighted graphs as they are. Weights
+of symmetric graphs are expected to be symmetric, i.e. the same for both halves
+of an edge (see ``grl.graph.utils.reverse_index``).
+
+Weighted sampling draws edges with probability proportional to their weight,
+in O(1) per draw, from precomputed alias tables (see `alias_tables`):
+    - `nprob` and `nalias`: alias table of nodes, with probabilities proportional
+      to node strengths (sums of the weights of their edges),
+    - `eprob` and `ealias`: alias tables of the neighbour lists, aligned with
+      the edges array (aliases are offsets within the neighbour list).
+A random edge is a draw of a source node followed by a draw of its neighbour.
+"""
+import numba
+import numpy as np
+
+from grl import numby
+from . import cache
+from . import core
+from . import sample
+from . import utils
+
+
+@numba.njit(cache=True, parallel=True)
+def alias_tables(graph, w):
+    """ Build alias tables for weighted sampling of edges and neighbours.
+
+        Parameters
+        ----------
+        graph : tuple
+        w : 1darray[float]
+            Non-negative edge weights, aligned with the edges array.
+
+        Returns
+        -------
+        tuple
+            (nprob, nalias, eprob, ealias), see the module's docstring.
+    """
+    v, e = graph
+    n = core.vcount(graph)
+    eprob = np.empty(e.size, dtype=np.float32)
+    ealias = np.empty(e.size, dtype=np.int64)
+    s = strength(graph, w)
+    for i in numba.prange(1, n+1):
+        a, b = np.int64(v[i]), np.int64(v[i+1])
+        if s[i-1] > 0:  # @indexing
+            numby.alias_table(w[a:b], eprob[a:b], ealias[a:b])
+        else:
+            eprob[a:b] = 1
+            ealias[a:b] = np.arange(b-a)
+    nprob, nalias = numby.alias_table(s)
+    return nprob, nalias, eprob, ealias
+
+
+def get(graph, w):
+    """ Get alias tables of the weighted graph (see `alias_tables`),
+        cached for the graph and weights (see ``grl.graph.cache``).
+    """
+    key = (*graph[:2], w)
+    res = cache.get(key, 'alias')
+    if res is None:
+        res = alias_tables(graph[:2], w)
+        cache.set(key, 'alias', res)
+    return res
+
+
+@numba.njit()
+def get_random_edge(graph, tables):
+    """ Sample a random edge with probability proportional to its weight. """
+    nprob, nalias, eprob, ealias = tables
+    while True:
+        src = numby.alias_draw(nprob, nalias) + 1  # @indexing
+        dst = get_random_neighbor(src, graph, tables)
+        if dst:
+            return np.array([src, dst], dtype=graph[1].dtype)
+
+
+@numba.njit()
+def get_random_neighbor(i, graph, tables):
+    """ Sample a neighbour of i-th node with probability proportional to the weight
+        of the edge to it, or 0 if the node has no neighbours.
+    """
+    v, e = graph
+    a, b = np.int64(v[i]), np.int64(v[i+1])
+    if a == b:
+        return 0
+    return e[a + numby.alias_draw(tables[2][a:b], tables[3][a:b])]
+
+
+@numba.njit()
+def get_random_walk_pair(graph, walk_length, tables):
+    """ Sample a pair of nodes from a weighted random walk. Walks ending 
+        before their second node (from nodes without neighbours) are redrawn. 
+    """
+    if walk_length < 1:
+        raise ValueError("walk length should be positive")
+    if not graph[1].size:
+        raise ValueError("graph has no edges")
+    while True:
+        v = np.random.choice(core.vcount(graph)) + 1  # @indexing
+        w = random_walk(v, graph, walk_length, tables)
+        m = np.count_nonzero(w)  # walks are padded with 0 after a dead end
+        if m > 1:
+            np.random.shuffle(w[:m])
+            return w[:2]
+
+
+@numba.njit()
+def random_walk(vi, graph, length, tables):
+    """ Random walk of the given length starting from vi, moving along edges with
+        probability proportional to their weights.
+
+        Returns
+        -------
+        1darray
+            Nodes of the walk (length+1 of them, including vi), padded with 0
+            if the walk reaches a node without neighbours.
+    """
+    res = np.zeros(length+1, dtype=graph[1].dtype)
+    res[0] = vi
+    for k in range(length):
+        x = get_random_neighbor(res[k], graph, tables)
+        if not x:
+            break
+        res[k+1] = x
+    return res
+
+
+@numba.njit(cache=True)
+def scale(x, y, graph, w):
+    """ Get per-example scale of the loss: weight of the edge for positive examples
+        which are edges of the graph, and 1 for the others.
+
+        Parameters
+        ----------
+        x : 2darray
+            Examples, as returned by the samplers.
+        y : 1darray
+            Targets.
+        graph : tuple
+            grl graph (or bipartite graph, with weights of its left half).
+        w : 1darray[float]
+            Edge weights, normalised to mean 1 to keep the learning rate scale.
+
+        Returns
+        -------
+        1darray[float32]
+    """
+    g = (graph[0], graph[1])
+    res = np.ones(x.shape[0], dtype=np.float32)
+    for i in range(x.shape[0]):
+        if y[i]:
+            p = utils.find_edge(x[i, 0], x[i, 1], g)
+            if p >= 0:
+                res[i] = w[p]
+    return res
+
+
+def split_edges(graph, w, fractions=(.8, .1, .1), seed=None, directed=False):
+    """ Randomly split edges of the weighted graph (see ``grl.graph.utils.split_edges``).
+
+        Returns
+        -------
+        tuple
+            Training graph and its weights, followed by an edge list and its
+            weights for every other part: ``((train, w_train), (el_1, w_1), ...)``.
+    """
+    fractions = np.asarray(fractions, dtype=np.float64)
+    if fractions.min() < 0 or fractions.sum() > 1 + 1e-9:
+        raise ValueError("fractions should be non-negative and sum to at most 1")
+    part, upper = utils._assign(graph, fractions, seed, directed)
+    el = utils._upper_edgelist(graph, upper)
+    train = utils.filter_edges(graph, (part == 0).astype(np.uint8))
+    res = [(train, w[part == 0])]
+    for i in range(1, fractions.size):
+        at = part[upper] == i
+        res.append((el[at], w[upper[at]]))
+    return tuple(res)
+
+
+@numba.njit(cache=True, parallel=True)
+def strength(graph, w):
+    """ Get strengths of nodes, i.e. sums of the weights of their edges.
+    """
+    v, e = graph
+    n = core.vcount(graph)
+    res = np.zeros(n, dtype=np.float64)
+    for i in numba.prange(1, n+1):
+        res[i-1] = w[np.int64(v[i]):np.int64(v[i+1])].sum()  # @indexing
+    return res
+
+
+def subgraph(vs, graph, w):
+    """ Filter to a subgraph spanned by the given nodes (see ``grl.graph.core.subgraph``),
+        along with the weights of its edges.
+    """
+    sub = core.subgraph(vs, graph)
+    return sub, take(vs, sub, graph, w)
+
+
+@numba.njit(cache=True, parallel=True)
+def take(vs, sub, graph, w):
+    """ Get weights of the edges of a subgraph spanned by the nodes vs
+        (e.g. relabeled graph, see ``grl.graph.utils.reorder``).
+
+        Parameters
+        ----------
+        vs : 1darray[int]
+            Nodes of the graph; i-th node of the subgraph corresponds to
+            ``vs[i-1]`` (@indexing).
+        sub : tuple
+            Subgraph.
+        graph : tuple
+            Input graph.
+        w : 1darray[float]
+            Edge weights of the input graph.
+
+        Returns
+        -------
+        1darray
+            Edge weights of the subgraph.
+    """
+    v, e = sub
+    res = np.empty(e.size, dtype=w.dtype)
+    for i in numba.prange(1, vs.size+1):
+        for p in range(np.int64(v[i]), np.int64(v[i+1])):
+            res[p] = w[utils.find_edge(vs[i-1], vs[e[p]-1], graph)]  # @indexing
+    return res
+
+
+@numba.njit(cache=False)
+@sample.sampler(get_random_edge, sample.get_random_pair)
+def get_nce_sample():
+    """ Sample weighted edges with balanced noise contrast
+        (see ``grl.graph.sample.get_nce_sample``). Positional arguments to
+        the positive sampler (`pargs`) take the alias tables of the graph:
+            (tables,)
+        (see `get`).
+    """
+    pass
+
+
+@sample.with_bitset
+@numba.njit(cache=False)
+@sample.sampler(get_random_edge, sample.get_random_anti_edge)
+def get_neg_sample():
+    """ Sample weighted edges with balanced negative contrast
+        (see ``grl.graph.sample.get_neg_sample``). Positional arguments to
+        the positive sampler (`pargs`) take the alias tables of the graph:
+            (tables,)
+        (see `get`).
+    """
+    pass
+
+
+@numba.njit(cache=False)
+@sample.sampler(get_random_walk_pair, sample.get_random_pair)
+def get_random_walk_sample():
+    """ Sample pairs of nodes from weighted random walks, with uniform noise
+        contrast (see ``grl.graph.sample.get_random_walk_sample``).
+        Positional arguments to the positive sampler (`pargs`):
+            (walk_length, tables)
+    """
+    pass
+
+
+# Alias
+nce = get_nce_sample
+neg = get_neg_sample
+
+# Samplers drawing edges in proportion to their weights; the loss of their 
+# examples is not scaled by the weights again (see ``grl.graph.model.utils.weights``)
+SAMPLERS = (get_nce_sample, get_neg_sample, get_random_walk_sample)
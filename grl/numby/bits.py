@@ -80,3 +80,52 @@ def unpack32(x):
     for i in range(x.shape[0]):
         res[i] = unpack(x[i:i+1], 32)
     return res
+
+
+@numba.njit(cache=True)
+def bitset_get(x, i):
+    """ Get i-th bit of a bit array packed to uint64 words (as with pack64). 
+
+        Parameters
+        ----------
+        x : uint64[:]
+            Packed bit array.
+        i : int
+            Bit index.
+
+        Returns
+        -------
+        res : bool
+    """
+    if i >= x.shape[0]*64:
+        return False
+    return (x[i >> 6] >> np.uint64(63 - (i & 63))) & np.uint64(1) == 1
+
+
+@numba.njit(cache=True)
+def bitset_set(x, i):
+    """ Set i-th bit of a bit array packed to uint64 words (as with pack64). 
+        Modifies x in place.
+    """
+    x[i >> 6] |= np.uint64(1) << np.uint64(63 - (i & 63))
+
+
+@numba.njit(cache=True)
+def popcount(x):
+    """ Count set bits of a uint64 word. 
+    """
+    x = np.uint64(x)
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0f0f0f0f0f0f0f0f)
+    return (x * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+
+@numba.njit(cache=True)
+def popcount_1d(x):
+    """ Count set bits of a bit array packed to uint64 words.
+    """
+    res = 0
+    for i in range(x.shape[0]):
+        res += popcount(x[i])
+    return res
@@ -4,6 +4,96 @@ import numpy as np
 from grl import config
 
 
+@numba.njit(cache=True)
+def alias_draw(prob, alias):
+    """ Draw an index from the distribution given by its alias table
+        (see `alias_table`), in constant time. 
+    """
+    i = np.random.randint(prob.size)
+    if np.random.random() < prob[i]:
+        return i
+    return np.int64(alias[i])
+
+
+@numba.njit(cache=True, parallel=True)
+def alias_sample(prob, alias, s):
+    """ Draw a sample of indices (with replacement) from the distribution given 
+        by its alias table (see `alias_table`), in parallel. 
+
+        Parameters
+        ----------
+        prob, alias : 1darray, 1darray
+            Alias table, which can be reused across calls. 
+        s : int
+            Sample size.
+
+        Returns
+        -------
+        1darray[int64]
+    """
+    res = np.empty(s, dtype=np.int64)
+    for i in numba.prange(s):
+        res[i] = alias_draw(prob, alias)
+    return res
+
+
+@numba.njit(cache=True)
+def alias_table(w, prob=None, alias=None):
+    """ Build alias table (Vose's method) of the distribution proportional to w.
+
+        Parameters
+        ----------
+        w : 1darray
+            Non-negative weights, not all zero.
+        prob : 1darray[float], optional
+            Output array for the probabilities of the table, of the size of w.
+        alias : 1darray[int], optional
+            Output array for the aliases of the table, of the size of w.
+
+        Returns
+        -------
+        prob, alias : 1darray, 1darray
+            Probability of keeping every index and its alias (see `alias_draw`).
+    """
+    n = w.size
+    if prob is None:
+        prob = np.empty(n, dtype=np.float32)
+    if alias is None:
+        alias = np.empty(n, dtype=np.int64)
+    p = w.astype(np.float64) * (n / w.sum())
+    small = np.empty(n, dtype=np.int64)
+    large = np.empty(n, dtype=np.int64)
+    ns = nl = 0
+    for i in range(n):
+        if p[i] < 1:
+            small[ns] = i
+            ns += 1
+        else:
+            large[nl] = i
+            nl += 1
+    while ns and nl:
+        ns -= 1
+        nl -= 1
+        s, l = small[ns], large[nl]
+        prob[s] = p[s]
+        alias[s] = l
+        p[l] -= 1 - p[s]
+        if p[l] < 1:
+            small[ns] = l
+            ns += 1
+        else:
+            large[nl] = l
+            nl += 1
+    # leftovers (up to rounding errors) keep their index
+    for k in range(nl):
+        prob[large[k]] = 1
+        alias[large[k]] = large[k]
+    for k in range(ns):
+        prob[small[k]] = 1
+        alias[small[k]] = small[k]
+    return prob, alias
+
+
 @numba.njit(cache=True)
 def binary_crossentropy(p, q):
     e = config.EPSILON
@@ -48,6 +138,45 @@ def cumsum_2d(x, axis):
         return res
 
 
+@numba.njit(cache=True)
+def gallop_isin_1d(a, b):
+    """ Tell which elements of a are in b, where b is sorted. 
+        Queries are sorted first, and each one is located with a galloping 
+        (exponential) search starting from the position of the previous one, 
+        which takes O(k log(n/k)) comparisons for k queries. 
+
+        Parameters
+        ----------
+        a : 1darray
+            Queries.
+        b : 1darray
+            Sorted array. 
+
+        Returns
+        -------
+        res : 1darray[bool]
+            Membership of the elements of a, in their original order. 
+    """
+    res = np.zeros(a.size, dtype=np.bool_)
+    srt = np.argsort(a)
+    lo = 0
+    for i in srt:
+        x = a[i]
+        # gallop
+        step = 1
+        hi = lo
+        while hi < b.size and b[hi] < x:
+            lo = hi + 1
+            hi += step
+            step *= 2
+        hi = min(hi, b.size)
+        # binary search in b[lo:hi+1]
+        lo += np.searchsorted(b[lo:hi], x)
+        if lo < b.size and b[lo] == x:
+            res[i] = True
+    return res
+
+
 @numba.njit(cache=True)
 def identity(x):
     return x
@@ -61,6 +190,14 @@ def isin_1d(a, b):
     return False
 
 
+@numba.njit(cache=True)
+def isin_sorted_1d(a, b):
+    """ Tell if a is in b, where b is sorted (binary search).
+    """
+    i = np.searchsorted(b, a)
+    return i < b.size and b[i] == a
+
+
 @numba.njit(cache=True)
 def hstack2(x, y):
     """ Stack two arrays horizontally. 
@@ -112,24 +249,24 @@ def random_choice(x, s, w=None):
         s : int
             Sample size.
         w : 1-D array-like, optional
-            Sampling weights, corresponding to the values of x. 
+            Sampling weights (integer or float), corresponding to the values of x. 
             
         Returns
         -------
         res : 1darray
-            
+
+        Notes
+        -----
+        Weighted samples are drawn with an alias table built in O(x.size) 
+        (see `alias_table`); to draw many samples with the same weights, 
+        build the table once and use `alias_sample`. 
     """
     if w is None:
         return np.random.choice(x, s)
     
     assert x.size == w.size
-    expand = np.empty(w.sum(), dtype=x.dtype.type)
-    
-    _ = 0 
-    for i in range(w.size):
-        expand[_:_+w[i]] = np.repeat(x[i], w[i])
-        _ += w[i]
-    return np.random.choice(expand, s)
+    prob, alias = alias_table(w)
+    return x[alias_sample(prob, alias, s)]
 
 
 @numba.njit(cache=True, parallel=True)
@@ -1,6 +1,9 @@
 """ Shared memory utilities specific to the graph data structure. 
 """
-from grl.graph.utils import hexdigest
+import numpy as np
+
+from grl.graph import cache
+from grl.graph.utils import digest, is_sorted
 
 from . import _obj
 from . import _ops
@@ -26,22 +29,51 @@ def discover(graph):
 
 
 def name(graph):
-    """ Create graph name from its hexdigest. 
+    """ Create graph name from its hexdigest (cached, see ``grl.graph.utils.digest``). 
     """
-    return f"graph_{hexdigest(graph)[:16]}"
+    return _name(digest(graph))
+
+
+def _name(d):
+    return f"graph_{d.hex()[:16]}"
 
 
 def register(graph):
     """ Copy nodes and edges to shared memory, and create references to nodes,
-        edges, and the graph. 
+        edges, and the graph. Bipartite graphs (see ``grl.graph.bipartite``) 
+        are registered with both of their halves. 
+        Memory-mapped graphs (see ``grl.graph.utils.load``) are registered without 
+        a copy, as worker processes share their pages anyway. 
+        Neighbour lists of the graph have to be sorted; graphs built otherwise 
+        are rejected rather than sorted here, as sorting would move their edges 
+        away from masks and weights aligned with the edges array 
+        (see ``grl.graph.utils.as_sorted``). 
     """
-    graph_name = name(graph) 
+    d = digest(graph)
+    graph_name = _name(d)
     if _ops.get(graph_name):
         return graph_name 
     else:
-        nodes, edges = graph
-        nodes_name, edges_name = (f"{graph_name}_{e}" for e in ["nodes", "edges"])
-        _ops.set(nodes, nodes_name)
-        _ops.set(edges, edges_name)
-        setattr(_obj, graph_name, (_ops.get(nodes_name), _ops.get(edges_name)))
+        halves = [graph[i:i+2] for i in range(0, len(graph), 2)]
+        for half in halves:
+            if not (cache.get(half, 'sorted', False) or is_sorted(half)):
+                raise ValueError("neighbour lists of the graph are not sorted (see grl.graph.utils.as_sorted)")
+            cache.set(half, 'sorted', True)
+        names = [f"{graph_name}_{e}" for e in ["nodes", "edges", "rnodes", "redges"][:len(graph)]]
+        for x, x_name in zip(graph, names):
+            if isinstance(x, np.memmap):
+                setattr(_obj, x_name, x)
+            else:
+                _ops.set(x, x_name)
+        setattr(_obj, graph_name, tuple(_ops.get(x_name) for x_name in names))
+        cache.set(_ops.get(graph_name), 'digest', d)
         return graph_name
+
+
+def register_weights(ref, w):
+    """ Copy edge weights of a registered graph to shared memory 
+        (see ``grl.graph.weighted``), and return their reference. 
+    """
+    w_name = f"{ref}_weights"
+    _ops.set(np.asarray(w, dtype=np.float32), w_name)
+    return w_name
@@ -0,0 +1,66 @@
+import numpy as np
+
+import grl
+
+
+def bipartite_edgelist(n1=40, n2=100, m=400, seed=3):
+    np.random.seed(seed)
+    el = np.stack([np.random.randint(1, n1+1, m), np.random.randint(1, n2+1, m)], axis=1)
+    return np.unique(el, axis=0), (n1, n2)
+
+
+def test_from_edgelist():
+    el, vcount = bipartite_edgelist()
+    bg = grl.graph.bipartite.from_edgelist(el, vcount)
+    assert grl.graph.bipartite.vcount(bg, 0) == vcount[0]
+    assert grl.graph.bipartite.vcount(bg, 1) == vcount[1]
+    assert grl.graph.bipartite.ecount(bg) == el.shape[0]
+    assert np.all(grl.graph.bipartite.to_edgelist(bg) == el)
+    assert np.all(grl.graph.bipartite.degree(bg, 1) == np.bincount(el[:, 1], minlength=vcount[1]+1)[1:])
+    for right in range(1, vcount[1]+1):
+        nbs = grl.graph.bipartite.neighbors(right, bg, 1)
+        assert np.all(nbs[nbs > 0] == el[el[:, 1] == right, 0])
+
+
+def test_from_graph():
+    el, vcount = bipartite_edgelist()
+    bg = grl.graph.bipartite.from_edgelist(el, vcount)
+    bh = grl.graph.bipartite.from_graph(grl.graph.bipartite.left(bg), vcount[1])
+    for x, y in zip(bg, bh):
+        assert np.all(x == y)
+
+
+def test_is_edge():
+    el, vcount = bipartite_edgelist()
+    bg = grl.graph.bipartite.from_edgelist(el, vcount)
+    A = np.zeros((vcount[0]+1, vcount[1]+1), dtype=bool)
+    A[el[:, 0], el[:, 1]] = True
+    for i in range(1, vcount[0]+1):
+        for j in range(1, vcount[1]+1):
+            assert grl.graph.bipartite.is_edge(i, j, bg) == A[i, j]
+
+
+def test_sample():
+    el, vcount = bipartite_edgelist()
+    bg = grl.graph.bipartite.from_edgelist(el, vcount)
+    for side in [-1, 0, 1]:
+        x, y = grl.graph.bipartite.neg(bg, 256, (side,))
+        assert x[:, 0].max() <= vcount[0] and x[:, 1].max() <= vcount[1]
+        for (left, right), label in zip(x, y):
+            assert grl.graph.bipartite.is_edge(left, right, bg) == label
+
+
+def test_sample_noise():
+    el, vcount = bipartite_edgelist()
+    bg = grl.graph.bipartite.from_edgelist(el, vcount)
+    # noise concentrated on the least connected right node
+    right = np.argmin(grl.graph.bipartite.degree(bg, 1)) + 1  # @indexing
+    weights = np.zeros(vcount[1])
+    weights[right-1] = 1  # @indexing
+    table = grl.graph.noise.get(bg, weights, vcount[1])
+    x, y = grl.graph.bipartite.nce(bg, 256, (), (vcount[1], table))
+    assert np.all(x[y == 0, 1] == right)
+    # positives are drawn uniformly over the edges
+    x, y = grl.graph.bipartite.nce(bg, 20000, (), (vcount[1],))
+    counts = np.bincount(x[y == 1, 1], minlength=vcount[1]+1)[1:]  # @indexing
+    assert np.corrcoef(counts, grl.graph.bipartite.degree(bg, 1))[0, 1] > .9
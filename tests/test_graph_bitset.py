@@ -0,0 +1,45 @@
+import pickle
+
+import numpy as np
+
+import grl
+
+from common import graphs
+
+
+def test_degree(graphs):
+    for G in graphs():
+        bits = grl.graph.bitset.from_graph(G)
+        assert np.all(grl.graph.bitset.degree(bits) == grl.degree(G))
+
+
+def test_is_neighbor(graphs):
+    for G in graphs():
+        bits = grl.graph.bitset.from_graph(G)
+        A = grl.graph.utils.to_adjacency(G)
+        for vi, vj in np.random.randint(1, grl.vcount(G)+1, (1024, 2)):
+            assert grl.graph.bitset.is_neighbor(vi, vj, bits) == A[vi-1, vj-1]  # @indexing
+            assert grl.is_neighbor(vi, vj, G, bits) == grl.is_neighbor(vi, vj, G)
+
+
+def test_neighbors(graphs):
+    for G in graphs():
+        bits = grl.graph.bitset.from_graph(G)
+        for vi in grl.graph.utils.enumerate_nodes(G):
+            nbs = grl.graph.bitset.neighbors(vi, bits)
+            assert np.all(nbs == np.sort(grl.neighbors(vi, G)[grl.neighbors(vi, G) > 0]))
+
+
+def test_to_adjacency(graphs):
+    for G in graphs():
+        bits = grl.graph.bitset.from_graph(G)
+        assert bits.nbytes == grl.graph.bitset.nbytes(G)
+        assert np.all(grl.graph.bitset.to_adjacency(bits) == grl.graph.utils.to_adjacency(G))
+
+
+def test_with_bitset_pickle(graphs):
+    G = graphs()[0]
+    sampler = pickle.loads(pickle.dumps(grl.graph.sample.neg))
+    x, y = sampler(G, 512)
+    for (vi, vj), target in zip(x, y):
+        assert (grl.graph.utils.find_edge(vi, vj, G) >= 0) == target
@@ -0,0 +1,59 @@
+import numpy as np
+
+import grl
+
+from common import graphs
+
+
+def test_compress_decompress(graphs):
+    for g in graphs():
+        cg = grl.graph.compressed.compress(g)
+        h = grl.graph.compressed.decompress(cg)
+        assert np.all(g[0] == h[0])
+        assert np.all(g[1] == h[1])
+        assert np.all(grl.degree(g) == grl.graph.compressed.degree(cg))
+        assert grl.ecount(g) == grl.graph.compressed.ecount(cg)
+
+
+def test_is_neighbor(graphs):
+    for g in graphs():
+        cg = grl.graph.compressed.compress(g)
+        n = grl.vcount(g)
+        for i in range(1, n+1, max(n//64, 1)):
+            for j in range(1, n+1):
+                assert grl.graph.compressed.is_neighbor(i, j, cg) == grl.is_neighbor(i, j, g)
+
+
+def test_large_ids():
+    # neighbour lists spanning several blocks, with gaps of various varint sizes
+    np.random.seed(5)
+    n = 2**22
+    el = np.random.randint(1, n+1, (4096, 2))
+    el[:1024, 0] = 1
+    g = grl.graph.utils.from_edgelist(el, vcount=n)
+    cg = grl.graph.compressed.compress(g)
+    h = grl.graph.compressed.decompress(cg)
+    assert np.all(g[1] == h[1])
+    for v in [1, el[1500, 0], el[2000, 1]]:
+        nbs = grl.neighbors(v, g)
+        assert np.all(grl.graph.compressed.neighbors(v, cg) == nbs)
+        for u in np.concatenate([nbs, nbs+1, nbs-1]):
+            assert grl.graph.compressed.is_neighbor(u, v, cg) == grl.is_neighbor(u, v, g)
+
+
+def test_neighbors(graphs):
+    for g in graphs():
+        cg = grl.graph.compressed.compress(g)
+        for v in range(1, grl.vcount(g)+1):
+            nbs = grl.graph.compressed.neighbors(v, cg)
+            assert np.all(nbs == grl.neighbors(v, g))
+            if nbs[0]:
+                assert grl.graph.compressed.get_random_neighbor(v, cg) in nbs
+
+
+def test_sample(graphs):
+    for g in graphs():
+        cg = grl.graph.compressed.compress(g)
+        x, y = grl.graph.compressed.neg(cg, 64)
+        for (src, dst), label in zip(x, y):
+            assert grl.is_neighbor(dst, src, g) == label
@@ -52,6 +52,51 @@ def test_induced_subgraph(graphs):
             assert np.all(nb_sg == np.intersect1d(nb_g - offset, nb_sg))
 
 
+def test_induced_subgraph_unsorted(graphs):
+    np.random.seed(11)
+    for g in graphs():
+        vs = np.random.permutation(grl.vcount(g))[:grl.vcount(g)//2] + 1  # @indexing
+        sg = grl.subgraph(vs, g)
+        assert grl.graph.utils.is_sorted(sg)
+        for i, v in enumerate(vs):
+            nb = grl.neighbors(i+1, sg)  # @indexing
+            nb = vs[nb[nb > 0] - 1]  # @indexing
+            assert np.all(np.sort(nb) == np.intersect1d(grl.neighbors(v, g), vs))
+
+
+def test_induced_subgraph_bimodal():
+    # neighbour ids of a bipartite half exceed its node count
+    g = grl.graph.bipartite.half(grl.graph.bipartite.from_edgelist([[1, 5], [2, 9], [3, 2]]))
+    sg = grl.subgraph(np.arange(1, 4), g)
+    assert np.all(grl.neighbors(3, sg) == [2])
+    assert grl.ecount(sg) == 1
+
+
+def test_is_neighbor(graphs):
+    for g in graphs():
+        A = grl.graph.utils.to_adjacency(g)
+        n = grl.vcount(g)
+        for i in range(1, min(n, 32)+1):
+            for j in range(1, n+1):
+                assert grl.is_neighbor(i, j, g) == bool(A[j-1, i-1])  # @indexing
+
+
+def test_k_hop_subgraph(igraphs):
+    for G in igraphs():
+        g = grl.graph.utils.from_igraph(G)
+        seeds = np.arange(1, grl.vcount(g)+1, 3)
+        for k in [0, 1, 2]:
+            (nodes, edges), vs, ptr = grl.k_hop_subgraph(seeds, k, g)
+            assert ptr.size == seeds.size + 1
+            for i, seed in enumerate(seeds):
+                ego = np.sort(np.array(G.neighborhood(seed-1, order=k))) + 1  # @indexing
+                assert np.all(vs[ptr[i]:ptr[i+1]] == ego)
+                sg = grl.subgraph(ego, g)
+                nb = nodes[ptr[i]+1:ptr[i+1]+2] 
+                assert np.all(nb - nb[0] == sg[0][1:])
+                assert np.all(edges[nb[0]:nb[-1]] - ptr[i] == sg[1])
+
+
 def test_neighbors(graphs):
     for g in graphs():
         G = grl.graph.utils.to_igraph(g)
@@ -0,0 +1,64 @@
+import numpy as np
+
+import grl
+
+from common import graphs
+
+
+def directed_edgelist(n=50, m=300, seed=7):
+    np.random.seed(seed)
+    el = np.random.randint(1, n+1, (m, 2))
+    el = el[el[:, 0] != el[:, 1]]
+    return np.unique(el, axis=0), n
+
+
+def test_from_edgelist():
+    el, n = directed_edgelist()
+    g = grl.graph.directed.from_edgelist(el, n)
+    assert grl.ecount(g) == el.shape[0]
+    assert np.all(grl.graph.utils.to_edgelist(g) == el)
+    assert np.all(grl.graph.directed.out_degree(g) == np.bincount(el[:, 0], minlength=n+1)[1:])
+    assert np.all(grl.graph.directed.in_degree(g) == np.bincount(el[:, 1], minlength=n+1)[1:])
+    for src, dst in el:
+        assert grl.graph.directed.is_edge(src, dst, g)
+        assert grl.graph.directed.is_edge(dst, src, g) == bool(((el[:, 0] == dst) & (el[:, 1] == src)).any())
+
+
+def test_transpose():
+    el, n = directed_edgelist()
+    g = grl.graph.directed.from_edgelist(el, n)
+    t = grl.graph.directed.transpose(g)
+    assert grl.graph.directed.transpose(g) is t
+    assert grl.vcount(t) == n
+    for v in range(1, n+1):
+        nbs = grl.graph.directed.in_neighbors(v, g)
+        assert np.all(nbs[nbs > 0] == np.sort(el[el[:, 1] == v, 0]))
+
+
+def test_masks_and_splits():
+    el, n = directed_edgelist()
+    g = grl.graph.directed.from_edgelist(el, n)
+    mask = grl.graph.directed.to_edge_mask(el[:10], g)
+    assert mask.sum() == 10
+    train, test = grl.graph.directed.split_edges(g, (.75, .25), seed=0)
+    assert grl.ecount(train) + test.shape[0] == el.shape[0]
+    for src, dst in test:
+        assert not grl.graph.directed.is_edge(src, dst, train)
+
+
+def test_symmetrize(graphs):
+    for G in graphs():
+        el = grl.graph.utils.enumerate_upper_edges(G)
+        g = grl.graph.directed.from_edgelist(el, grl.vcount(G))
+        assert grl.ecount(g) == grl.ecount(G)//2  # @symmetry
+        H = grl.graph.directed.symmetrize(g)
+        assert np.all(H[0] == G[0])
+        assert np.all(H[1] == G[1])
+
+
+def test_sample():
+    el, n = directed_edgelist()
+    g = grl.graph.directed.from_edgelist(el, n)
+    x, y = grl.graph.sample.neg(g, 512)
+    for (src, dst), label in zip(x, y):
+        assert grl.graph.directed.is_edge(src, dst, g) == label
@@ -0,0 +1,91 @@
+import numpy as np
+
+import grl
+
+from common import graphs
+
+
+def updates(graph, steps, size, seed=13):
+    """ Generate random batches of insertions and deletions, 
+        along with the expected edge set after every batch. 
+    """
+    np.random.seed(seed)
+    n = grl.vcount(graph)
+    edges = {tuple(e) for e in grl.graph.utils.enumerate_edges(graph).tolist()}
+    for _ in range(steps):
+        ins = np.random.randint(1, n+1, (size, 2))
+        edges |= {(s, d) for s, d in ins.tolist() if s != d}
+        edges |= {(d, s) for s, d in ins.tolist() if s != d}
+        el = np.array(sorted(edges))
+        dele = el[np.random.choice(el.shape[0], size)]
+        edges -= {(s, d) for s, d in dele.tolist()}
+        edges -= {(d, s) for s, d in dele.tolist()}
+        yield ins, dele, np.array(sorted(edges)).reshape(-1, 2)
+
+
+def test_dynamic_graph(graphs):
+    for G in graphs():
+        for background in [True, False]:
+            D = grl.graph.dynamic.DynamicGraph(G, compaction=.1, background=background)
+            for ins, dele, el in updates(G, 16, 8):
+                D.insert(ins)
+                D.delete(dele)
+                D.wait()
+                H = grl.graph.utils.from_edgelist(el, grl.vcount(G))
+                assert np.all(grl.graph.dynamic.degree(D.graph) == grl.degree(H))
+                assert grl.graph.dynamic.ecount(D.graph) == grl.ecount(H)
+                for vi in grl.graph.utils.enumerate_nodes(H):
+                    assert np.all(grl.graph.dynamic.neighbors(vi, D.graph) == grl.neighbors(vi, H))
+            H = D.compact()
+            assert D.pending == 0
+            assert np.all(H[0] == grl.graph.utils.from_edgelist(el, grl.vcount(G))[0])
+            assert np.all(H[1] == grl.graph.utils.from_edgelist(el, grl.vcount(G))[1])
+
+
+def test_get_neg_sample(graphs):
+    for G in graphs():
+        D = grl.graph.dynamic.DynamicGraph(G)
+        for ins, dele, el in updates(G, 4, 32):
+            D.insert(ins)
+            D.delete(dele)
+        x, y = grl.graph.dynamic.neg(D.graph, 1024)
+        for (vi, vj), target in zip(x, y):
+            assert grl.graph.dynamic.is_neighbor(vi, vj, D.graph) == target
+
+
+def test_snapshot(graphs):
+    G = graphs()[0]
+    D = grl.graph.dynamic.DynamicGraph(G, compaction=.1)
+    view = D.graph
+    copy = [x.copy() for x in view]
+    for ins, dele, el in updates(G, 8, 32):
+        D.insert(ins)
+        D.delete(dele)
+    D.close()
+    assert D.graph is not view
+    for x, y in zip(view, copy):
+        assert np.all(x == y)
+    # compaction blocks updates once the thread is stopped
+    D.insert(np.random.randint(1, grl.vcount(G)+1, (grl.ecount(G), 2)))
+    assert D.pending == 0
+    H = grl.graph.utils.from_edgelist(grl.graph.utils.to_edgelist(D.base), grl.vcount(G))
+    assert np.all(grl.graph.dynamic.degree(D.graph) == grl.degree(H))
+
+
+def test_get_random_edge():
+    el = np.array([[1, 2], [1, 3], [1, 4], [1, 5], [5, 6]])
+    D = grl.graph.dynamic.DynamicGraph(grl.graph.utils.from_edgelist(el, 8), compaction=10)
+    D.delete([[1, 4]])
+    D.insert([[7, 8]])
+    np.random.seed(7)
+    x = np.array([grl.graph.dynamic.get_random_edge(D.graph) for _ in range(2**14)])
+    for vi, vj in x:
+        assert grl.graph.dynamic.is_neighbor(vi, vj, D.graph)
+    # uniform over the (half-)edges
+    keys = np.unique(x[:, 0]*16 + x[:, 1], return_counts=True)[1]
+    assert keys.size == grl.graph.dynamic.ecount(D.graph)
+    assert np.allclose(keys / x.shape[0], 1 / keys.size, atol=.01)
+    # models take dynamic graphs as they are
+    model = grl.graph.Model(8, 4)
+    model.fit(D, 2**12)
+    assert D.pending == 0
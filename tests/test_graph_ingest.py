@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+import grl
+
+from common import igraphs
+
+
+@pytest.fixture(scope="module")
+def edgelist():
+    np.random.seed(13)
+    return np.random.randint(1, 512, (4096, 2))
+
+
+def equal(g, h):
+    return np.all(g[0] == h[0]) and np.all(g[1] == h[1])
+
+
+def test_from_file_binary(edgelist, tmp_path):
+    path = str(tmp_path / "graph.bin")
+    edgelist.astype(np.uint32).tofile(path)
+    g = grl.graph.ingest.from_file(path, dtype=np.uint32, chunk_size=1000)
+    assert equal(g, grl.graph.utils.from_edgelist(edgelist))
+
+
+def test_from_file_csv(edgelist, tmp_path):
+    path = str(tmp_path / "graph.csv")
+    np.savetxt(path, edgelist-1, fmt="%d", delimiter=",", header="source,target", comments="")
+    g = grl.graph.ingest.from_file(path, vcount=600, indexing=0, skiprows=1, chunk_size=100)
+    assert equal(g, grl.graph.utils.from_edgelist(edgelist, 600))
+
+
+def test_from_file_spill(edgelist, tmp_path):
+    path = str(tmp_path / "graph.npy")
+    np.save(path, edgelist)
+    out = str(tmp_path / "graph.grl")
+    g = grl.graph.ingest.from_file(path, out=out, memory=2**12, chunk_size=1000)
+    assert isinstance(g[1], np.memmap)
+    assert equal(g, grl.graph.utils.from_edgelist(edgelist))
+    assert equal(grl.graph.utils.load(out, mmap=False), g)
+
+
+def test_from_file_text(igraphs, tmp_path):
+    for G in igraphs():
+        path = str(tmp_path / "graph.txt")
+        np.savetxt(path, np.array(G.get_edgelist()), fmt="%d", header="comment")
+        g = grl.graph.ingest.from_file(path, vcount=G.vcount(), indexing=0, chunk_size=64)
+        assert equal(g, grl.graph.utils.from_igraph(G))
+
+
+def test_from_file_invalid(edgelist, tmp_path):
+    path = str(tmp_path / "graph.txt")
+    np.savetxt(path, np.vstack([edgelist, [[3, -4]]]), fmt="%d")
+    with pytest.raises(ValueError):
+        grl.graph.ingest.from_file(path)
+    # negative values in other columns are fine
+    np.savetxt(path, np.hstack([edgelist, -np.ones((edgelist.shape[0], 1), dtype=int)]), fmt="%d")
+    assert equal(grl.graph.ingest.from_file(path), grl.graph.utils.from_edgelist(edgelist))
+    with pytest.raises(ValueError):
+        grl.graph.ingest.from_file(path, memory=2**12)
@@ -1,3 +1,6 @@
+import numpy as np
+import pytest
+
 import grl
 
 from common import graphs_small as graphs 
@@ -79,3 +82,49 @@ def test_symmetric_neg_sigmoid(graphs):
 @with_model('symmetric', 'neg', None)
 def test_symmetric_neg_linear(graphs):
     pass
+
+
+def test_reorder(graphs):
+    for G in graphs():
+        for method in ['degree', 'bfs', 'rcm']:
+            model = grl.graph.Model(obs=grl.vcount(G), dim=16, reorder=method)
+            model.evaluate(G)
+            assert model.perm.size == grl.vcount(G) + 1
+            x = grl.graph.utils.to_edgelist(G)
+            L, R = model.export()
+            assert np.allclose(model.predict(x), grl.sigmoid((L[x[:, 0]]*R[x[:, 1]]).sum(1)))
+
+
+def test_reorder_later_graphs(graphs):
+    G = graphs()[2]
+    model = grl.graph.Model(obs=grl.vcount(G), dim=16, reorder='degree')
+    model.evaluate(G)
+    # a later graph is relabeled with the permutation of the first one
+    H = (G[0].copy(), G[1].copy())
+    R = grl.graph.model.utils.reordered(model, H)
+    assert R is not grl.graph.model.utils.reordered(model, G)
+    assert np.all(R[0] == grl.graph.model.utils.reordered(model, G)[0])
+    assert np.all(R[1] == grl.graph.model.utils.reordered(model, G)[1])
+    with pytest.raises(ValueError):
+        grl.graph.model.utils.reordered(model, grl.subgraph(np.arange(1, 5), G))
+    # edge masks follow the edges
+    mask = np.random.randint(0, 2, grl.ecount(G)).astype(np.uint8)
+    (rmask,) = grl.graph.model.utils.pargs(model, H, (mask,))
+    el = grl.graph.utils.to_edgelist(G)
+    rel = model.perm[grl.graph.utils.to_edgelist(R)]
+    assert set(map(tuple, el[mask == 1])) == set(map(tuple, rel[rmask == 1]))
+    with pytest.raises(ValueError):
+        grl.graph.model.utils.pargs(model, H, ((mask, mask),))
+
+
+def test_bipartite_evaluate():
+    np.random.seed(0)
+    el = np.stack([np.random.randint(1, 41, 300), np.random.randint(1, 101, 300)], axis=1)
+    bg = grl.graph.bipartite.from_edgelist(el, (40, 100))
+    for Model in [grl.graph.Model, grl.graph.ModelAdam]:
+        model = Model(obs=(40, 100), dim=16, sampler='neg')
+        assert 0 <= model.evaluate(bg) <= 1
+        model = Model(obs=(40, 100), dim=16, sampler='nce', noise=.75)
+        assert 0 <= model.evaluate(bg) <= 1
+        with pytest.raises(ValueError):
+            Model(obs=(40, 100), dim=16, sampler='get_random_walk_sample').evaluate(bg)
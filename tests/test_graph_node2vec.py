@@ -0,0 +1,48 @@
+import numpy as np
+
+import grl
+
+from common import graphs
+
+
+def diamond():
+    # 1 - 2 - {3, 4} - 5, with 3 and 4 connected, and an isolated node 6
+    el = np.array([[1, 2], [2, 3], [2, 4], [3, 4], [4, 5]])
+    return grl.graph.utils.from_edgelist(el, vcount=6)
+
+
+def test_random_walks():
+    G = diamond()
+    for tables in [None, grl.graph.node2vec.get(G, .5, 2.)]:
+        W = grl.graph.node2vec.random_walks(G, np.arange(1, 7), 6, .5, 2., tables)
+        assert W.shape == (6, 7) and W.dtype == G[1].dtype
+        assert np.all(W[:, 0] == np.arange(1, 7))
+        assert np.all(W[5, 1:] == 0)  # isolate
+        for w in W[:5]:
+            for a, b in zip(w[:-1], w[1:]):
+                assert grl.graph.utils.find_edge(a, b, G) >= 0
+
+
+def test_transition_bias():
+    # walks from 2 through 3 return to 2 with weight 1/p, or move to 4 
+    # (a neighbour of 2) with weight 1
+    G = diamond()
+    np.random.seed(7)
+    p, q = .25, 4.
+    for tables in [None, grl.graph.node2vec.get(G, p, q)]:
+        W = grl.graph.node2vec.random_walks(G, np.full(2**15, 2), 2, p, q, tables)
+        W = W[W[:, 1] == 3]
+        assert abs(np.mean(W[:, 2] == 2) - 4/5) < .02
+    # walks from 3 through 4 move away to 5 with weight 1/q
+    p, q = 1., .25
+    for tables in [None, grl.graph.node2vec.get(G, p, q)]:
+        W = grl.graph.node2vec.random_walks(G, np.full(2**15, 3), 2, p, q, tables)
+        W = W[W[:, 1] == 4]
+        assert abs(np.mean(W[:, 2] == 5) - 4/6) < .02
+
+
+def test_get_random_walk_sample(graphs):
+    for G in graphs():
+        x, y = grl.graph.node2vec.get_random_walk_sample(G, 1000, pargs=(5, 1., 2.))
+        assert x.shape == (1000, 2) and y.sum() == 500
+        assert np.all(x[y == 1] <= grl.vcount(G))
@@ -0,0 +1,53 @@
+import numpy as np
+
+import grl
+
+from common import graphs
+
+
+def star():
+    # hub 1 connected to 2..9, and an edge 8 - 9
+    el = np.array([[1, i] for i in range(2, 10)] + [[8, 9]])
+    return grl.graph.utils.from_edgelist(el)
+
+
+def test_get():
+    G = star()
+    assert grl.graph.noise.get(G, 'uniform') is None
+    assert grl.graph.noise.get(G, None) is None
+    table = grl.graph.noise.get(G, .75)
+    assert grl.graph.noise.get(G, .75) is table
+    assert table[0].size == grl.vcount(G)
+    w = grl.graph.noise.unigram(G, 1.)
+    assert np.all(w == grl.degree(G))
+    w = grl.graph.noise.unigram(G, 1., vcount2=12)
+    assert w.size == 12 and np.all(w[9:] == 0)
+
+
+def test_samplers():
+    G = star()
+    np.random.seed(7)
+    n = 2**14
+    for table, p in [(grl.graph.noise.get(G, 1.), grl.degree(G) / grl.ecount(G)),
+                     (grl.graph.noise.get(G, np.arange(1, 10)), np.arange(1, 10) / 45)]:
+        x, y = grl.graph.sample.nce(G, 2*n, nargs=(0, table))
+        freq = np.bincount(x[y == 0, 1], minlength=10)[1:] / n
+        assert np.allclose(freq, p, atol=.02)
+        for sampler in [grl.graph.sample.neg, grl.graph.weighted.neg]:
+            pargs = (grl.graph.weighted.get(G, np.ones(G[1].size, dtype=np.float32)),) \
+                if sampler is grl.graph.weighted.neg else ()
+            x, y = sampler(G, 512, pargs=pargs, nargs=(0, table))
+            for src, dst in x[y == 0]:
+                assert grl.graph.utils.find_edge(src, dst, G) < 0
+    # bimodal: noise over the nodes of the second modality
+    table = grl.graph.noise.get(G, 1., vcount2=12)
+    x, y = grl.graph.sample.nce(G, 2048, nargs=(12, table))
+    assert x[y == 0, 1].max() <= 9
+
+
+def test_model_noise(graphs):
+    for G in graphs():
+        model = grl.graph.Model(grl.vcount(G), 8, noise=.75)
+        sampler, nargs = grl.graph.model.utils.sampler(model, G)
+        assert nargs[1] is grl.graph.noise.get(G, .75)
+        assert 0 <= model.evaluate(G) <= 1
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 import grl
 
@@ -27,6 +28,30 @@ def test_get_neg_sample(graphs):
             assert not negative[i, 0] in grl.neighbors(negative[i, 1], G)
 
 
+def test_get_random_edges():
+    # star with a tail and isolated nodes: edges of the hub are sampled
+    # as often as any other edge
+    el = np.array([[1, 2], [1, 3], [1, 4], [1, 5], [5, 6]])
+    G = grl.graph.utils.from_edgelist(el, vcount=100)
+    np.random.seed(7)
+    for src in [None, grl.graph.sample.get_edge_sources(G)]:
+        x = grl.graph.sample.get_random_edges(G, 2**16, src)
+        assert x.dtype == G[1].dtype
+        pos = np.array([grl.graph.utils.find_edge(a, b, G) for a, b in x])
+        assert np.all(pos >= 0)
+        assert np.allclose(np.bincount(pos) / x.shape[0], 1 / grl.ecount(G), atol=.01)
+    x = np.array([grl.graph.sample.get_random_edge(G) for _ in range(2**12)])
+    assert np.mean(x[:, 0] == 1) > .3
+    # edgeless graph
+    G = grl.graph.utils.from_edgelist(np.empty((0, 2), dtype=np.int64), vcount=4)
+    with pytest.raises(ValueError, match="no edges"):
+        grl.graph.sample.get_random_edge(G)
+    with pytest.raises(ValueError, match="no edges"):
+        grl.graph.sample.get_random_edges(G, 8)
+    with pytest.raises(ValueError, match="no edges"):
+        grl.graph.sample.nce(G, 8)
+
+
 def test_get_random_edge_with_mask(graphs):
     for graph in graphs():
         mask = grl.graph.utils.get_edge_mask(.2, graph)
@@ -38,3 +63,89 @@ def test_get_random_edge_with_mask(graphs):
         samples = np.unique(np.vstack(samples), axis=0)
         truth = grl.graph.utils.to_edgelist(graph)[mask.astype(bool)]
         assert np.all(samples == truth)
+
+
+def test_batch_samplers(graphs):
+    for G in graphs():
+        mask = grl.graph.utils.get_edge_mask(.5, G)
+        for sampler in [grl.graph.sample.nce, grl.graph.sample.neg]:
+            x, y = sampler(G, 2001)
+            assert x.shape == (2000, 2) and x.dtype == G[1].dtype and y.sum() == 1000
+        x, y = grl.graph.sample.get_nce_sample_with_mask(G, 2000, pargs=(mask,))
+        for src, dst in x[y == 1]:
+            assert mask[grl.graph.utils.find_edge(src, dst, G)] == 1
+
+
+def test_random_walk_sample():
+    # path graph: nodes of a walk are at most walk_length steps apart
+    n = 64
+    el = np.stack([np.arange(1, n), np.arange(2, n+1)], axis=1)
+    G = grl.graph.utils.from_edgelist(el)
+    mask = np.ones(G[1].size, dtype=np.uint8)
+    for sampler, pargs in [(grl.graph.sample.get_random_walk_sample, (3,)),
+                           (grl.graph.sample.get_random_walk_sample_with_mask, (3, mask))]:
+        x, y = sampler(G, 4096, pargs=pargs)
+        pos = x[y == 1].astype(np.int64)
+        assert np.all(pos > 0)
+        assert np.abs(pos[:, 0] - pos[:, 1]).max() <= 3
+        assert np.any(np.abs(pos[:, 0] - pos[:, 1]) == 3)
+
+
+def test_random_walk_sample_isolates():
+    # isolated nodes and a masked out edge: pairs of stuck walks are redrawn
+    el = np.array([[1, 2], [2, 3], [3, 4]])
+    G = grl.graph.utils.from_edgelist(el, vcount=8)
+    mask = np.ones(G[1].size, dtype=np.uint8)
+    mask[grl.graph.utils.find_edge(3, 4, G)] = 0
+    mask[grl.graph.utils.find_edge(4, 3, G)] = 0
+    for sampler, pargs, top in [(grl.graph.sample.get_random_walk_sample, (3,), 4),
+                                (grl.graph.sample.get_random_walk_sample_with_mask, (3, mask), 3)]:
+        x, y = sampler(G, 4096, pargs=pargs)
+        pos = x[y == 1]
+        assert pos.min() > 0 and pos.max() <= top
+    with pytest.raises(ValueError):
+        grl.graph.sample.get_random_walk_sample(G, 64, pargs=(0,))
+    with pytest.raises(ValueError, match="mask"):
+        grl.graph.sample.get_random_walk_sample_with_mask(G, 64, pargs=(3, np.zeros_like(mask)))
+    with pytest.raises(ValueError, match="mask"):
+        grl.graph.sample.get_nce_sample_with_mask(G, 64, pargs=(np.zeros_like(mask),))
+
+
+def test_random_walks(tmp_path):
+    el = np.array([[1, 2], [2, 3], [3, 4], [5, 6]])
+    G = grl.graph.utils.from_edgelist(el, vcount=7)
+    W = grl.graph.sample.random_walks(G, np.arange(1, 8), 5)
+    assert W.shape == (7, 6) and W.dtype == G[1].dtype
+    assert np.all(W[:, 0] == np.arange(1, 8))
+    assert np.all(W[6] == [7, 0, 0, 0, 0, 0])  # isolate
+    for w in W[:6]:
+        for a, b in zip(w[:-1], w[1:]):
+            assert grl.graph.utils.find_edge(a, b, G) >= 0
+    # masked edges are not traversed
+    mask = np.ones(G[1].size, dtype=np.uint8)
+    mask[grl.graph.utils.find_edge(2, 3, G)] = 0
+    W = grl.graph.sample.random_walks(G, np.full(64, 2), 5, mask)
+    assert not np.any((W[:, :-1] == 2) & (W[:, 1:] == 3))
+    assert np.all(grl.graph.sample.random_walk_with_mask(1, G, 3, mask) <= 2)
+    # corpus streamed to file
+    path = str(tmp_path / "walks.npy")
+    W = grl.graph.sample.random_walk_corpus(G, 4, walks_per_node=3, path=path, chunk_size=5, seed=0)
+    assert W.shape == (21, 5)
+    assert np.all(np.bincount(W[:, 0], minlength=8)[1:] == 3)
+    assert np.all(np.load(path) == W)
+
+
+def test_window_sample():
+    n = 64
+    el = np.stack([np.arange(1, n), np.arange(2, n+1)], axis=1)
+    G = grl.graph.utils.from_edgelist(el)
+    x, y = grl.graph.sample.get_window_sample(G, 8192, pargs=(10, 2))
+    pos = x[y == 1].astype(np.int64)
+    d = np.abs(pos[:, 0] - pos[:, 1])
+    assert np.all(pos > 0) and d.max() <= 2
+    # subsampling
+    keep = grl.graph.sample.subsampling(G, t=1e-3)
+    assert keep.shape == (n+1,) and np.all(keep <= 1)
+    keep[1:33] = 0
+    x, y = grl.graph.sample.get_window_sample(G, 8192, pargs=(10, 2, keep))
+    assert np.all(x[y == 1] > 32)
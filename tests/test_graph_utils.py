@@ -1,11 +1,27 @@
+import pickle
+
 import igraph
 import numpy as np
+import pytest
 
 import grl
 
 from common import igraphs, graphs, ogb_dataset
 
 
+def test_digest(graphs, monkeypatch):
+    monkeypatch.setattr(grl.graph.utils, "HASH_BLOCK", 64)
+    for G in graphs():
+        d = grl.graph.utils.digest(G)
+        assert grl.graph.utils.digest((G[0].copy(), G[1].copy())) == d
+        # any change of the content changes the digest
+        for i in [0, G[1].size//2, G[1].size-1]:
+            edges = G[1].copy()
+            edges[i] += 1
+            assert grl.graph.utils.digest((G[0].copy(), edges)) != d
+        assert grl.graph.utils.digest((G[0].copy(), G[1].astype(np.uint64))) != d
+
+
 def test_enumerate_edges(graphs):
     for G in graphs():
         assert grl.graph.utils.enumerate_edges(G).shape[0] == grl.graph.core.ecount(G)
@@ -16,6 +32,51 @@ def test_enumerate_nodes(graphs):
         assert grl.graph.utils.enumerate_nodes(G).shape[0] == grl.graph.core.vcount(G)
 
 
+def test_filter_edges(graphs):
+    for G in graphs():
+        mask = grl.graph.utils.get_edge_mask(.5, G)
+        H = grl.graph.utils.filter_edges(G, mask)
+        el = grl.graph.utils.to_edgelist(G)[mask == 1]
+        assert grl.vcount(H) == grl.vcount(G)
+        assert grl.graph.utils.is_sorted(H)
+        assert np.all(grl.graph.utils.to_edgelist(H) == el)
+
+
+def test_from_edgelist(igraphs):
+    for G in igraphs():
+        el = np.array(G.get_edgelist()) + 1  # @indexing
+        g = grl.graph.utils.from_igraph(G)
+        h = grl.graph.utils.from_edgelist(el, G.vcount())
+        assert np.all(g[0] == h[0])
+        assert np.all(g[1] == h[1])
+
+
+def test_from_edgelist_drops_loops_and_duplicates():
+    el = np.array([[1, 2], [2, 1], [1, 1], [3, 2], [1, 2]])
+    nodes, edges = grl.graph.utils.from_edgelist(el, 4)
+    assert np.all(nodes == np.array([0, 0, 1, 3, 4, 4]))
+    assert np.all(edges == np.array([2, 1, 3, 2]))
+
+
+def test_split_edges(graphs):
+    for G in graphs():
+        m = grl.ecount(G)//2  # @symmetry
+        train, val, test = grl.graph.utils.split_edges(G, (.6, .2, .2), seed=1)
+        assert grl.vcount(train) == grl.vcount(G)
+        assert grl.graph.utils.is_sorted(train)
+        assert np.all(grl.graph.utils.reverse_index(train) >= 0)
+        assert val.shape[0] == round(.8*m) - round(.6*m)
+        assert grl.ecount(train)//2 + val.shape[0] + test.shape[0] == m
+        assert np.all(val[:, 0] < val[:, 1])
+        el = np.vstack([grl.graph.utils.enumerate_upper_edges(train), val, test])
+        assert np.all(np.unique(el, axis=0) == np.unique(grl.graph.utils.enumerate_upper_edges(G), axis=0))
+        # seeded splits are reproducible
+        _, val2, _ = grl.graph.utils.split_edges(G, (.6, .2, .2), seed=1)
+        assert np.all(val == val2)
+    with pytest.raises(ValueError):
+        grl.graph.utils.split_edges(G, (.8, .2, .2))
+
+
 def test_to_from_adjacency(graphs):
     for G in graphs():
         A = grl.graph.utils.to_adjacency(G)
@@ -99,3 +160,158 @@ def test_get_edge_mask(graphs):
                     if cnb == vi:
                         cadr = grl.graph.utils.addr_neighbors(nb, graph)
                         assert mask[adr[i]] == mask[cadr[j]]
+
+
+def test_kfold_edges(graphs):
+    for G in graphs():
+        el = grl.graph.utils.enumerate_upper_edges(G)
+        folds = grl.graph.utils.kfold_edges(G, 4, seed=0)
+        held = np.vstack([test for train, test in folds])
+        assert np.all(np.unique(held, axis=0) == np.unique(el, axis=0))
+        assert held.shape == el.shape
+        for train, test in folds:
+            assert grl.ecount(train) == grl.ecount(G) - 2*test.shape[0]  # @symmetry
+            for src, dst in test:
+                assert not grl.is_neighbor(dst, src, train)
+
+
+def test_reorder(graphs):
+    for G in graphs():
+        el = grl.graph.utils.to_edgelist(G)
+        for method in ['degree', 'bfs', 'rcm']:
+            H, perm = grl.graph.utils.reorder(G, method)
+            assert perm[0] == 0
+            assert np.all(np.sort(perm) == np.arange(grl.vcount(G)+1))
+            assert grl.graph.utils.is_sorted(H)
+            assert np.all(grl.degree(H) == grl.degree(G)[perm[1:]-1])  # @indexing
+            hl = perm[grl.graph.utils.to_edgelist(H)]
+            assert np.all(hl[np.lexsort(hl.T[::-1])] == el[np.lexsort(el.T[::-1])])
+    with pytest.raises(ValueError):
+        grl.graph.utils.reorder(G, 'random')
+
+
+def test_reverse_index(graphs):
+    for G in graphs():
+        rev = grl.graph.utils.reverse_index(G)
+        el = grl.graph.utils.to_edgelist(G)
+        assert np.all(rev >= 0)
+        assert np.all(rev[rev] == np.arange(rev.size))
+        assert np.all(el[rev] == el[:, ::-1])
+    # directed edge has no reverse
+    nodes = np.array([0, 0, 1, 1], dtype=np.uint64)
+    edges = np.array([2], dtype=np.uint32)
+    assert grl.graph.utils.reverse_index((nodes, edges))[0] == -1
+
+
+def test_save_load(graphs, tmp_path):
+    path = str(tmp_path / "graph.grl")
+    for G in graphs():
+        grl.graph.utils.save(path, G)
+        header = grl.graph.utils.header(path)
+        assert header["digest"] == grl.graph.utils.digest(G)
+        assert header["vcount"] == grl.vcount(G)
+        assert header["ecount"] == grl.ecount(G)
+        assert header["nodes_offset"] % grl.graph.utils.GRL_ALIGN == 0
+        assert header["edges_offset"] % grl.graph.utils.GRL_ALIGN == 0
+        for mmap in [True, False]:
+            H = grl.graph.utils.load(path, mmap=mmap)
+            assert isinstance(H[1], np.memmap) == mmap
+            assert np.all(G[0] == H[0])
+            assert np.all(G[1] == H[1])
+
+
+def test_load_legacy(graphs, tmp_path):
+    path = str(tmp_path / "graph.pkl")
+    for G in graphs():
+        with open(path, "wb") as f:
+            pickle.dump(G, f)
+        H = grl.graph.utils.load(path)
+        assert np.all(G[0] == H[0])
+        assert np.all(G[1] == H[1])
+
+
+def test_load_unsorted(graphs, tmp_path):
+    path = str(tmp_path / "graph.grl")
+    for G in graphs():
+        nodes, edges = G[0], G[1].copy()
+        for i in range(1, grl.vcount(G)+1):
+            edges[nodes[i]:nodes[i+1]] = edges[nodes[i]:nodes[i+1]][::-1]
+        grl.graph.utils.save(path, (nodes, edges))
+        sorted_ = grl.graph.utils.is_sorted((nodes, edges))
+        assert bool(grl.graph.utils.header(path)["flags"] & grl.graph.utils.FLAG_SORTED) == sorted_
+        H = grl.graph.utils.load(path)
+        assert grl.graph.utils.is_sorted(H)
+        assert np.all(G[1] == H[1])
+
+
+def test_register_unsorted(graphs):
+    G = graphs()[2]
+    nodes, edges = G[0], G[1].copy()
+    edges[nodes[1]:nodes[2]] = edges[nodes[1]:nodes[2]][::-1]
+    with pytest.raises(ValueError):
+        grl.shmem.graph.register((nodes, edges))
+    H = grl.graph.utils.as_sorted((nodes, edges))
+    ref = grl.shmem.graph.register(H)
+    # name and cached digest of the registered copy agree with the input
+    assert grl.shmem.graph.discover(H) == ref
+    assert grl.shmem.graph.discover(grl.shmem.get(ref)) == ref
+    assert grl.graph.utils.digest(grl.shmem.get(ref)) == grl.graph.utils.digest(H)
+
+
+def test_from_ogb_isolates_unsorted(ogb_dataset):
+    dataset = ogb_dataset('zachary')
+    np.random.seed(13)
+    dataset.graph['edge_index'] = np.random.permutation(dataset.graph['edge_index'].T).T
+    dataset.graph['num_nodes'] += 3
+    graph = grl.graph.utils.from_ogb(dataset)
+    g = grl.graph.utils.from_igraph(igraph.Graph.Famous('Zachary'))
+    assert grl.vcount(graph) == grl.vcount(g) + 3
+    assert np.all(grl.degree(graph)[-3:] == 0)
+    assert np.all(graph[1] == g[1])
+
+
+def test_from_ogb_split(ogb_dataset):
+    dataset = ogb_dataset('zachary')
+    edge_index = dataset.graph['edge_index']
+    dataset.graph['edge_index'] = edge_index[:, 8:]
+    split = {'train': {'edge': edge_index[:, 8:].T}, 
+             'test': {'source_node': edge_index[0, :8], 'target_node': edge_index[1, :8]}}
+    graph, parts = grl.graph.utils.from_ogb(dataset, split)
+    # test edges are left out of the graph
+    assert grl.ecount(graph) == 2*(edge_index.shape[1] - 8)
+    assert np.all(parts['test'] == edge_index[:, :8].T + 1)  # @indexing
+    assert np.all(parts['train'] == edge_index[:, 8:].T + 1)
+    for src, dst in parts['test']:
+        assert grl.graph.utils.find_edge(src, dst, graph) < 0
+    # masks of the full graph
+    full, masks, parts = grl.graph.utils.from_ogb(dataset, split, masks=True)
+    assert grl.ecount(full) == 2*edge_index.shape[1]
+    assert np.all(masks['train'] == masks['test']) and masks['test'].sum() == grl.ecount(full) - 16
+    train = grl.graph.utils.filter_edges(full, masks['train'])
+    assert np.all(train[0] == graph[0]) and np.all(train[1] == graph[1])
+
+
+def test_enumerate_upper_edges(graphs):
+    for G in graphs():
+        el = grl.graph.utils.enumerate_edges(G)
+        assert np.all(grl.graph.utils.enumerate_upper_edges(G) == el[el[:, 0] < el[:, 1]])
+
+
+def test_to_from_scipy(graphs):
+    for G in graphs():
+        A = grl.graph.utils.to_scipy(G)
+        assert np.all(A.toarray() == grl.graph.utils.to_adjacency(G))
+        H = grl.graph.utils.from_scipy(A)
+        assert np.all(G[0] == H[0])
+        assert np.all(G[1] == H[1])
+
+
+def test_to_from_scipy_padded(graphs):
+    for G in graphs():
+        A = grl.graph.utils.to_scipy(G, pad=True)
+        assert np.shares_memory(A.indices, G[1])
+        assert np.all(A.toarray()[1:, 1:] == grl.graph.utils.to_adjacency(G))
+        H = grl.graph.utils.from_scipy(A, pad=True)
+        assert np.shares_memory(A.indices, H[1])
+        assert np.all(G[0] == H[0])
+        assert np.all(G[1] == H[1])
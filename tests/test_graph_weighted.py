@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+import grl
+
+from common import graphs
+
+
+def weighted_graph(seed=7):
+    np.random.seed(seed)
+    el = np.array([[1, 2], [1, 3], [2, 3], [3, 4], [4, 5]])
+    g = grl.graph.utils.from_edgelist(el)
+    weights = np.random.randint(1, 10, el.shape[0]).astype(np.float32)
+    w = np.zeros(g[1].size, dtype=np.float32)
+    for (src, dst), x in zip(el, weights):
+        w[grl.graph.utils.find_edge(src, dst, g)] = x
+        w[grl.graph.utils.find_edge(dst, src, g)] = x
+    return g, w
+
+
+def test_get_random_edge():
+    g, w = weighted_graph()
+    tables = grl.graph.weighted.get(g, w)
+    assert grl.graph.weighted.get(g, w) is tables
+    np.random.seed(7)
+    n = 40000
+    counts = np.zeros(g[1].size)
+    for _ in range(n):
+        src, dst = grl.graph.weighted.get_random_edge(g, tables)
+        counts[grl.graph.utils.find_edge(src, dst, g)] += 1
+    assert np.allclose(counts / n, w / w.sum(), atol=.01)
+
+
+def test_random_walk():
+    g, w = weighted_graph()
+    tables = grl.graph.weighted.get(g, w)
+    for v in range(1, grl.vcount(g)+1):
+        walk = grl.graph.weighted.random_walk(v, g, 8, tables)
+        assert walk.size == 9 and walk[0] == v
+        for a, b in zip(walk[:-1], walk[1:]):
+            assert grl.graph.utils.find_edge(a, b, g) >= 0
+    # isolated node: walk is padded with 0
+    G = grl.graph.utils.from_edgelist(np.array([[1, 2]]), vcount=3)
+    walk = grl.graph.weighted.random_walk(3, G, 4, grl.graph.weighted.get(G, np.ones(2, dtype=np.float32)))
+    assert np.all(walk == [3, 0, 0, 0, 0])
+
+
+def test_samplers():
+    g, w = weighted_graph()
+    tables = grl.graph.weighted.get(g, w)
+    for sampler, pargs in [(grl.graph.weighted.nce, (tables,)),
+                           (grl.graph.weighted.neg, (tables,)),
+                           (grl.graph.weighted.get_random_walk_sample, (4, tables))]:
+        x, y = sampler(g, 256, pargs=pargs)
+        assert x.shape == (256, 2) and y.sum() == 128
+    x, y = grl.graph.weighted.neg(g, 256, pargs=(tables,))
+    s = grl.graph.weighted.scale(x, y, g, w)
+    for (src, dst), t, si in zip(x, y, s):
+        assert si == (w[grl.graph.utils.find_edge(src, dst, g)] if t else 1)
+
+
+def test_random_walk_pairs():
+    # walks from the isolated node are redrawn, so pairs never contain 0
+    G = grl.graph.utils.from_edgelist(np.array([[1, 2], [2, 3]]), vcount=5)
+    tables = grl.graph.weighted.get(G, np.ones(4, dtype=np.float32))
+    x, y = grl.graph.weighted.get_random_walk_sample(G, 512, pargs=(3, tables))
+    assert x[y == 1].min() > 0 and x[y == 1].max() <= 3
+    with pytest.raises(ValueError):
+        grl.graph.weighted.get_random_walk_pair(G, 0, tables)
+    # positives are weighted by the sampler or by the loss, not both
+    g, w = weighted_graph()
+    model = grl.graph.Model(obs=grl.vcount(g), dim=4, sampler=grl.graph.weighted.nce)
+    with pytest.raises(ValueError):
+        model.fit(g, 64, pargs=(grl.graph.weighted.get(g, w),), weights=w)
+
+
+def test_subgraph_and_split():
+    g, w = weighted_graph()
+    vs = np.array([3, 1, 4, 2])
+    sub, ws = grl.graph.weighted.subgraph(vs, g, w)
+    for src, dst in grl.graph.utils.to_edgelist(sub):
+        p = grl.graph.utils.find_edge(src, dst, sub)
+        assert ws[p] == w[grl.graph.utils.find_edge(vs[src-1], vs[dst-1], g)]
+    (train, wt), (el, we) = grl.graph.weighted.split_edges(g, w, (.6, .4), seed=0)
+    assert wt.size == grl.ecount(train)
+    for src, dst in grl.graph.utils.to_edgelist(train):
+        assert wt[grl.graph.utils.find_edge(src, dst, train)] == w[grl.graph.utils.find_edge(src, dst, g)]
+    for (src, dst), x in zip(el, we):
+        assert x == w[grl.graph.utils.find_edge(src, dst, g)]
+
+
+def test_save_load(graphs, tmp_path):
+    path = str(tmp_path / "graph.grl")
+    for G in graphs():
+        w = np.random.random(G[1].size).astype(np.float32)
+        grl.graph.utils.save(path, G, weights=w)
+        H = grl.graph.utils.load(path)
+        assert np.all(G[1] == H[1])
+        for mmap in [True, False]:
+            assert np.all(grl.graph.utils.load_weights(path, mmap=mmap) == w)
+        grl.graph.utils.save(path, G)
+        assert grl.graph.utils.load_weights(path) is None
@@ -30,12 +30,40 @@ def test_cumsum_2d(random_normal_2d):
         assert np.all(numby == numpy)
 
 
+def test_alias_table():
+    np.random.seed(7)
+    w = np.array([1., 2., 3., 0., 4.])
+    prob, alias = grl.alias_table(w)
+    assert np.all((prob >= 0) & (prob <= 1))
+    # probability mass of every index: kept with prob, plus aliased from others
+    mass = prob + np.bincount(alias, weights=1-prob, minlength=w.size)
+    assert np.allclose(mass / w.size, w / w.sum(), atol=1e-6)
+    draws = np.array([grl.alias_draw(prob, alias) for _ in range(20000)])
+    assert not np.any(draws == 3)
+    assert np.allclose(np.bincount(draws, minlength=w.size) / draws.size, w / w.sum(), atol=.02)
+
+
+def test_gallop_isin_1d():
+    np.random.seed(7)
+    for size in [0, 1, 5, 100]:
+        b = np.unique(np.random.randint(0, 200, size)).astype(np.uint32)
+        a = np.random.randint(0, 220, 64)
+        assert np.all(grl.gallop_isin_1d(a, b) == np.isin(a, b))
+
+
 def test_hstack2(random_normal_2d, random_binomial_2d):
     x = random_normal_2d()
     y = random_binomial_2d()
     assert np.all(np.hstack([x, y]) == grl.hstack2(x, y))
 
 
+def test_isin_sorted_1d():
+    b = np.array([1, 3, 4, 8], dtype=np.uint32)
+    for a in range(10):
+        assert grl.isin_sorted_1d(a, b) == (a in b)
+    assert not grl.isin_sorted_1d(1, b[:0])
+
+
 def test_nunique_unsafe_1d():
     for step in range(8):
         x = np.random.randint(0, 2**16-1, 2**16)
@@ -58,6 +86,18 @@ def test_random_choice():
     assert np.corrcoef(px, ps)[0, 1] < -.998
 
 
+def test_random_choice_float_weights():
+    np.random.seed(7)
+    x = np.arange(10, 20)
+    w = np.random.random(10) * 1e-3
+    w[3] = 0
+    s = grl.random_choice(x, 2**18, w)
+    assert not np.any(s == x[3])
+    assert np.allclose(np.bincount(s - 10, minlength=10) / s.size, w / w.sum(), atol=.005)
+    prob, alias = grl.alias_table(w)
+    assert np.all(np.isin(grl.alias_sample(prob, alias, 1000), np.flatnonzero(w)))
+
+
 def test_reduce_max_2d(random_normal_2d):
     x = random_normal_2d()
     assert np.all(x.max(0) == grl.max0(x))
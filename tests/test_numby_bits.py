@@ -27,3 +27,21 @@ def test_pack_unpack64():
     # test the edge cases
     x = np.array([0, 2**64-1], dtype=np.uint64)
     assert np.all(pack64(unpack64(x)) == x)
+
+
+def test_bitset_get_set():
+    x = np.zeros(4, dtype=np.uint64)
+    ix = np.random.choice(256, 64, replace=False)
+    for i in ix:
+        bitset_set(x, i)
+    assert np.all(np.where(unpack64(x).ravel())[0] == np.sort(ix))
+    for i in range(256):
+        assert bitset_get(x, i) == (i in ix)
+    assert not bitset_get(x, 256)
+
+
+def test_popcount():
+    x = np.random.randint(2**64-1, size=2**10, dtype=np.uint64)
+    for e in x:
+        assert popcount(e) == unpack64(np.array([e])).sum()
+    assert popcount_1d(x) == unpack64(x).sum()